@@ -1,6 +1,13 @@
 #!/bin/bash
 
-# Wrapper script to run alfred-pj with uv-managed environment
+# Wrapper script to run alfred-pj with uv-managed environment.
+#
+# Hot path: when the stamp file proves the venv was synced after the last change
+# to uv.lock/pyproject.toml, exec the venv's interpreter directly and skip
+# `uv run` (which re-resolves the environment on every invocation).
+# Slow path: install uv if needed, `uv sync`, refresh the stamp, then exec.
+# Self-contained packages (release.py package --self-contained/--zipapp) ship
+# vendored, precompiled code and never touch uv.
 
 set -e
 
@@ -14,6 +21,47 @@ if [[ ":$PATH:" != *":/Applications/Obsidian.app/Contents/MacOS:"* ]]; then
     export PATH="$PATH:/Applications/Obsidian.app/Contents/MacOS"
 fi
 
+# Get the directory where this script is located
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+if [[ -d "$SCRIPT_DIR/lib" || -f "$SCRIPT_DIR/alfred-pj.pyz" ]]; then
+    # Bytecode is precompiled for this version; never write .pyc at runtime
+    export PYTHONDONTWRITEBYTECODE=1
+    TARGET="$(cat "$SCRIPT_DIR/.python-version")"
+    PYTHON="$(command -v "python$TARGET" || true)"
+    if [[ -z "$PYTHON" ]] && command -v uv &> /dev/null; then
+        PYTHON="$(uv python find "$TARGET" 2> /dev/null || true)"
+    fi
+    if [[ -z "$PYTHON" ]]; then
+        # Any python3 new enough runs the vendored sources, just without the
+        # precompiled bytecode; macOS's own python3 (3.9) is too old
+        PYTHON="$(command -v python3 || true)"
+        CHECK='import sys; sys.exit(sys.version_info < (3, 10))'
+        if [[ -z "$PYTHON" ]] || ! "$PYTHON" -c "$CHECK"; then
+            echo "alfred-pj needs Python 3.10 or newer ($TARGET preferred);" \
+                "found ${PYTHON:-no python3}." >&2
+            echo "Install it with 'brew install python@$TARGET' or 'uv python install $TARGET'." >&2
+            exit 1
+        fi
+    fi
+    if [[ -f "$SCRIPT_DIR/alfred-pj.pyz" ]]; then
+        exec "$PYTHON" "$SCRIPT_DIR/alfred-pj.pyz" "$@"
+    fi
+    export PYTHONPATH="$SCRIPT_DIR/lib"
+    exec "$PYTHON" -m alfred_pj "$@"
+fi
+
+VENV_DIR="$SCRIPT_DIR/.venv"
+PYTHON="$VENV_DIR/bin/python"
+STAMP="$VENV_DIR/.alfred-pj-synced"
+LOCK_FILE="$SCRIPT_DIR/uv.lock"
+PYPROJECT="$SCRIPT_DIR/pyproject.toml"
+
+# -x follows the symlink, so a removed uv-managed interpreter also forces a sync
+if [[ -x "$PYTHON" && -f "$STAMP" && ! "$LOCK_FILE" -nt "$STAMP" && ! "$PYPROJECT" -nt "$STAMP" ]]; then
+    exec "$PYTHON" -m alfred_pj "$@"
+fi
+
 # Check if uv is available, install if not
 if ! command -v uv &> /dev/null; then
     echo "uv not found, installing to ~/.local/bin..." >&2
@@ -21,17 +69,12 @@ if ! command -v uv &> /dev/null; then
     curl -LsSf https://astral.sh/uv/install.sh | sh -s -- --no-modify-path
 fi
 
-# Get the directory where this script is located
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-
-# Sync dependencies only when uv.lock is newer than the venv or the venv is missing
-VENV_DIR="$SCRIPT_DIR/.venv"
-LOCK_FILE="$SCRIPT_DIR/uv.lock"
-PYVENV="$VENV_DIR/pyvenv.cfg"
+uv sync --project "$SCRIPT_DIR" >&2
+touch "$STAMP"
 
-if [[ ! -f "$PYVENV" ]] || [[ "$LOCK_FILE" -nt "$PYVENV" ]]; then
-    uv sync --project "$SCRIPT_DIR"
+if [[ -x "$PYTHON" ]]; then
+    exec "$PYTHON" -m alfred_pj "$@"
 fi
 
-# Run the application
-uv run --project "$SCRIPT_DIR" alfred-pj "$@"
+# Venv layout we don't recognise: let uv locate the interpreter
+exec uv run --project "$SCRIPT_DIR" alfred-pj "$@"
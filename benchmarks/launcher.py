@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Compare end-to-end latency of the app.sh launcher against plain `uv run`.
+
+Usage:
+    uv run benchmarks/launcher.py --runs 30 --paths ~/Projects
+"""
+
+import tempfile
+from pathlib import Path
+
+import click
+from timing import summary, time_run, workflow_env
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_PATHS = ROOT / "tests" / "test-projects"
+
+LAUNCHERS = {
+    # What app.sh ran before the direct-exec hot path
+    "uv run": lambda args: ["uv", "run", "--project", str(ROOT), "alfred-pj", *args],
+    "app.sh": lambda args: [str(ROOT / "app.sh"), *args],
+}
+
+
+@click.command()
+@click.option("--runs", default=20, show_default=True, help="Timed runs per launcher.")
+@click.option("--paths", default=str(DEFAULT_PATHS), show_default=True, help="Roots to list.")
+def main(runs: int, paths: str):
+    """Time `list` through each launcher with isolated, pre-warmed caches."""
+    args = ["list", "--paths", paths]
+    with tempfile.TemporaryDirectory() as tmp:
+        env = workflow_env(tmp)
+        for name, build in LAUNCHERS.items():
+            cmd = build(args)
+            time_run(cmd, env)  # warm-up: sync venv, fill caches
+            samples = [time_run(cmd, env) for _ in range(runs)]
+            click.echo(f"{name:>8}: {summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Measure what the per-keystroke `list` path imports on top of interpreter startup.
+
+Runs `list` under `python -X importtime`, prints the slowest modules and
+exits non-zero when their total exceeds the budget. Wall-clock numbers vary
+with the machine, so this lives here rather than in the test suite (which
+only checks that no forbidden module is imported).
+
+Usage:
+    uv run benchmarks/list_imports.py --runs 5 --budget-ms 75
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import click
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_PATHS = ROOT / "tests" / "test-projects"
+
+
+def _list_imports(paths: str, env: dict) -> list[tuple[str, int]]:
+    """Return (module, self_us) for every module imported from alfred_pj onwards."""
+    code = f"from alfred_pj.__main__ import main\nmain(['list', '--paths', {paths!r}])\n"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line.removeprefix("import time:").split("|")
+        modules.append((name.strip(), int(self_us)))
+    # Drop interpreter startup: keep everything from our package onwards
+    start = next(i for i, (name, _) in enumerate(modules) if name.startswith("alfred_pj"))
+    return modules[start:]
+
+
+@click.command()
+@click.option("--runs", default=5, show_default=True, help="Runs; the fastest one is reported.")
+@click.option("--paths", default=str(DEFAULT_PATHS), show_default=True, help="Roots to list.")
+@click.option("--budget-ms", default=75.0, show_default=True, help="Fail above this total.")
+def main(runs: int, paths: str, budget_ms: float):
+    """Report the list path's import cost and check it against the budget."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "alfred_workflow_data": tmp, "alfred_workflow_cache": tmp}
+        best = min(
+            (_list_imports(paths, env) for _ in range(runs)),
+            key=lambda modules: sum(us for _, us in modules),
+        )
+    total_ms = sum(us for _, us in best) / 1000
+    for name, us in sorted(best, key=lambda m: m[1], reverse=True)[:10]:
+        click.echo(f"  {us / 1000:7.2f} ms  {name}")
+    click.echo(f"list imports: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    if total_ms > budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark suite for the list command on synthetic roots.
+
+For each root size, `alfred-pj list` runs in a fresh process under three
+cache states:
+
+- cold: empty workflow cache (full detection)
+- warm: cache filled by the previous run
+- partial: 10% of project directories touched since the cache was written
+
+Each run reports process wall time, in-process list time, peak RSS and the
+number of filesystem calls (os.stat/lstat/scandir/listdir/access and open)
+made from Python. Results are written as JSON and can be compared against a
+saved baseline.
+
+Usage:
+    uv run benchmarks/list_suite.py --output results.json
+    uv run benchmarks/list_suite.py --baseline results.json
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+from synthetic import make_tree
+from timing import workflow_env
+
+ROOT = Path(__file__).parent.parent
+SCENARIOS = ["cold", "warm", "partial"]
+PARTIAL_FRACTION = 0.1
+
+# Runs inside the measured process: count filesystem calls, run list, report
+CHILD = r"""
+import builtins, contextlib, io, json, os, resource, sys, threading, time
+from collections import Counter
+
+counts, lock = Counter(), threading.Lock()
+
+def counted(name, fn):
+    def wrapper(*args, **kwargs):
+        with lock:
+            counts[name] += 1
+        return fn(*args, **kwargs)
+    return wrapper
+
+for name in ("stat", "lstat", "scandir", "listdir", "access"):
+    setattr(os, name, counted(name, getattr(os, name)))
+builtins.open = counted("open", builtins.open)
+
+start = time.perf_counter()
+from alfred_pj.listing import list_projects
+with contextlib.redirect_stdout(io.StringIO()):
+    list_projects(sys.argv[1])
+list_ms = (time.perf_counter() - start) * 1000
+
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_kb = rss // 1024 if sys.platform == "darwin" else rss  # bytes on macOS, KB on Linux
+with open(sys.argv[2], "w") as f:
+    json.dump({"list_ms": list_ms, "peak_rss_kb": rss_kb, "fs_calls": dict(counts)}, f)
+"""
+
+
+def _run_list(paths: str, env: dict, tmp: Path) -> dict:
+    """Run list once in a fresh process and return its measurements."""
+    report = tmp / "report.json"
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", CHILD, paths, str(report)],
+        env=env,
+        check=True,
+        stderr=subprocess.DEVNULL,
+    )
+    result = json.loads(report.read_text())
+    result["wall_ms"] = (time.perf_counter() - start) * 1000
+    result["fs_calls_total"] = sum(result["fs_calls"].values())
+    return result
+
+
+def _touch_fraction(root: Path, fraction: float) -> None:
+    """Bump the mtime of a fraction of project directories to invalidate their cache."""
+    projects = sorted(root.iterdir())
+    step = max(1, round(1 / fraction))
+    now = time.time() + 1  # guarantee a different mtime even on coarse filesystems
+    for project in projects[::step]:
+        os.utime(project, (now, now))
+
+
+def _aggregate(samples: list[dict]) -> dict:
+    """Median timings and max memory over repeated runs."""
+    return {
+        "wall_ms": statistics.median(s["wall_ms"] for s in samples),
+        "list_ms": statistics.median(s["list_ms"] for s in samples),
+        "peak_rss_kb": max(s["peak_rss_kb"] for s in samples),
+        "fs_calls_total": samples[-1]["fs_calls_total"],
+        "fs_calls": samples[-1]["fs_calls"],
+    }
+
+
+def run_suite(sizes: list[int], runs: int, huge_dirs: int, huge_files: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for size in sizes:
+            root = make_tree(
+                tmp / f"root-{size}", size, filler=5, huge_dirs=huge_dirs, huge_files=huge_files
+            )
+            samples = {scenario: [] for scenario in SCENARIOS}
+            for run in range(runs):
+                env = workflow_env(str(tmp / f"alfred-{size}-{run}"))  # empty cache
+                samples["cold"].append(_run_list(str(root), env, tmp))
+                samples["warm"].append(_run_list(str(root), env, tmp))
+                _touch_fraction(root, PARTIAL_FRACTION)
+                samples["partial"].append(_run_list(str(root), env, tmp))
+            results[str(size)] = {name: _aggregate(s) for name, s in samples.items()}
+            for name in SCENARIOS:
+                r = results[str(size)][name]
+                click.echo(
+                    f"{size:>6} {name:>8}: wall {r['wall_ms']:8.1f} ms  list {r['list_ms']:8.1f} ms  "
+                    f"rss {r['peak_rss_kb'] / 1024:6.1f} MB  fs calls {r['fs_calls_total']:>8}"
+                )
+    return results
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print relative changes against a baseline run."""
+    click.echo("\nChange vs baseline:")
+    for size, scenarios in results.items():
+        for name, r in scenarios.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if not base:
+                continue
+            deltas = "  ".join(
+                f"{metric} {(r[metric] - base[metric]) / base[metric] * 100:+6.1f}%"
+                for metric in ("wall_ms", "list_ms", "peak_rss_kb", "fs_calls_total")
+                if base.get(metric)
+            )
+            click.echo(f"{size:>6} {name:>8}: {deltas}")
+
+
+@click.command()
+@click.option("--sizes", default="100,1000,10000", show_default=True, help="Projects per root.")
+@click.option("--runs", default=3, show_default=True, help="Repetitions per scenario.")
+@click.option("--huge-dirs", default=2, show_default=True, help="Large non-project directories.")
+@click.option("--huge-files", default=5000, show_default=True, help="Files per large directory.")
+@click.option("--output", "-o", type=click.Path(), help="Write results JSON to this file.")
+@click.option("--baseline", type=click.Path(exists=True), help="Compare with a saved results file.")
+def main(sizes: str, runs: int, huge_dirs: int, huge_files: int, output, baseline):
+    """Benchmark list on synthetic roots of increasing size."""
+    results = run_suite([int(s) for s in sizes.split(",")], runs, huge_dirs, huge_files)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": results,
+    }
+    if output:
+        Path(output).write_text(json.dumps(report, indent=2))
+        click.echo(f"Wrote {output}")
+    if baseline:
+        compare(results, json.loads(Path(baseline).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Compare startup time of the uv-managed and self-contained workflow packages.
+
+Builds each package mode with bin/release.py, unpacks it like Alfred does and
+times `app.sh list`. The first run of each package is reported separately:
+that is where the uv package resolves dependencies and compiles bytecode.
+
+Usage:
+    uv run benchmarks/package.py --runs 30 --paths ~/Projects
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from zipfile import ZipFile
+
+import click
+from timing import summary, time_run, workflow_env
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_PATHS = ROOT / "tests" / "test-projects"
+
+MODES = {
+    "uv": [],
+    "self-contained": ["--self-contained"],
+    "zipapp": ["--zipapp"],
+}
+
+
+def _unpack(mode_args: list[str], dest: Path) -> Path:
+    """Build a package with the given release.py flags and extract it into dest."""
+    package = dest.with_suffix(".alfredworkflow")
+    subprocess.run(
+        [
+            sys.executable,
+            str(ROOT / "bin" / "release.py"),
+            "package",
+            "-o",
+            str(package),
+            *mode_args,
+        ],
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    with ZipFile(package) as zf:
+        for info in zf.infolist():
+            zf.extract(info, dest)
+            # ZipFile.extract drops permission bits; app.sh must stay executable
+            (dest / info.filename).chmod(info.external_attr >> 16 or 0o644)
+    return dest
+
+
+@click.command()
+@click.option("--runs", default=20, show_default=True, help="Timed runs per package.")
+@click.option("--paths", default=str(DEFAULT_PATHS), show_default=True, help="Roots to list.")
+@click.option(
+    "--python",
+    default=sys.executable,
+    show_default="this interpreter",
+    help="Target interpreter for the self-contained modes.",
+)
+def main(runs: int, paths: str, python: str):
+    """Time `list` through each package mode."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, mode_args in MODES.items():
+            if mode_args:
+                mode_args = [*mode_args, "--python", python]
+            workflow = _unpack(mode_args, Path(tmp) / name)
+            env = workflow_env(str(Path(tmp) / f"{name}-alfred"))
+            cmd = [str(workflow / "app.sh"), "list", "--paths", paths]
+            first = time_run(cmd, env, cwd=str(workflow))
+            samples = [time_run(cmd, env, cwd=str(workflow)) for _ in range(runs)]
+            click.echo(f"{name:>14}: first run {first:8.1f} ms | {summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Compare the slotted ResponseItem and its encoder with the old dict-backed item.
+
+The old item is reproduced here: a plain class with a per-instance __dict__,
+an eagerly computed match, and serialization through
+json.dumps(..., default=lambda o: o.__dict__).
+
+Usage:
+    uv run benchmarks/response_items.py --items 10000 --runs 20
+"""
+
+import json
+import time
+import tracemalloc
+
+import click
+from timing import summary
+
+from alfred_pj.response import ResponseItem, render_item
+
+
+class DictResponseItem:
+    def __init__(self, title, subtitle, arg, icon, calls=0, score=0):
+        self.title = title
+        self.subtitle = subtitle
+        self.arg = arg
+        self.match = title.lower() + " " + subtitle.lower()
+        self.icon = icon
+        self.calls = calls
+        self.score = score
+
+
+def _make(cls, n: int) -> list:
+    icon = {"path": "images/vscode.svg"}
+    return [
+        cls(
+            title=f"project-{i}",
+            subtitle=f"Open ~/Projects/project-{i} in VS Code",
+            arg=f"/Users/me/Projects/project-{i}",
+            icon=icon,
+            calls=i % 7,
+        )
+        for i in range(n)
+    ]
+
+
+def _dump_dict(items: list) -> str:
+    return json.dumps({"items": items, "variables": {}}, default=lambda o: o.__dict__)
+
+
+def _dump_slotted(items: list) -> str:
+    return '{"items": [' + ", ".join(render_item(item) for item in items) + '], "variables": {}}'
+
+
+def _memory_kb(cls, n: int) -> float:
+    tracemalloc.start()
+    items = _make(cls, n)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return size / 1024
+
+
+@click.command()
+@click.option("--items", "n", default=10000, show_default=True, help="Items per response.")
+@click.option("--runs", default=20, show_default=True, help="Timed runs per variant.")
+def main(n: int, runs: int):
+    """Time building and serializing n items with each item type."""
+    variants = {
+        "dict": (DictResponseItem, _dump_dict),
+        "slotted": (ResponseItem, _dump_slotted),
+    }
+    for name, (cls, dump) in variants.items():
+        build, encode = [], []
+        for _ in range(runs):
+            start = time.perf_counter()
+            items = _make(cls, n)
+            built = time.perf_counter()
+            dump(items)
+            build.append((built - start) * 1000)
+            encode.append((time.perf_counter() - built) * 1000)
+        click.echo(f"{name:>8}: memory {_memory_kb(cls, n):8.0f} KB")
+        click.echo(f"{'build':>8}: {summary(build)}")
+        click.echo(f"{'encode':>8}: {summary(encode)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Compare the thread-pool and asyncio scan engines on synthetic trees.
+
+Each run detects every project from scratch (no project cache), which is the
+worst case for both engines. Like list, process() only stats the entry and
+submits its detection to a DetectionPool: with the asyncio engine the pool
+shares the engine's executor and its per-mount and per-root limits.
+
+Usage:
+    uv run benchmarks/scan_engines.py --projects 1000 --roots 3 --runs 5
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+import click
+from synthetic import make_tree
+from timing import summary
+
+from alfred_pj import async_scanner, scanner
+from alfred_pj.editors import Editors
+from alfred_pj.scanner import WORKERS, DetectionPool
+
+
+def run_threads(paths: list[str], editors: Editors) -> None:
+    pool = DetectionPool(WORKERS)
+    _detect_all(paths, editors, pool, scanner.scan)
+    pool.shutdown(wait=True)
+
+
+def run_asyncio(paths: list[str], editors: Editors) -> None:
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        pool = DetectionPool(
+            WORKERS,
+            async_scanner.MOUNT_CONCURRENCY,
+            async_scanner.ROOT_CONCURRENCY,
+            executor=executor,
+        )
+
+        def engine(roots, process):
+            return async_scanner.scan(roots, process, executor=executor)
+
+        _detect_all(paths, editors, pool, engine)
+        pool.shutdown(wait=True)
+
+
+def _detect_all(paths: list[str], editors: Editors, pool: DetectionPool, engine) -> None:
+    def process(entry):
+        st = entry.stat()
+        return pool.submit(
+            0, st.st_dev, os.path.dirname(entry.path), editors.determine_editor, entry.path
+        )
+
+    wait(engine(paths, process))
+
+
+ENGINES = {
+    "threads": run_threads,
+    "asyncio": run_asyncio,
+}
+
+
+@click.command()
+@click.option("--projects", default=1000, show_default=True, help="Projects per root.")
+@click.option("--roots", default=3, show_default=True, help="Number of roots.")
+@click.option("--runs", default=5, show_default=True, help="Timed runs per engine.")
+def main(projects: int, roots: int, runs: int):
+    """Time full detection of synthetic roots with each engine."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [str(make_tree(Path(tmp) / f"root-{i}", projects)) for i in range(roots)]
+        editors = Editors()
+
+        for name, engine in ENGINES.items():
+            engine(paths, editors)  # warm the page cache
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                engine(paths, editors)
+                samples.append((time.perf_counter() - start) * 1000)
+            click.echo(f"{name:>8}: {summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Synthetic project trees for benchmarks."""
+
+import itertools
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from alfred_pj.editors import DETECTORS  # noqa: E402
+
+
+def _markers(detector: dict) -> list[tuple[str, bool]]:
+    """Return (relative path, is_dir) entries that make a project match detector."""
+    if detector.get("dirs"):
+        return [(detector["dirs"][0], True)]
+    if detector.get("files"):
+        return [(detector["files"][0], False)]
+    return [(detector["globs"][0].replace("*", "main"), False)]
+
+
+def make_tree(
+    root: Path, projects: int, filler: int = 20, huge_dirs: int = 0, huge_files: int = 5000
+) -> Path:
+    """Create a root with `projects` subdirectories cycling through every detector.
+
+    One project per detector cycle has no markers (falls through every
+    detector), and each project gets `filler` plain files so glob-based
+    detectors have work to do. `huge_dirs` extra non-project directories with
+    `huge_files` files each model checkouts of data, archives or node_modules.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    detectors = itertools.cycle([*DETECTORS, None])
+    for i, detector in zip(range(projects), detectors, strict=False):
+        project = root / f"project-{i:05d}"
+        project.mkdir()
+        for n in range(filler):
+            (project / f"notes-{n}.txt").touch()
+        for name, is_dir in _markers(detector) if detector else []:
+            if is_dir:
+                (project / name).mkdir()
+            else:
+                (project / name).touch()
+    for i in range(huge_dirs):
+        huge = root / f"huge-{i:02d}"
+        huge.mkdir()
+        for n in range(huge_files):
+            (huge / f"blob-{n:06d}.dat").touch()
+    return root
@@ -0,0 +1,39 @@
+"""Shared helpers for the benchmark scripts."""
+
+import os
+import statistics
+import subprocess
+import time
+
+
+def time_run(cmd: list[str], env: dict | None = None, cwd: str | None = None) -> float:
+    """Run cmd once and return its wall time in milliseconds."""
+    start = time.perf_counter()
+    subprocess.run(
+        cmd,
+        env=env,
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def summary(samples: list[float]) -> str:
+    """Format min/median/mean/p95 of millisecond samples on one line."""
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, round(len(samples) * 0.95))]
+    return (
+        f"min {samples[0]:7.1f}  median {statistics.median(samples):7.1f}  "
+        f"mean {statistics.fmean(samples):7.1f}  p95 {p95:7.1f} ms"
+    )
+
+
+def workflow_env(tmp: str) -> dict:
+    """Return os.environ with Alfred's cache/data dirs pointed into tmp."""
+    return {
+        **os.environ,
+        "alfred_workflow_cache": os.path.join(tmp, "cache"),
+        "alfred_workflow_data": os.path.join(tmp, "data"),
+    }
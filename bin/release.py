@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """Release management CLI for alfred-pj workflow."""
 
+import importlib.metadata
+import importlib.util
 import json
 import plistlib
 import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import zipapp
 from pathlib import Path
 from zipfile import ZipFile
 
@@ -30,6 +35,12 @@ PACKAGE_FILES = [
 ]
 PACKAGE_GLOBS = ["icon.*"]
 
+# Self-contained packages ship lib/ (or a zipapp) instead of the uv project files
+SELF_CONTAINED_FILES = ["images", "app.sh", "LICENSE", "README.md", "info.plist"]
+VENDOR_PACKAGES = ["click"]
+BUNDLE_LIB_DIR = "lib"
+BUNDLE_ZIPAPP = "alfred-pj.pyz"
+
 # Directories and extensions to exclude from the package
 EXCLUDE_DIRS = {"tests", "__pycache__", ".pytest_cache"}
 EXCLUDE_EXTENSIONS = {".pyc"}
@@ -44,6 +55,65 @@ def _should_exclude(path: Path) -> bool:
     return path.suffix in EXCLUDE_EXTENSIONS
 
 
+def _copy_tree(src: Path, dest: Path) -> None:
+    """Copy a source tree, skipping excluded paths and stale bytecode."""
+    shutil.copytree(src, dest, ignore=shutil.ignore_patterns(*EXCLUDE_DIRS, "*.pyc"))
+
+
+def resolve_python(python: str | None) -> str:
+    """Resolve the target interpreter from a path or version.
+
+    There is no default: the bytecode only helps users whose interpreter
+    has the same version, so the target has to be chosen for them rather
+    than taken from this repo's .python-version.
+    """
+    if not python:
+        raise click.UsageError(
+            "--self-contained and --zipapp need --python, the version users run "
+            "(e.g. --python 3.12)"
+        )
+    if Path(python).is_file():
+        return python
+    result = subprocess.run(
+        ["uv", "python", "find", python], capture_output=True, text=True, check=False
+    )
+    if result.returncode != 0:
+        raise click.ClickException(f"Could not find a Python interpreter for {python!r}")
+    return result.stdout.strip()
+
+
+def build_bundle_lib(lib: Path, python: str, legacy_pyc: bool = False) -> str:
+    """Vendor alfred_pj and its dependencies into lib and precompile them.
+
+    Bytecode uses unchecked-hash invalidation so it stays valid after the
+    package is unzipped with new mtimes. legacy_pyc writes module.pyc next to
+    module.py, which zipimport needs. Returns the target's major.minor version.
+    """
+    _copy_tree(SRC_PATH / "alfred_pj", lib / "alfred_pj")
+    for name in VENDOR_PACKAGES:
+        spec = importlib.util.find_spec(name)
+        if spec is None or not spec.submodule_search_locations:
+            raise click.ClickException(f"Cannot vendor {name}: package not installed")
+        _copy_tree(Path(spec.submodule_search_locations[0]), lib / name)
+        # Ship the dependency's license alongside it
+        for file in importlib.metadata.distribution(name).files or []:
+            if file.name.startswith(("LICENSE", "COPYING")):
+                shutil.copy(file.locate(), lib / f"{name}-{file.name}")
+
+    compile_args = ["-q", "--invalidation-mode", "unchecked-hash"]
+    if legacy_pyc:
+        compile_args.append("-b")
+    subprocess.run([python, "-m", "compileall", *compile_args, str(lib)], check=True)
+
+    result = subprocess.run(
+        [python, "-c", "import sys; print('%d.%d' % sys.version_info[:2])"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
 def get_plist() -> dict:
     """Read info.plist."""
     with open(PLIST_PATH, "rb") as f:
@@ -207,7 +277,22 @@ def version(version: str | None, bump: str | None):
 
 @cli.command()
 @click.option("--output", "-o", type=click.Path(), help="Output path for the package.")
-def package(output: str | None):
+@click.option(
+    "--self-contained",
+    is_flag=True,
+    help="Vendor dependencies and precompile bytecode instead of relying on uv at runtime.",
+)
+@click.option(
+    "--zipapp",
+    "as_zipapp",
+    is_flag=True,
+    help="Bundle code as a zipapp (implies --self-contained).",
+)
+@click.option(
+    "--python",
+    help="Target interpreter path or version; required for --self-contained and --zipapp.",
+)
+def package(output: str | None, self_contained: bool, as_zipapp: bool, python: str | None):
     """Create .alfredworkflow package."""
     output_path = Path(output) if output else ROOT / WORKFLOW_NAME
 
@@ -215,22 +300,58 @@ def package(output: str | None):
     if output_path.exists():
         output_path.unlink()
 
+    if self_contained or as_zipapp:
+        _package_self_contained(output_path, resolve_python(python), as_zipapp)
+        click.echo(f"Created {output_path}")
+        return
+
     with ZipFile(output_path, "w") as zf:
-        for item in PACKAGE_FILES:
-            path = ROOT / item
-            if path.is_dir():
-                for file in path.rglob("*"):
-                    if file.is_file() and not _should_exclude(file):
-                        zf.write(file, file.relative_to(ROOT))
-            elif path.exists():
+        _write_package_files(zf, PACKAGE_FILES)
+
+    click.echo(f"Created {output_path}")
+
+
+def _write_package_files(zf: ZipFile, items: list[str]) -> None:
+    """Add the given project files/directories and PACKAGE_GLOBS matches to the zip."""
+    for item in items:
+        path = ROOT / item
+        if path.is_dir():
+            for file in path.rglob("*"):
+                if file.is_file() and not _should_exclude(file):
+                    zf.write(file, file.relative_to(ROOT))
+        elif path.exists():
+            zf.write(path, path.relative_to(ROOT))
+
+    for pattern in PACKAGE_GLOBS:
+        for path in ROOT.glob(pattern):
+            if path.is_file():
                 zf.write(path, path.relative_to(ROOT))
 
-        for pattern in PACKAGE_GLOBS:
-            for path in ROOT.glob(pattern):
-                if path.is_file():
-                    zf.write(path, path.relative_to(ROOT))
 
-    click.echo(f"Created {output_path}")
+def _package_self_contained(output_path: Path, python: str, as_zipapp: bool) -> None:
+    """Write a package that runs without uv, network access or bytecode compilation."""
+    with tempfile.TemporaryDirectory() as tmp:
+        staging = Path(tmp) / "workflow"
+        staging.mkdir()
+        lib = Path(tmp) / "lib" if as_zipapp else staging / BUNDLE_LIB_DIR
+        version = build_bundle_lib(lib, python, legacy_pyc=as_zipapp)
+
+        if as_zipapp:
+            zipapp.create_archive(
+                lib,
+                staging / BUNDLE_ZIPAPP,
+                main="alfred_pj.__main__:main",
+                filter=lambda p: "__pycache__" not in p.parts,
+            )
+        # app.sh reads this to pick the interpreter the bytecode was built for
+        (staging / ".python-version").write_text(version + "\n")
+
+        with ZipFile(output_path, "w") as zf:
+            _write_package_files(zf, SELF_CONTAINED_FILES)
+
+            for file in staging.rglob("*"):
+                if file.is_file():
+                    zf.write(file, file.relative_to(staging))
 
 
 @cli.command()
@@ -1,5 +1,12 @@
 """Alfred workflow for quickly opening projects in their appropriate editor."""
 
-from alfred_pj.cli import cli
-
 __all__ = ["cli"]
+
+
+def __getattr__(name: str):
+    # Imported lazily so the click-free entry point in __main__ stays click-free
+    if name == "cli":
+        from alfred_pj.cli import cli
+
+        return cli
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
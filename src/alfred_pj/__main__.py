@@ -0,0 +1,59 @@
+"""Entry point for ``alfred-pj`` and ``python -m alfred_pj``.
+
+``list`` runs on every keystroke in Alfred, so its plain invocations
+(``list --paths PATHS [--top N] [--query Q]``) are dispatched without importing click at
+all. Anything else goes through the click CLI.
+"""
+
+import sys
+
+# Options the click-free list path understands; anything else goes to click
+FAST_LIST_OPTIONS = ("--paths", "--top", "--query")
+
+
+def _fast_list_args(args: list[str]) -> dict[str, str] | None:
+    """Return list's options if args are a plain list invocation, else None."""
+    if not args or args[0] != "list":
+        return None
+    options = {}
+    rest = iter(args[1:])
+    for arg in rest:
+        name, eq, value = arg.partition("=")
+        if name not in FAST_LIST_OPTIONS or name in options:
+            return None
+        if not eq:
+            value = next(rest, None)
+            if value is None:
+                return None
+        options[name] = value
+    if "--paths" not in options or not options.get("--top", "0").isdigit():
+        return None
+    return options
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    options = _fast_list_args(args)
+    if options is not None:
+        from alfred_pj import profiling
+        from alfred_pj.listing import list_projects, list_top_projects
+
+        # Mirrors the profiling hook of the click group in alfred_pj.cli
+        profiler = profiling.start("list")
+        try:
+            if "--top" in options:
+                list_top_projects(options["--paths"], int(options["--top"]))
+            else:
+                list_projects(options["--paths"], query=options.get("--query"))
+        finally:
+            if profiler is not None:
+                profiler.stop()
+        return
+
+    from alfred_pj.cli import cli
+
+    cli(args=args, prog_name="alfred-pj")
+
+
+if __name__ == "__main__":
+    main()
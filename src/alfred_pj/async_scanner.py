@@ -0,0 +1,102 @@
+"""asyncio scan engine with filesystem-aware concurrency limits.
+
+An alternative to ``alfred_pj.scanner`` selected with ``SCAN_ENGINE=asyncio``.
+All blocking filesystem work runs on one sized executor, and concurrency is
+bounded twice: per root (``ROOT_CONCURRENCY`` entries in process() at once)
+and per mount (``MOUNT_CONCURRENCY`` across every root on the same
+``st_dev``), so a slow network volume can never occupy the whole executor.
+Detections that process() hands to a ``scanner.DetectionPool`` are bounded by
+the same limits there. An optional timeout cancels outstanding work and
+returns whatever finished in time.
+"""
+
+import asyncio
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TypeVar
+
+from alfred_pj.scanner import WORKERS, iter_project_entries
+from alfred_pj.tracing import Tracer
+from alfred_pj.utils import logger
+
+T = TypeVar("T")
+
+# Half the executor per mount so one slow mount can't starve the others, and
+# half of that per root so sibling roots on a mount always progress together
+MOUNT_CONCURRENCY = max(2, WORKERS // 2)
+ROOT_CONCURRENCY = max(1, MOUNT_CONCURRENCY // 2)
+
+
+def _mount_id(root: str) -> int:
+    try:
+        return os.stat(root).st_dev
+    except OSError:
+        return -1
+
+
+async def scan_async(
+    roots: list[str],
+    process: Callable[[os.DirEntry], T],
+    executor: Executor,
+    timeout: float | None = None,
+    tracer: Tracer | None = None,
+) -> list[T]:
+    """Scan roots and run process() on each project entry within the limits.
+
+    Results come back in (root, scandir) order like ``scanner.scan``. When
+    timeout (seconds) expires, pending detections are cancelled and only the
+    completed results are returned. Per-root listing time is recorded on
+    tracer as "list_roots".
+    """
+    tracer = tracer or Tracer(enabled=False)
+    loop = asyncio.get_running_loop()
+    results: list[tuple[tuple[int, int], T]] = []
+    mounts: dict[int, asyncio.Semaphore] = {}
+
+    async def scan_root(index: int, root: str) -> None:
+        mount = mounts.setdefault(
+            await loop.run_in_executor(executor, _mount_id, root),
+            asyncio.Semaphore(MOUNT_CONCURRENCY),
+        )
+        async with mount:
+            try:
+                with tracer.phase("list_roots", root):
+                    entries = await loop.run_in_executor(
+                        executor, lambda: [*iter_project_entries(root)]
+                    )
+            except OSError as e:
+                logger.error(f"error scanning {root}: {e}")
+                return
+        pending = iter(enumerate(entries))
+
+        async def worker() -> None:
+            for position, entry in pending:
+                async with mount:
+                    item = await loop.run_in_executor(executor, process, entry)
+                results.append(((index, position), item))
+
+        await asyncio.gather(*(worker() for _ in range(ROOT_CONCURRENCY)))
+
+    work = asyncio.gather(*(scan_root(index, root) for index, root in enumerate(roots)))
+    try:
+        await asyncio.wait_for(work, timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"scan timed out after {timeout}s with {len(results)} projects detected")
+
+    results.sort(key=lambda result: result[0])
+    return [item for _, item in results]
+
+
+def scan(
+    roots: list[str],
+    process: Callable[[os.DirEntry], T],
+    executor: Executor | None = None,
+    timeout: float | None = None,
+    tracer: Tracer | None = None,
+) -> list[T]:
+    """Synchronous wrapper around scan_async(), creating an executor if needed."""
+    if executor is not None:
+        return asyncio.run(scan_async(roots, process, executor, timeout, tracer))
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        return asyncio.run(scan_async(roots, process, pool, timeout, tracer))
@@ -1,9 +1,12 @@
 """Cache management for alfred-pj."""
 
 import contextlib
+import fcntl
 import json
 import os
 import random
+import stat
+import threading
 import time
 
 # Per-editor TTL ranges (seconds)
@@ -17,16 +20,68 @@ def _random_expiry(available: bool) -> float:
     return time.time() + random.uniform(lo, hi)
 
 
+def file_stamp(path: str) -> list | None:
+    """Return [mtime, size] of the regular file at path, or None if there is none."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime, st.st_size] if stat.S_ISREG(st.st_mode) else None
+
+
+def _loads(text: str) -> dict:
+    try:
+        data = json.loads(text) if text else {}
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _merge_projects(base: dict, fresh: dict, mine: dict) -> dict:
+    """Apply the fields changed from base to mine onto fresh, another run's save."""
+    for path in base.keys() | mine.keys():
+        before, after = base.get(path) or {}, mine.get(path)
+        if after is None:
+            fresh.pop(path, None)
+            continue
+        if before == after:
+            continue
+        entry = fresh.setdefault(path, {})
+        for field in before.keys() | after.keys():
+            if before.get(field) != after.get(field):
+                if field in after:
+                    entry[field] = after[field]
+                else:
+                    entry.pop(field, None)
+    return fresh
+
+
+def get_cache_dir() -> str:
+    """Return the workflow cache directory, creating it if needed."""
+    cache_dir = os.getenv("alfred_workflow_cache") or "/tmp/alfred-pj-cache"
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
 class CacheStore:
-    """Manages persistent caches for editor availability and project detection."""
+    """Manages persistent caches for editor/terminal availability and project detection."""
 
     def __init__(self):
-        cache_dir = os.getenv("alfred_workflow_cache") or "/tmp/alfred-pj-cache"
-        os.makedirs(cache_dir, exist_ok=True)
+        cache_dir = get_cache_dir()
         self._cache_dir = cache_dir
         self._editors_file = os.path.join(cache_dir, "editors_cache.json")
+        self._terminals_file = os.path.join(cache_dir, "terminals_cache.json")
         self._projects_file = os.path.join(cache_dir, "projects_cache.json")
+        self._remotes_file = os.path.join(cache_dir, "remotes_cache.json")
+        self._rules_file = os.path.join(cache_dir, "rules_cache.json")
         self._projects: dict | None = None  # lazy-loaded
+        self._projects_dirty = False
+        self._projects_text = ""  # the file as loaded (or last saved), for merging
+        self._projects_stamp: tuple | None = None
+        self._identities: dict | None = None  # file/repo id -> path, built by relocate_project
+        self._detecting: bool | None = None  # None until claim_detection() is called
+        self._detection_fd: int | None = None
+        self._claim_lock = threading.Lock()
 
     # --- Editor availability cache ---
 
@@ -36,99 +91,376 @@ class CacheStore:
         Always returns cached data regardless of per-editor expiry —
         stale entries are refreshed one-at-a-time via get_most_expired_editor().
         """
-        try:
-            with open(self._editors_file) as f:
-                data = json.load(f)
-            return data["editors"]
-        except (OSError, KeyError, json.JSONDecodeError):
-            pass
-        return None
+        return self._get_availability(self._editors_file, "editors")
 
     def set_editors(self, editors: dict) -> None:
         """Bulk-write all editors with randomized per-editor expiry."""
-        stamped = {}
-        for code, info in editors.items():
-            stamped[code] = {**info, "expires_at": _random_expiry(info.get("available", False))}
-        self._atomic_write(self._editors_file, {"editors": stamped})
+        self._set_availability(self._editors_file, "editors", editors)
 
     def get_most_expired_editor(self) -> str | None:
         """Return the editor code whose expires_at is most overdue, or None if all fresh."""
-        try:
-            with open(self._editors_file) as f:
-                data = json.load(f)
-        except (OSError, json.JSONDecodeError):
-            return None
-
-        editors = data.get("editors", {})
-        if not editors:
-            return None
-
-        code = min(editors, key=lambda c: editors[c].get("expires_at", 0))
-        if editors[code].get("expires_at", 0) < time.time():
-            return code
-        return None
+        return self._most_expired(self._editors_file, "editors")
 
     def update_editor(self, code: str, info: dict) -> None:
         """Read-modify-write a single editor entry with a new random expiry."""
-        try:
-            with open(self._editors_file) as f:
-                data = json.load(f)
-        except (OSError, json.JSONDecodeError):
-            data = {"editors": {}}
+        self._update_availability(self._editors_file, "editors", code, info)
 
-        data.setdefault("editors", {})[code] = {
-            **info,
-            "expires_at": _random_expiry(info.get("available", False)),
-        }
-        self._atomic_write(self._editors_file, data)
+    # --- Terminal availability cache (same expiry model as editors) ---
+
+    def get_terminals(self) -> dict | None:
+        """Return cached terminals dict (by name) if file exists, else None."""
+        return self._get_availability(self._terminals_file, "terminals")
+
+    def set_terminals(self, terminals: dict) -> None:
+        """Bulk-write all terminals with randomized per-terminal expiry."""
+        self._set_availability(self._terminals_file, "terminals", terminals)
+
+    def get_most_expired_terminal(self) -> str | None:
+        """Return the terminal name whose expires_at is most overdue, or None if all fresh."""
+        return self._most_expired(self._terminals_file, "terminals")
+
+    def update_terminal(self, name: str, info: dict) -> None:
+        """Read-modify-write a single terminal entry with a new random expiry."""
+        self._update_availability(self._terminals_file, "terminals", name, info)
 
     # --- Project detection cache ---
 
     def load_projects(self) -> dict:
         """Return full projects dict, lazy-loaded and memoized."""
         if self._projects is None:
-            try:
-                with open(self._projects_file) as f:
-                    self._projects = json.load(f)
-            except (OSError, json.JSONDecodeError):
-                self._projects = {}
+            self._projects_text, self._projects_stamp = self._read_projects_file()
+            self._projects = _loads(self._projects_text)
         return self._projects
 
+    def _read_projects_file(self) -> tuple[str, tuple | None]:
+        """Return the projects file's text and (inode, mtime_ns, size), or ("", None)."""
+        try:
+            with open(self._projects_file) as f:
+                st = os.fstat(f.fileno())
+                return f.read(), (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return "", None
+
     def get_project(self, path: str, mtime: float) -> str | None:
-        """Return cached editor_code if path exists in cache with matching mtime."""
+        """Return cached editor_code if path exists in cache with matching mtime.
+
+        Files read by content rules during detection must be unchanged too:
+        editing a file in place doesn't change the directory's mtime.
+        """
         projects = self.load_projects()
         entry = projects.get(path)
-        if entry and entry.get("mtime") == mtime:
-            return entry.get("editor")
-        return None
+        if not entry or entry.get("mtime") != mtime:
+            return None
+        for name, stamp in entry.get("files", {}).items():
+            if file_stamp(os.path.join(path, name)) != stamp:
+                return None
+        return entry.get("editor")
+
+    def get_stale_project(self, path: str) -> str | None:
+        """Return the cached editor_code for path even if its mtime no longer matches."""
+        entry = self.load_projects().get(path)
+        return entry.get("editor") if entry else None
 
     def set_project(self, path: str, editor_code: str, mtime: float) -> None:
         """Store entry in in-memory dict (call save_projects to persist)."""
         projects = self.load_projects()
-        projects[path] = {"editor": editor_code, "mtime": mtime}
+        entry = {"editor": editor_code, "mtime": mtime}
+        for field in ("git", "id", "content", "files"):  # none depend on the editor
+            if field in projects.get(path, {}):
+                entry[field] = projects[path][field]
+        projects[path] = entry
+        self._projects_dirty = True
+
+    def has_project(self, path: str) -> bool:
+        """Return whether anything is cached for path."""
+        return path in self.load_projects()
+
+    def set_identity(self, path: str, file_id: str) -> None:
+        """Record the file id ("st_dev:st_ino") of the project at path."""
+        entry = self.load_projects().setdefault(path, {})
+        if entry.get("id") != file_id:
+            entry["id"] = file_id
+            self._projects_dirty = True
+
+    def relocate_project(
+        self, path: str, file_id: str, repo: str | None, mtime: float
+    ) -> str | None:
+        """Move the entry of a project that moved to path and return its old path.
+
+        The old entry is the one with the same file id, or failing that the
+        same repository id, whose path no longer exists. Its detected editor
+        is kept for the new mtime; its rendered item is dropped.
+        """
+        projects = self.load_projects()
+        if self._identities is None:
+            self._identities = {}
+            for old, entry in projects.items():
+                if "id" in entry:
+                    self._identities[entry["id"]] = old
+                if entry.get("git", {}).get("repo"):
+                    self._identities.setdefault(entry["git"]["repo"], old)
+        old = self._identities.get(file_id)
+        if old is None and repo:
+            old = self._identities.get(repo)
+        if old is None or old == path or old not in projects or os.path.exists(old):
+            return None
+        entry = projects[old]
+        old_repo = entry.get("git", {}).get("repo")
+        if repo and old_repo and repo != old_repo:
+            return None  # a reused inode, not the same project
+        del projects[old]
+        entry.pop("key", None)
+        entry.pop("item", None)
+        entry["mtime"] = mtime
+        entry["id"] = file_id
+        projects[path] = entry
+        self._identities[file_id] = path
+        self._projects_dirty = True
+        return old
+
+    def forget_project(self, path: str) -> None:
+        """Drop the entry for path (call save_projects to persist)."""
+        if self.load_projects().pop(path, None) is not None:
+            self._projects_dirty = True
+
+    def get_git(self, path: str, stamp: list) -> dict | None:
+        """Return cached git info for path if stored under the same HEAD/reflog mtimes."""
+        entry = self.load_projects().get(path)
+        git = entry.get("git") if entry else None
+        if git and git.get("stamp") == stamp:
+            return git
+        return None
+
+    def get_stale_git(self, path: str) -> dict | None:
+        """Return the last cached git info for path, whatever its stamp."""
+        entry = self.load_projects().get(path)
+        return entry.get("git") if entry else None
+
+    def set_git(self, path: str, stamp: list, info: dict) -> None:
+        """Store git info for path (call save_projects to persist)."""
+        self.load_projects().setdefault(path, {})["git"] = {**info, "stamp": stamp}
+        self._projects_dirty = True
+
+    def invalidate_detections(self) -> None:
+        """Forget every detected editor (and rendered item), keeping git and content memos."""
+        for entry in self.load_projects().values():
+            for field in ("editor", "key", "item", "files"):
+                entry.pop(field, None)
+        self._projects_dirty = True
+
+    def set_content_files(self, path: str, files: dict[str, list | None]) -> None:
+        """Record the stamps of the files content rules read while detecting path.
+
+        get_project() treats the editor as stale once any of them changes.
+        """
+        entry = self.load_projects().setdefault(path, {})
+        if entry.get("files", {}) != files:
+            if files:
+                entry["files"] = files
+            else:
+                entry.pop("files", None)
+            self._projects_dirty = True
+
+    def get_content(self, path: str, key: str, stamp: list) -> bool | None:
+        """Return the memoized result of content predicate key if its file has this stamp."""
+        entry = self.load_projects().get(path)
+        memo = entry.get("content", {}).get(key) if entry else None
+        if memo and memo[:2] == stamp:
+            return memo[2]
+        return None
+
+    def set_content(self, path: str, key: str, stamp: list, result: bool) -> None:
+        """Memoize a content predicate result under its file's [mtime, size]."""
+        entry = self.load_projects().setdefault(path, {})
+        entry.setdefault("content", {})[key] = [*stamp, result]
+        self._projects_dirty = True
+
+    def get_fragment(self, path: str, key: list) -> str | None:
+        """Return the rendered item for path if it was stored under the same key."""
+        entry = self.load_projects().get(path)
+        if entry and entry.get("key") == key:
+            return entry.get("item")
+        return None
+
+    def set_fragment(self, path: str, key: list, fragment: str) -> None:
+        """Attach a rendered item to the cached project entry for path.
+
+        key lists everything the fragment was rendered from (editor name,
+        icon, home-relative path); set_project drops the fragment.
+        """
+        entry = self.load_projects().get(path)
+        if entry is not None:
+            entry["key"] = key
+            entry["item"] = fragment
+            self._projects_dirty = True
 
     def save_projects(self) -> None:
-        """Atomically write projects cache to disk."""
-        if self._projects is not None:
-            self._atomic_write(self._projects_file, self._projects)
+        """Atomically write projects cache to disk if it changed since loading.
+
+        Saves are serialized by a lock file. If another run saved since this
+        one loaded, only the fields this run changed are applied on top of
+        that save, so neither run's detections are lost.
+        """
+        if self._projects is None or not self._projects_dirty:
+            return
+        fd = os.open(self._projects_file + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            text, stamp = self._read_projects_file()
+            if stamp != self._projects_stamp:
+                base = _loads(self._projects_text)
+                self._projects = _merge_projects(base, _loads(text), self._projects)
+                self._identities = None
+            text = json.dumps(self._projects)
+            self._atomic_write_text(self._projects_file, text)
+            self._projects_text, self._projects_stamp = self._read_projects_file()
+            self._projects_dirty = False
+        finally:
+            os.close(fd)
+
+    # --- Detection in progress ---
+
+    def claim_detection(self) -> bool:
+        """Return whether this process may run detections, taking the lock on first call.
+
+        Only one run detects at a time: a run whose detections outlive its
+        response holds the lock until release_detection(), and others serve
+        stale results meanwhile. The lock is a flock, so it is released when
+        its process exits and a crashed run never leaves it behind.
+        """
+        with self._claim_lock:
+            if self._detecting is None:
+                fd = os.open(
+                    os.path.join(self._cache_dir, "detecting.lock"), os.O_RDWR | os.O_CREAT
+                )
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    os.close(fd)
+                    self._detecting = False
+                else:
+                    self._detection_fd = fd
+                    self._detecting = True
+            return self._detecting
+
+    def release_detection(self) -> None:
+        """Release the detection lock, if held; call after save_projects()."""
+        if self._detection_fd is not None:
+            os.close(self._detection_fd)
+            self._detection_fd = None
+            self._detecting = None
+
+    # --- Remote web URL cache ---
+
+    def get_remote(self, path: str, stamp: list) -> tuple[bool, str | None]:
+        """Return (hit, url) for path; a hit needs the same git file mtimes.
+
+        url may be None on a hit: "no parsable remote" is cached too.
+        """
+        try:
+            with open(self._remotes_file) as f:
+                entry = json.load(f).get(path)
+        except (OSError, AttributeError, json.JSONDecodeError):
+            return False, None
+        if entry and entry.get("stamp") == stamp:
+            return True, entry.get("url")
+        return False, None
+
+    def set_remote(self, path: str, url: str | None, stamp: list) -> None:
+        """Read-modify-write the remote entry for path."""
+        try:
+            with open(self._remotes_file) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        data[path] = {"url": url, "stamp": stamp}
+        self._atomic_write(self._remotes_file, data)
+
+    # --- Compiled user rules ---
+
+    def get_rules(self) -> dict | None:
+        """Return the cached {"stamp": ..., "rules": ...} of the rules file, or None."""
+        try:
+            with open(self._rules_file) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def set_rules(self, entry: dict) -> None:
+        self._atomic_write(self._rules_file, entry)
 
     # --- Lifecycle ---
 
     def clear(self) -> None:
-        """Delete both cache files."""
-        for path in (self._editors_file, self._projects_file):
+        """Delete all cache files."""
+        for path in (
+            self._editors_file,
+            self._terminals_file,
+            self._projects_file,
+            self._remotes_file,
+            self._rules_file,
+        ):
             with contextlib.suppress(OSError):
                 os.remove(path)
         self._projects = None
+        self._projects_dirty = False
+        self._projects_text, self._projects_stamp = "", None
 
     # --- Helpers ---
 
+    def _get_availability(self, path: str, key: str) -> dict | None:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return data[key]
+        except (OSError, KeyError, json.JSONDecodeError):
+            pass
+        return None
+
+    def _set_availability(self, path: str, key: str, entries: dict) -> None:
+        stamped = {}
+        for name, info in entries.items():
+            stamped[name] = {**info, "expires_at": _random_expiry(info.get("available", False))}
+        self._atomic_write(path, {key: stamped})
+
+    def _most_expired(self, path: str, key: str) -> str | None:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        entries = data.get(key, {})
+        if not entries:
+            return None
+
+        name = min(entries, key=lambda n: entries[n].get("expires_at", 0))
+        if entries[name].get("expires_at", 0) < time.time():
+            return name
+        return None
+
+    def _update_availability(self, path: str, key: str, name: str, info: dict) -> None:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = {key: {}}
+
+        data.setdefault(key, {})[name] = {
+            **info,
+            "expires_at": _random_expiry(info.get("available", False)),
+        }
+        self._atomic_write(path, data)
+
     def _atomic_write(self, path: str, data: dict) -> None:
         """Write data atomically via a temp file + rename."""
+        self._atomic_write_text(path, json.dumps(data))
+
+    def _atomic_write_text(self, path: str, text: str) -> None:
         tmp = path + ".tmp"
         try:
             with open(tmp, "w") as f:
-                json.dump(data, f)
+                f.write(text)
             os.replace(tmp, path)
         except OSError:
             with contextlib.suppress(OSError):
@@ -1,39 +1,38 @@
 #!/usr/bin/env python3
 """Alfred workflow CLI for opening projects in appropriate editors."""
 
+import importlib
+
 import click
 
-from alfred_pj.commands import (
-    clear_cache,
-    clear_usage,
-    debug,
-    editor,
-    list,
-    open_finder,
-    open_github,
-    open_project,
-    open_terminal,
-    open_vscode,
-    record_selection,
-)
-
-
-@click.group()
-def cli():
-    pass
-
-
-cli.add_command(list)
-cli.add_command(editor)
-cli.add_command(record_selection)
-cli.add_command(clear_cache)
-cli.add_command(clear_usage)
-cli.add_command(debug)
-cli.add_command(open_project)
-cli.add_command(open_vscode)
-cli.add_command(open_terminal)
-cli.add_command(open_github)
-cli.add_command(open_finder)
+from alfred_pj import profiling
+from alfred_pj.commands import COMMANDS
+
+
+class LazyGroup(click.Group):
+    """Click group that imports a command's module only when it is looked up."""
+
+    def __init__(self, *args, lazy_commands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module_name = self.lazy_commands[cmd_name]
+            module = importlib.import_module(f"alfred_pj.commands.{module_name}")
+            self.add_command(getattr(module, module_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup, lazy_commands=COMMANDS)
+@click.pass_context
+def cli(ctx):
+    profiler = profiling.start(ctx.invoked_subcommand or "cli")
+    if profiler is not None:
+        ctx.call_on_close(profiler.stop)
 
 
 if __name__ == "__main__":
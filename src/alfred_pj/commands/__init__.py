@@ -1,27 +1,34 @@
-"""CLI commands for alfred-pj."""
+"""CLI commands for alfred-pj.
 
-from alfred_pj.commands.clear_cache import clear_cache
-from alfred_pj.commands.clear_usage import clear_usage
-from alfred_pj.commands.debug import debug
-from alfred_pj.commands.editor import editor
-from alfred_pj.commands.list import list
-from alfred_pj.commands.open_finder import open_finder
-from alfred_pj.commands.open_github import open_github
-from alfred_pj.commands.open_project import open_project
-from alfred_pj.commands.open_terminal import open_terminal
-from alfred_pj.commands.open_vscode import open_vscode
-from alfred_pj.commands.record_selection import record_selection
+Commands are imported lazily so that running one command does not pay for
+importing the others (see ``alfred_pj.cli.LazyGroup``).
+"""
 
-__all__ = [
-    "clear_cache",
-    "clear_usage",
-    "debug",
-    "editor",
-    "list",
-    "open_finder",
-    "open_github",
-    "open_project",
-    "open_terminal",
-    "open_vscode",
-    "record_selection",
-]
+import importlib
+
+# Command name -> module name; each module exports a command of the same name
+COMMANDS = {
+    "clear-cache": "clear_cache",
+    "clear-usage": "clear_usage",
+    "debug": "debug",
+    "editor": "editor",
+    "list": "list",
+    "open-finder": "open_finder",
+    "open-github": "open_github",
+    "open-project": "open_project",
+    "open-terminal": "open_terminal",
+    "open-vscode": "open_vscode",
+    "record-selection": "record_selection",
+}
+
+__all__ = sorted(COMMANDS.values())
+
+
+def __getattr__(name: str):
+    """Import a command on first attribute access."""
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    command = getattr(importlib.import_module(f"{__name__}.{name}"), name)
+    # Importing the submodule binds the module under this name; rebind the command
+    globals()[name] = command
+    return command
@@ -5,7 +5,7 @@ import shutil
 
 import click
 
-from alfred_pj.usage import UsageData
+from alfred_pj.usage import clear_all
 
 
 @click.command()
@@ -16,9 +16,7 @@ def clear_cache(usage: bool, alfred: bool):
     cleared = []
 
     if usage:
-        usage_data = UsageData()
-        usage_data.clear()
-        usage_data.write_data()
+        clear_all()
         cleared.append("usage statistics")
 
     if alfred:
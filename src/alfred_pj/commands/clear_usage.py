@@ -2,12 +2,10 @@
 
 import click
 
-from alfred_pj.usage import UsageData
+from alfred_pj.usage import clear_all
 
 
 @click.command()
 def clear_usage():
     """Clear all usage statistics."""
-    usage = UsageData()
-    usage.clear()
-    usage.write_data()
+    clear_all()
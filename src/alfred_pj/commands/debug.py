@@ -1,17 +1,39 @@
 """Debug command to troubleshoot editor detection."""
 
+import contextlib
+import io
 import os
 
 import click
 
-from alfred_pj.editors import DETECTORS, EDITOR_DEFS, Editors
+from alfred_pj.editors import Editors
 from alfred_pj.utils import which
 
 
 @click.command()
 @click.option("--path", help="Path to test detection for")
-def debug(path: str | None):
+@click.option(
+    "--list",
+    "list_paths",
+    help="Run the list pipeline on these comma-separated roots and show its timing breakdown",
+)
+@click.option("--stats", is_flag=True, help="Show latency percentiles of recent list runs")
+@click.option("--runs", type=int, help="Limit --stats to the last N runs")
+@click.option(
+    "--profiles", is_flag=True, help="List and summarize profiles captured via alfred_pj_profile"
+)
+def debug(path: str | None, list_paths: str | None, stats: bool, runs: int | None, profiles: bool):
     """Debug editor detection and environment."""
+    if list_paths:
+        _trace_list(list_paths)
+        return
+    if stats:
+        _latency_stats(runs)
+        return
+    if profiles:
+        _show_profiles()
+        return
+
     click.echo("=== Environment ===")
     click.echo(f"PATH: {os.environ.get('PATH', 'not set')[:100]}...")
     click.echo(f"HOME: {os.environ.get('HOME', 'not set')}")
@@ -26,7 +48,7 @@ def debug(path: str | None):
 
     if path:
         click.echo(f"=== Detection for {path} ===")
-        for detector in DETECTORS:
+        for detector in editors.detectors:
             if editors._matches_detector(path, detector):
                 click.echo(f"Matched detector: {detector['name']}")
                 click.echo(f"  Env var: {detector.get('env')}")
@@ -38,7 +60,7 @@ def debug(path: str | None):
                 result = editors.determine_editor(path)
                 click.echo(f"  Final editor: {result}")
                 # Show if any dynamic editors were registered
-                dynamic = {k: v for k, v in editors.editors.items() if k not in EDITOR_DEFS}
+                dynamic = {k: v for k, v in editors.editors.items() if k not in editors.editor_defs}
                 if dynamic:
                     click.echo()
                     click.echo("=== Dynamic Editors Registered ===")
@@ -49,3 +71,58 @@ def debug(path: str | None):
         else:
             click.echo("No detector matched, using default")
             click.echo(f"  Final editor: {editors.default_editor}")
+
+
+def _trace_list(paths: str) -> None:
+    """Run list against paths with tracing enabled and print the breakdown."""
+    from alfred_pj.listing import list_projects
+    from alfred_pj.tracing import Tracer
+
+    tracer = Tracer(enabled=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        list_projects(paths, tracer=tracer)
+    click.echo(f"=== List timing for {paths} ===")
+    click.echo("(list_roots and detect are summed across worker threads)")
+    click.echo(tracer.summary())
+
+
+def _latency_stats(runs: int | None) -> None:
+    """Print p50/p95/p99 per phase and the cache hit ratio from the latency log."""
+    from alfred_pj.latency import PHASES, LatencyLog, percentile
+
+    records = LatencyLog().read(last=runs)
+    if not records:
+        click.echo("No list runs recorded yet")
+        return
+
+    click.echo(f"=== List latency (last {len(records)} runs) ===")
+    click.echo(f"  {'phase':<16}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    rows = [("total", [r.total_ms for r in records])]
+    rows.append(("post_response", [r.post_response_ms for r in records]))
+    rows += [(name, [r.phases[name] for r in records]) for name in PHASES]
+    for name, values in rows:
+        if not any(values):
+            continue
+        p50, p95, p99 = (percentile(values, p) for p in (50, 95, 99))
+        click.echo(f"  {name:<16}{p50:9.1f}{p95:9.1f}{p99:9.1f}")
+
+    hits = sum(r.cache_hits for r in records)
+    misses = sum(r.cache_misses for r in records)
+    ratio = hits / (hits + misses) * 100 if hits + misses else 0.0
+    click.echo(f"Cache hit ratio: {ratio:.1f}% ({hits} hits, {misses} misses)")
+
+
+def _show_profiles() -> None:
+    """List captured profiles, newest first, with a short summary of each."""
+    from alfred_pj.profiling import PROFILE_ENV, list_profiles, profiles_dir, summarize
+
+    paths = list_profiles()
+    if not paths:
+        click.echo(f"No profiles in {profiles_dir()}; set {PROFILE_ENV}=cpu or mem to capture")
+        return
+    click.echo(f"=== Profiles in {profiles_dir()} ===")
+    for path in paths:
+        click.echo()
+        click.echo(os.path.basename(path))
+        for line in summarize(path):
+            click.echo(f"  {line}")
@@ -2,11 +2,17 @@
 
 import click
 
-from alfred_pj.editors import Editors
+from alfred_pj.editors import cached_editor
 
 
 @click.command()
 @click.option("--path", required=True, type=click.Path(), help="Project path.")
-def editor(path):
+@click.option(
+    "--editor",
+    "editor_code",
+    envvar="alfred_pj_editor",
+    help="Editor already chosen by list (set as an Alfred item variable).",
+)
+def editor(path, editor_code):
     """Determine and output the appropriate editor for a project."""
-    click.echo(Editors().determine_editor(path))
+    click.echo(editor_code or cached_editor(path))
@@ -4,9 +4,16 @@ import subprocess
 
 import click
 
+from alfred_pj.git import cached_remote_web_url
+
 
 @click.command()
 @click.option("--path", required=True, type=click.Path(exists=True), help="Project path.")
 def open_github(path):
     """Open GitHub page for the project."""
-    subprocess.run(["gh", "browse"], cwd=path)
+    url = cached_remote_web_url(path)
+    if url:
+        subprocess.run(["open", url])
+    else:
+        # No remote we can read offline (or an ssh host alias): let gh work it out
+        subprocess.run(["gh", "browse"], cwd=path)
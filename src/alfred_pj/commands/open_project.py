@@ -1,29 +1,47 @@
 """Open project command."""
 
 import os
-import subprocess
 
 import click
 
-from alfred_pj.editors import Editors
-from alfred_pj.usage import UsageData
+from alfred_pj.editors import cached_editors
+from alfred_pj.launch import collect_paths, open_with
+from alfred_pj.usage import clear_all
 
 
 @click.command()
-@click.option("--path", required=True, type=click.Path(), help="Project path.")
-def open_project(path):
-    """Open project in the detected editor."""
-    if path == "__CLEAR_USAGE__":
-        usage = UsageData()
-        usage.clear()
-        usage.write_data()
+@click.option(
+    "--path",
+    "path_args",
+    required=True,
+    multiple=True,
+    help="Project path; repeat, tab-separate, or pass '-' to read paths from stdin.",
+)
+@click.option(
+    "--editor",
+    "editor_code",
+    envvar="alfred_pj_editor",
+    help="Editor already chosen by list (set as an Alfred item variable).",
+)
+def open_project(path_args, editor_code):
+    """Open projects in their detected editors."""
+    paths = collect_paths(path_args)
+    if paths == ["__CLEAR_USAGE__"]:
+        clear_all()
         return
-    if path == "__CLEAR_CACHE__":
+    if paths == ["__CLEAR_CACHE__"]:
         from alfred_pj.cache import CacheStore
 
         CacheStore().clear()
         return
-    if not os.path.exists(path):
-        raise click.BadParameter(f"Path '{path}' does not exist.", param_hint="'--path'")
-    editor_cmd = Editors().determine_editor(path)
-    subprocess.run([editor_cmd, path])
+    for path in paths:
+        if not os.path.exists(path):
+            raise click.BadParameter(f"Path '{path}' does not exist.", param_hint="'--path'")
+    # The item variable describes a single selected item
+    single = editor_code and len(paths) == 1
+    resolved = {paths[0]: editor_code} if single else cached_editors(paths)
+    by_editor: dict[str, list[str]] = {}
+    for path, code in resolved.items():
+        by_editor.setdefault(code, []).append(path)
+    for code, editor_paths in by_editor.items():
+        open_with(code, editor_paths)
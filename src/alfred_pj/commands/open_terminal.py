@@ -1,18 +1,35 @@
 """Open terminal command."""
 
+import os
+
 import click
 
+from alfred_pj.cache import CacheStore
+from alfred_pj.launch import collect_paths
 from alfred_pj.terminals import Terminals
 from alfred_pj.utils import logger
 
 
 @click.command()
-@click.option("--path", required=True, type=click.Path(exists=True), help="Project path.")
-def open_terminal(path):
-    """Open terminal and cd to project directory.
+@click.option(
+    "--path",
+    "path_args",
+    required=True,
+    multiple=True,
+    help="Project path; repeat, tab-separate, or pass '-' to read paths from stdin.",
+)
+def open_terminal(path_args):
+    """Open terminal and cd to each project directory.
 
     Supports: Ghostty, WezTerm, iTerm, Terminal (in priority order).
     """
-    terminal = Terminals.get_available_terminal()
+    paths = collect_paths(path_args)
+    for path in paths:
+        if not os.path.exists(path):
+            raise click.BadParameter(f"Path '{path}' does not exist.", param_hint="'--path'")
+    cache = CacheStore()
+    terminal = Terminals.get_available_terminal(cache)
     logger.debug(f"Using terminal: {terminal['name']}")
-    terminal["open"](path)
+    for path in paths:
+        terminal["open"](path)  # detached, so the launches overlap
+    Terminals.refresh_stale_terminal(cache)
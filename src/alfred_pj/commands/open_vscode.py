@@ -1,12 +1,24 @@
 """Open VS Code command."""
 
-import subprocess
+import os
 
 import click
 
+from alfred_pj.launch import collect_paths, spawn
+
 
 @click.command()
-@click.option("--path", required=True, type=click.Path(exists=True), help="Project path.")
-def open_vscode(path):
-    """Open project in VS Code."""
-    subprocess.run(["code", path])
+@click.option(
+    "--path",
+    "path_args",
+    required=True,
+    multiple=True,
+    help="Project path; repeat, tab-separate, or pass '-' to read paths from stdin.",
+)
+def open_vscode(path_args):
+    """Open projects in VS Code (one window for several folders)."""
+    paths = collect_paths(path_args)
+    for path in paths:
+        if not os.path.exists(path):
+            raise click.BadParameter(f"Path '{path}' does not exist.", param_hint="'--path'")
+    spawn(["code", *paths])
@@ -2,15 +2,50 @@
 
 import click
 
-from alfred_pj.usage import UsageData
+from alfred_pj.launch import collect_paths
+from alfred_pj.usage import (
+    COMPACT_EVERY,
+    EVENT_SIZE,
+    QueryUsage,
+    UsageData,
+    append_selection,
+    normalize_query,
+)
 
 
 @click.command()
-@click.option("--path", required=True, type=click.Path(), help="Project path.")
-def record_selection(path):
-    """Record a project selection for usage tracking."""
-    if path == "__CLEAR_USAGE__":
+@click.option(
+    "--path",
+    "path_args",
+    required=True,
+    multiple=True,
+    help="Project path; repeat, tab-separate, or pass '-' to read paths from stdin.",
+)
+@click.option(
+    "--query",
+    envvar="alfred_pj_query",
+    default="",
+    help="Query the project was selected for (set as an Alfred variable by list --query).",
+)
+def record_selection(path_args, query):
+    """Record project selections for usage tracking."""
+    paths = [p for p in collect_paths(path_args) if p not in ("__CLEAR_USAGE__", "__CLEAR_CACHE__")]
+    if not paths:
         return
-    usage = UsageData()
-    usage.add_usage(path)
-    usage.write_data()
+    size = 0
+    for path in paths:
+        appended = append_selection(path)
+        if appended is None:
+            # Too long for a journal event: update the aggregate directly
+            usage = UsageData()
+            usage.add_usage(path)
+            usage.write_data()
+        else:
+            size = appended
+    if size >= COMPACT_EVERY * EVENT_SIZE:
+        UsageData().compact()
+    if normalize_query(query):
+        queries = QueryUsage()
+        for path in paths:
+            queries.add(query, path)
+        queries.write_data()
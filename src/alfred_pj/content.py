@@ -0,0 +1,73 @@
+"""Content predicates for detectors: bounded reads of a project file.
+
+A predicate names a file relative to the project and exactly one matcher:
+
+- ``{"file": "package.json", "json": "dependencies.react"}``: the file is a
+  JSON object holding that dot-separated key path
+- ``{"file": "pyproject.toml", "toml": "tool.poetry"}``: the file defines
+  that table (or a subtable of it)
+- ``{"file": "Makefile", "contains": "cargo"}``: the text occurs in the file
+
+At most ``max_bytes`` (default MAX_BYTES) are read. A JSON file larger than
+that never matches, while toml and contains only look at the first bytes.
+"""
+
+import json
+import re
+
+MAX_BYTES = 64 * 1024
+MATCHERS = ("json", "toml", "contains")
+
+# [table] or [[array.of.tables]], with optional whitespace and quoted keys
+_TOML_HEADER = re.compile(rb"^[ \t]*\[\[?([^\[\]\r\n]+)\]\]?[ \t]*(?:#.*)?$", re.MULTILINE)
+
+
+def matcher(predicate: dict) -> str | None:
+    """Return the single matcher named by predicate, or None if it has none or several."""
+    found = [name for name in MATCHERS if name in predicate]
+    return found[0] if len(found) == 1 else None
+
+
+def _json_has_path(content: bytes, key_path: str) -> bool:
+    try:
+        node = json.loads(content)
+    except ValueError:
+        return False
+    for key in key_path.split("."):
+        if not isinstance(node, dict) or key not in node:
+            return False
+        node = node[key]
+    return True
+
+
+def _toml_table_key(header: bytes) -> str:
+    """Normalize a table header: strip whitespace and quotes around each key."""
+    keys = header.decode(errors="replace").split(".")
+    return ".".join(key.strip().strip("\"'") for key in keys)
+
+
+def _toml_has_table(content: bytes, table: str) -> bool:
+    prefix = table + "."
+    for match in _TOML_HEADER.finditer(content):
+        key = _toml_table_key(match.group(1))
+        if key == table or key.startswith(prefix):
+            return True
+    return False
+
+
+def matches(file_path: str, predicate: dict, size: int) -> bool:
+    """Return whether the file at file_path (of size bytes) satisfies predicate."""
+    kind = matcher(predicate)
+    limit = predicate.get("max_bytes", MAX_BYTES)
+    if kind is None or (kind == "json" and size > limit):
+        return False
+    try:
+        with open(file_path, "rb") as f:
+            content = f.read(limit)
+    except OSError:
+        return False
+    if kind == "json":
+        return _json_has_path(content, predicate["json"])
+    if kind == "toml":
+        return _toml_has_table(content, predicate["toml"])
+    return predicate["contains"].encode() in content
@@ -1,11 +1,17 @@
 """Editor detection and configuration."""
 
 import glob
+import json
 import os
 
+from alfred_pj import content
+from alfred_pj.cache import file_stamp
+from alfred_pj.rules import load_rules, merge
 from alfred_pj.utils import logger, which
 
-# Detection rules - order matters (first match wins)
+# Detection rules - order matters (first match wins). Besides dirs, files and
+# globs, a rule may list "content" predicates (see alfred_pj.content). User
+# rules are merged in by Editors (see alfred_pj.rules).
 DETECTORS = [
     # Obsidian vault
     {
@@ -118,8 +124,14 @@ EDITOR_DEFS = {
 
 
 class Editors:
-    def __init__(self, cache=None):
+    def __init__(self, cache=None, executor=None):
         self._cache = cache
+        self._executor = executor  # shared executor for availability checks, if any
+        rules = load_rules(cache)
+        if rules is None:
+            self.detectors, self.editor_defs = DETECTORS, EDITOR_DEFS
+        else:
+            self.detectors, self.editor_defs = merge(DETECTORS, EDITOR_DEFS, rules)
         self.default_editor = (
             os.environ["DEFAULT_EDITOR"]
             if ("DEFAULT_EDITOR" in os.environ and os.environ["DEFAULT_EDITOR"])
@@ -134,18 +146,23 @@ class Editors:
             cached = self._cache.get_editors()
             if cached is not None:
                 logger.debug("editors loaded from cache")
+                # Editors defined by rules since the cache was written are checked on first use
+                for code, info in cached.items():
+                    if code in self.editor_defs:
+                        info.update(self.editor_defs[code])
                 return cached
 
-        from concurrent.futures import ThreadPoolExecutor
-
         def check_editor(item: tuple) -> tuple:
             code, info = item
             return code, {**info, "available": bool(which(code))}
 
-        with ThreadPoolExecutor(max_workers=len(EDITOR_DEFS)) as executor:
-            results = executor.map(check_editor, EDITOR_DEFS.items())
+        if self._executor is not None:
+            result = dict(self._executor.map(check_editor, self.editor_defs.items()))
+        else:
+            from concurrent.futures import ThreadPoolExecutor
 
-        result = dict(results)
+            with ThreadPoolExecutor(max_workers=len(self.editor_defs)) as executor:
+                result = dict(executor.map(check_editor, self.editor_defs.items()))
 
         if self._cache is not None:
             self._cache.set_editors(result)
@@ -160,7 +177,7 @@ class Editors:
         if code is None:
             return
         logger.debug(f"refreshing stale editor: {code}")
-        base = EDITOR_DEFS.get(code, {"name": code, "icon": {"path": "icon.png"}})
+        base = self.editor_defs.get(code, {"name": code, "icon": {"path": "icon.png"}})
         info = {**base, "available": bool(which(code))}
         self.editors[code] = info
         self._cache.update_editor(code, info)
@@ -172,9 +189,13 @@ class Editors:
         return self.editors.get(editor_code)
 
     def _register_dynamic_editor(self, editor_code: str) -> None:
-        """Register an editor not in EDITOR_DEFS if it's available on the system."""
+        """Register an editor not in the availability cache if it's available on the system."""
         path = which(editor_code)
-        if path:
+        if editor_code in self.editor_defs:
+            self.editors[editor_code] = {**self.editor_defs[editor_code], "available": bool(path)}
+            if self._cache is not None:
+                self._cache.update_editor(editor_code, self.editors[editor_code])
+        elif path:
             # Create a display name from the command (e.g., "cursor" -> "Cursor")
             display_name = editor_code.replace("-", " ").replace("_", " ").title()
             self.editors[editor_code] = {
@@ -218,8 +239,8 @@ class Editors:
             return defaults
         return [editor.strip() for editor in editors.lower().split(",")]
 
-    def _matches_detector(self, path: str, detector: dict) -> bool:
-        """Check if a path matches a detector's rules."""
+    def _matches_detector(self, path: str, detector: dict, read: dict | None = None) -> bool:
+        """Check if a path matches a detector's rules; read collects content file stamps."""
         # Check exclude conditions first
         if "exclude_dirs" in detector and any(
             os.path.isdir(os.path.join(path, d)) for d in detector["exclude_dirs"]
@@ -239,19 +260,84 @@ class Editors:
             return True
 
         # Check for matching glob patterns
-        return "globs" in detector and any(
+        if "globs" in detector and any(
             len(glob.glob(os.path.join(path, g))) > 0 for g in detector["globs"]
+        ):
+            return True
+
+        # Check file contents last: they cost a read
+        return "content" in detector and any(
+            self._matches_content(path, predicate, read) for predicate in detector["content"]
         )
 
+    def _matches_content(self, path: str, predicate: dict, read: dict | None = None) -> bool:
+        """Evaluate a content predicate, memoized in the project cache by [mtime, size].
+
+        The file's stamp (None if it is missing) is added to read.
+        """
+        file_path = os.path.join(path, predicate["file"])
+        stamp = file_stamp(file_path)
+        if read is not None:
+            read[predicate["file"]] = stamp
+        if stamp is None:
+            return False
+        key = json.dumps(predicate, sort_keys=True)
+        if self._cache is not None:
+            result = self._cache.get_content(path, key, stamp)
+            if result is not None:
+                return result
+        result = content.matches(file_path, predicate, stamp[1])
+        if self._cache is not None:
+            self._cache.set_content(path, key, stamp, result)
+        return result
+
     def determine_editor(self, path: str) -> str:
         """Determine the appropriate editor for a project path."""
         logger.debug(f"determining editor for {path}")
 
-        for detector in DETECTORS:
-            if self._matches_detector(path, detector):
+        read: dict[str, list | None] = {}
+        editor_code = self.default_editor
+        for detector in self.detectors:
+            if self._matches_detector(path, detector, read):
                 logger.debug(f"matched detector: {detector['name']}")
-                return self.get_first_available_editor(
+                editor_code = self.get_first_available_editor(
                     self.get_editors_from_environment(detector.get("env"), detector["editors"])
                 )
+                break
+        if self._cache is not None:
+            # Editing one of these files in place must trigger a new detection
+            self._cache.set_content_files(path, read)
+        return editor_code
 
-        return self.default_editor
+
+def cached_editors(paths: list[str]) -> dict[str, str]:
+    """Return {path: editor} from the project cache, detecting only the misses.
+
+    Entries are validated by the directory mtime, exactly as list does. One
+    CacheStore serves all paths; Editors (and its availability checks) is
+    built once, on the first miss.
+    """
+    from alfred_pj.cache import CacheStore
+
+    cache = CacheStore()
+    editors = None
+    result = {}
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = 0.0
+        editor_code = cache.get_project(path, mtime)
+        if editor_code is None:
+            if editors is None:
+                editors = Editors(cache=cache)
+            editor_code = editors.determine_editor(path)
+            cache.set_project(path, editor_code, mtime)
+        result[path] = editor_code
+    cache.save_projects()  # no-op if everything hit
+    return result
+
+
+def cached_editor(path: str) -> str:
+    """Return the editor for path from the project cache, detecting it only on a miss."""
+    return cached_editors([path])[path]
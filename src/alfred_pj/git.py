@@ -0,0 +1,343 @@
+"""Read-only access to a project's git metadata without running git.
+
+Only the files git itself keeps under .git are parsed: HEAD, its reflog
+(read backwards from the end), config and the remote HEAD refs. Worktrees
+and submodules, whose .git is a file holding a ``gitdir:`` pointer, are
+followed to the real git directory.
+"""
+
+import os
+import re
+import stat
+
+from alfred_pj.cache import CacheStore
+
+_SECTION = re.compile(r'^\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+_URL = re.compile(r"^(?:https?|ssh|git|git\+ssh|ssh\+git)://(?:[^@/]+@)?([^/:]+)(?::\d*)?/(.+)$")
+_SCP = re.compile(r"^(?:[^@/]+@)?([^:/]+):(?!//)(.+)$")  # [user@]host:owner/repo
+# A host with a public name: dot-separated labels ending in a letters-only TLD, or IPv4
+_DOMAIN = re.compile(r"^(?:[a-z0-9-]+\.)+[a-z]{2,}$|^\d{1,3}(?:\.\d{1,3}){3}$", re.IGNORECASE)
+
+# logs/HEAD is read backwards in chunks, giving up after REFLOG_MAX bytes
+REFLOG_CHUNK = 4096
+REFLOG_MAX = 64 * 1024
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def find_git_dir(path: str) -> str | None:
+    """Return the git directory of the repository rooted at path, or None."""
+    dot_git = os.path.join(path, ".git")
+    try:
+        st = os.stat(dot_git)  # the only syscall for non-repositories
+    except OSError:
+        return None
+    if stat.S_ISDIR(st.st_mode):
+        return dot_git
+    content = _read(dot_git)
+    if content is None or not content.startswith("gitdir:"):
+        return None
+    git_dir = os.path.join(path, content[len("gitdir:") :].strip())
+    return os.path.normpath(git_dir) if os.path.isdir(git_dir) else None
+
+
+def common_dir(git_dir: str) -> str:
+    """Return the directory holding config and shared refs (differs for worktrees)."""
+    content = _read(os.path.join(git_dir, "commondir"))
+    if content is None or not content.strip():
+        return git_dir
+    return os.path.normpath(os.path.join(git_dir, content.strip()))
+
+
+def current_branch(git_dir: str) -> str | None:
+    """Return the checked-out branch name, or None on a detached HEAD."""
+    head = _read(os.path.join(git_dir, "HEAD"))
+    if head is None or not head.startswith("ref: refs/heads/"):
+        return None
+    return head[len("ref: refs/heads/") :].strip()
+
+
+def head_name(git_dir: str) -> str | None:
+    """Return the checked-out branch, or the short commit id on a detached HEAD."""
+    head = _read(os.path.join(git_dir, "HEAD"))
+    if head is None:
+        return None
+    if head.startswith("ref: refs/heads/"):
+        return head[len("ref: refs/heads/") :].strip()
+    return head.strip()[:7] or None
+
+
+def _reflog_entry(line: bytes) -> tuple[float, bytes] | None:
+    """Parse '<old> <new> <name> <email> <timestamp> <tz><TAB><message>'."""
+    meta, _, message = line.partition(b"\t")
+    parts = meta.rsplit(b" ", 2)
+    if len(parts) < 3:
+        return None
+    try:
+        return float(parts[1]), message
+    except ValueError:
+        return None
+
+
+def last_commit_time(git_dir: str) -> float | None:
+    """Return the time of the newest commit recorded in HEAD's reflog.
+
+    The file is read from its end, so the cost does not grow with history.
+    Falls back to the newest entry of any kind (clone, checkout, ...) when no
+    commit is found in the last REFLOG_MAX bytes.
+    """
+    try:
+        with open(os.path.join(git_dir, "logs", "HEAD"), "rb") as f:
+            return _newest_commit(f)
+    except OSError:
+        return None
+
+
+def _newest_commit(f) -> float | None:
+    newest = None
+    end = pos = f.seek(0, os.SEEK_END)
+    partial = b""
+    while pos > 0 and end - pos < REFLOG_MAX:
+        step = min(REFLOG_CHUNK, pos)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + partial).split(b"\n")
+        # Unless at the start of the file, the first line may be cut off
+        partial = lines.pop(0) if pos > 0 else b""
+        for line in reversed(lines):
+            entry = _reflog_entry(line)
+            if entry is None:
+                continue
+            timestamp, message = entry
+            if newest is None:
+                newest = timestamp
+            if message.startswith(b"commit"):
+                return timestamp
+    return newest
+
+
+def head_stamp(git_dir: str) -> list[float]:
+    """Return the mtimes of HEAD and its reflog, which change with every checkout or commit."""
+    stamp = []
+    for name in ("HEAD", os.path.join("logs", "HEAD")):
+        try:
+            stamp.append(os.stat(os.path.join(git_dir, name)).st_mtime)
+        except OSError:
+            stamp.append(0.0)
+    return stamp
+
+
+def repo_identity(git_dir: str) -> str | None:
+    """Return an id for the repository that usually survives moving or copying it.
+
+    It is the commit and time of the oldest reflog entry (usually the clone
+    or initial commit). That entry is not permanent: ``git gc`` expires
+    reflog entries older than 90 days by default, which changes the id. The
+    cached id is re-read whenever the reflog changes, so a project is only
+    taken for a new one if it is both expired and moved between two list
+    runs. The root commit would be stable, but finding it means reading the
+    object database, which this module avoids.
+    """
+    try:
+        with open(os.path.join(git_dir, "logs", "HEAD"), "rb") as f:
+            line = f.readline(1024)
+    except OSError:
+        return None
+    entry = _reflog_entry(line.rstrip(b"\n"))
+    commits = line.split(b" ", 2)
+    if entry is None or len(commits) < 3:
+        return None
+    return f"{commits[1].decode(errors='replace')}@{entry[0]:.0f}"
+
+
+def head_summary(git_dir: str) -> dict:
+    """Return {"branch": ..., "time": ..., "repo": ...} for the checkout, any may be None."""
+    return {
+        "branch": head_name(git_dir),
+        "time": last_commit_time(git_dir),
+        "repo": repo_identity(git_dir),
+    }
+
+
+def _parse_value(raw: str) -> str:
+    """Strip quotes and trailing comments from a config value."""
+    value, quoted = [], False
+    i = 0
+    while i < len(raw):
+        c = raw[i]
+        if c == '"':
+            quoted = not quoted
+        elif c == "\\" and i + 1 < len(raw):
+            i += 1
+            value.append({"n": "\n", "t": "\t"}.get(raw[i], raw[i]))
+        elif c in "#;" and not quoted:
+            break
+        else:
+            value.append(c)
+        i += 1
+    return "".join(value).strip()
+
+
+def read_config(path: str) -> dict[tuple[str, str | None], dict[str, str]]:
+    """Parse a git config file into {(section, subsection): {key: value}}.
+
+    Section and key names are lowercased as git treats them; the last value
+    of a repeated key wins. Includes are not followed.
+    """
+    content = _read(path)
+    config: dict[tuple[str, str | None], dict[str, str]] = {}
+    if content is None:
+        return config
+    section: dict[str, str] | None = None
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if match := _SECTION.match(line):
+            name, sub = match.group(1).lower(), match.group(2)
+            if sub is None and "." in name:  # legacy [section.subsection]
+                name, sub = name.split(".", 1)
+            section = config.setdefault((name, sub), {})
+            continue
+        if section is None:
+            continue
+        key, sep, value = line.partition("=")
+        section[key.strip().lower()] = _parse_value(value) if sep else "true"  # bare key is true
+    return config
+
+
+def _rewrite_url(url: str, config: dict) -> str:
+    """Apply url.<base>.insteadOf rewrites, longest prefix first, as git does."""
+    best = ""
+    base = None
+    for (name, sub), values in config.items():
+        prefix = values.get("insteadof")
+        if name == "url" and sub and prefix and url.startswith(prefix) and len(prefix) > len(best):
+            best, base = prefix, sub
+    return base + url[len(best) :] if base is not None else url
+
+
+def ssh_host_name(alias: str, config_path: str | None = None) -> str:
+    """Return the HostName that ~/.ssh/config gives alias, or alias itself.
+
+    Only Host blocks are understood (first match wins, as in ssh); Match
+    blocks and Include are skipped.
+    """
+    content = _read(config_path or os.path.expanduser("~/.ssh/config"))
+    if content is None:
+        return alias
+    from fnmatch import fnmatchcase
+
+    applies = True  # options before the first Host line apply to every host
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = re.split(r"\s*=\s*|\s+", line, maxsplit=1)
+        if len(parts) != 2:
+            continue
+        keyword, value = parts[0].lower(), parts[1].strip()
+        if keyword == "host":
+            patterns = value.split()
+            negated = any(fnmatchcase(alias, p[1:]) for p in patterns if p.startswith("!"))
+            applies = not negated and any(
+                fnmatchcase(alias, p) for p in patterns if not p.startswith("!")
+            )
+        elif keyword == "match":
+            applies = False
+        elif keyword == "hostname" and applies:
+            return value.strip("\"'").replace("%h", alias)
+    return alias
+
+
+def web_url(remote_url: str) -> str | None:
+    """Normalize an SSH, HTTPS or git:// remote to https://host/owner/repo.
+
+    SSH host aliases (like github.com-work) are resolved through
+    ~/.ssh/config. Returns None for local paths and hosts that still aren't
+    public names, which only ssh (or gh) can resolve.
+    """
+    remote_url = remote_url.strip()
+    match = _URL.match(remote_url)
+    ssh = match is None or remote_url.startswith(("ssh://", "git+ssh://", "ssh+git://"))
+    match = match or _SCP.match(remote_url)
+    if match is None:
+        return None
+    host, repo = match.groups()
+    if ssh:
+        host = ssh_host_name(host)
+    repo = repo.strip("/").removesuffix(".git")
+    if not _DOMAIN.match(host) or "/" not in repo:
+        return None
+    return f"https://{host}/{repo}"
+
+
+def _default_branch(common: str, remote: str) -> str | None:
+    head = _read(os.path.join(common, "refs", "remotes", remote, "HEAD"))
+    prefix = f"ref: refs/remotes/{remote}/"
+    if head is None or not head.startswith(prefix):
+        return None
+    return head[len(prefix) :].strip()
+
+
+def remote_web_url(path: str) -> str | None:
+    """Return the web page for the project at path, or None if no remote parses.
+
+    The remote is the one the current branch tracks, else origin, else the
+    first configured. A tracked branch other than the remote's default is
+    linked as /tree/<branch>.
+    """
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return None
+    common = common_dir(git_dir)
+    config = read_config(os.path.join(common, "config"))
+    remotes = [sub for name, sub in config if name == "remote" and sub]
+    branch = current_branch(git_dir)
+    tracking = config.get(("branch", branch), {}) if branch else {}
+    remote = tracking.get("remote")
+    if remote not in remotes:
+        remote = "origin" if "origin" in remotes else next(iter(remotes), None)
+    if remote is None:
+        return None
+    url = config[("remote", remote)].get("url")
+    web = web_url(_rewrite_url(url, config)) if url else None
+    if web is None:
+        return None
+    merge = tracking.get("merge", "")
+    if tracking.get("remote") == remote and merge.startswith("refs/heads/"):
+        remote_branch = merge[len("refs/heads/") :]
+        if remote_branch != _default_branch(common, remote):
+            from urllib.parse import quote  # open-github only, not the list path
+
+            web += "/tree/" + quote(remote_branch, safe="/")
+    return web
+
+
+def cached_remote_web_url(path: str) -> str | None:
+    """remote_web_url, cached per project until its git config, HEAD or ~/.ssh/config changes."""
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return None
+    stamp = []
+    for name in (
+        os.path.join(common_dir(git_dir), "config"),
+        os.path.join(git_dir, "HEAD"),
+        os.path.expanduser("~/.ssh/config"),  # resolves host aliases
+    ):
+        try:
+            stamp.append(os.stat(name).st_mtime)
+        except OSError:
+            stamp.append(0.0)
+    cache = CacheStore()
+    hit, url = cache.get_remote(path, stamp)
+    if not hit:
+        url = remote_web_url(path)
+        cache.set_remote(path, url, stamp)
+    return url
@@ -0,0 +1,143 @@
+"""Rolling log of list latencies in a fixed-size binary ring buffer.
+
+Each list run appends one fixed-size record (timestamp, milliseconds until
+the response was printed and spent after it, per-phase milliseconds, cache
+hits/misses) to ``latency.bin`` in the workflow cache
+directory. Appending is two positioned writes under an advisory lock, so it
+costs microseconds, and the file never grows beyond ``CAPACITY`` records.
+"""
+
+import contextlib
+import fcntl
+import os
+import struct
+import time
+from typing import NamedTuple
+
+from alfred_pj.cache import get_cache_dir
+
+CAPACITY = 1000
+
+# Recorded phases, in record order; changing this requires a new MAGIC
+PHASES = (
+    "usage",
+    "cache_load",
+    "editors",
+    "list_roots",
+    "detect",
+    "scan",
+    "save_projects",
+    "sort",
+    "serialize",
+    "refresh_editor",
+)
+
+MAGIC = b"PJL2"
+_HEADER = struct.Struct("<4sII")  # magic, capacity, records written (ever)
+# timestamp, total, post-response, phases, hits, misses
+_RECORD = struct.Struct(f"<Idd{len(PHASES)}fII")
+
+
+class LatencyRecord(NamedTuple):
+    timestamp: int
+    total_ms: float  # until the response was printed: what the user waited for
+    post_response_ms: float  # background work after it
+    phases: dict[str, float]
+    cache_hits: int
+    cache_misses: int
+
+
+class LatencyLog:
+    """Append-only ring buffer of LatencyRecords."""
+
+    def __init__(self, path: str | None = None, capacity: int = CAPACITY):
+        self.path = path or os.path.join(get_cache_dir(), "latency.bin")
+        self.capacity = capacity
+
+    def append(
+        self,
+        total: float,
+        phases: dict[str, float],
+        hits: int,
+        misses: int,
+        post_response: float = 0.0,
+    ) -> None:
+        """Record one run; durations are in seconds."""
+        record = _RECORD.pack(
+            int(time.time()),
+            total * 1000,
+            post_response * 1000,
+            *(phases.get(name, 0.0) * 1000 for name in PHASES),
+            hits,
+            misses,
+        )
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            capacity, written = self._read_header(fd)
+            os.pwrite(fd, record, _HEADER.size + (written % capacity) * _RECORD.size)
+            os.pwrite(fd, _HEADER.pack(MAGIC, capacity, written + 1), 0)
+        finally:
+            os.close(fd)
+
+    def read(self, last: int | None = None) -> list[LatencyRecord]:
+        """Return up to the last n records, oldest first."""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+        if len(data) < _HEADER.size:
+            return []
+        magic, capacity, written = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            return []
+        count = min(written, capacity)
+        if last is not None:
+            count = min(count, last)
+        records = []
+        for n in range(written - count, written):
+            offset = _HEADER.size + (n % capacity) * _RECORD.size
+            if offset + _RECORD.size > len(data):
+                continue
+            timestamp, total, post, *rest = _RECORD.unpack_from(data, offset)
+            phases = dict(zip(PHASES, rest[: len(PHASES)], strict=True))
+            records.append(LatencyRecord(timestamp, total, post, phases, *rest[len(PHASES) :]))
+        return records
+
+    def _read_header(self, fd: int) -> tuple[int, int]:
+        """Return (capacity, written), resetting files with a foreign or missing header."""
+        header = os.pread(fd, _HEADER.size, 0)
+        if len(header) == _HEADER.size:
+            magic, capacity, written = _HEADER.unpack(header)
+            if magic == MAGIC and capacity > 0:
+                return capacity, written
+        os.ftruncate(fd, 0)
+        return self.capacity, 0
+
+
+def record_run(tracer) -> None:
+    """Append a finished list run's tracer data to the latency log, ignoring I/O errors.
+
+    The total is the time until the "response" mark; the rest of the run is
+    recorded separately as post-response work.
+    """
+    total = tracer.total
+    response = tracer.marks.get("response", total)
+    with contextlib.suppress(OSError):
+        LatencyLog().append(
+            response,
+            tracer.phases,
+            tracer.counters["cache_hit"],
+            tracer.counters["cache_miss"],
+            post_response=total - response,
+        )
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of values (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
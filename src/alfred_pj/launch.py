@@ -0,0 +1,41 @@
+"""Detached process launching and multi-path arguments for the open-* commands."""
+
+import subprocess
+import sys
+
+# Editors whose CLI opens several folders from one invocation
+BATCH_EDITORS = {"code", "code-insiders", "codium", "cursor", "windsurf"}
+
+
+def spawn(args, shell=False):
+    """Start a process detached from ours, so the Alfred action returns at once."""
+    return subprocess.Popen(
+        args,
+        shell=shell,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def collect_paths(values) -> list[str]:
+    """Expand --path values into a list of paths, dropping duplicates.
+
+    Alfred passes several selected items as one tab-separated argument, and
+    '-' reads one path per line from stdin.
+    """
+    paths = []
+    for value in values:
+        parts = sys.stdin.read().splitlines() if value == "-" else value.split("\t")
+        paths.extend(part.strip() for part in parts if part.strip())
+    return list(dict.fromkeys(paths))
+
+
+def open_with(editor_code: str, paths: list[str]) -> None:
+    """Launch editor_code on paths: one process for batching editors, else one per path."""
+    if editor_code in BATCH_EDITORS:
+        spawn([editor_code, *paths])
+    else:
+        for path in paths:
+            spawn([editor_code, path])
@@ -0,0 +1,536 @@
+"""Project listing pipeline shared by the list command and the fast entry point.
+
+Kept free of click so ``alfred-pj list`` can run without importing it.
+"""
+
+import contextlib
+import json
+import os
+import stat
+import sys
+import time
+from concurrent.futures import Future
+from typing import NamedTuple
+
+from alfred_pj.cache import CacheStore
+from alfred_pj.editors import Editors
+from alfred_pj.git import find_git_dir, head_stamp, head_summary, repo_identity
+from alfred_pj.latency import record_run
+from alfred_pj.response import ResponseItem, render_item
+from alfred_pj.scanner import WORKERS, DetectionPool, resolve_roots, scan
+from alfred_pj.tracing import Tracer
+from alfred_pj.usage import QueryUsage, UsageData
+from alfred_pj.utils import logger
+
+# Seconds a list run may spend detecting cache misses before deferring the rest
+DEFAULT_DETECTION_BUDGET = 0.5
+
+# Alfred-side result cache bounds (seconds) and the fraction of the time since
+# the newest root or project change that results may be served from it
+ALFRED_CACHE_MIN = 5
+ALFRED_CACHE_MAX = 300
+ALFRED_CACHE_FRACTION = 0.1
+
+# Seconds before Alfred re-runs the filter while detection finishes in the background
+RERUN_INTERVAL = 1.0
+
+
+def _thread_pool():
+    """Return a WORKERS-sized pool for the asyncio engine's blocking filesystem work."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    return ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="alfred-pj-fs")
+
+
+def _scan_timeout() -> float | None:
+    """Return SCAN_TIMEOUT in seconds, or None if unset or invalid."""
+    try:
+        return float(os.environ["SCAN_TIMEOUT"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _detection_budget() -> float:
+    """Return DETECTION_BUDGET in seconds, falling back to DEFAULT_DETECTION_BUDGET."""
+    try:
+        return max(0.0, float(os.environ["DETECTION_BUDGET"]))
+    except (KeyError, ValueError):
+        return DEFAULT_DETECTION_BUDGET
+
+
+def _release_stdout() -> None:
+    """Flush the response and hand EOF to Alfred while post-response work runs.
+
+    Only the real stdout is redirected to /dev/null; captured streams (tests,
+    debug --list) are left alone.
+    """
+    sys.stdout.flush()
+    if sys.stdout is not sys.__stdout__:
+        return
+    with contextlib.suppress(OSError, ValueError):
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+
+
+class _Project(NamedTuple):
+    """One scanned project directory and what the caches already know about it."""
+
+    name: str
+    path: str
+    mtime: float
+    editor: str | None  # None: detection cache miss
+    git: dict | None = None  # None with git_dir set: git cache miss
+    git_dir: str | None = None
+    git_stamp: list | None = None
+    file_id: str = ""  # "st_dev:st_ino", stable across renames
+    mount: int | None = None  # st_dev, for the per-mount detection limit
+    known: bool = True  # whether the project cache has an entry for path
+    repo: str | None = None  # repository id, only read for unknown paths
+    detection: Future | None = None  # pending editor detection of a miss
+    git_read: Future | None = None  # pending git read of a miss
+
+
+def _git_info_enabled() -> bool:
+    """Branch and last-commit subtitles are on unless GIT_INFO=0."""
+    return os.environ.get("GIT_INFO", "1") != "0"
+
+
+def _ago(timestamp: float, now: float) -> str:
+    """Return a compact age like '5m ago' or '3d ago'."""
+    seconds = max(0.0, now - timestamp)
+    for unit, size in (
+        ("y", 365 * 86400),
+        ("mo", 30 * 86400),
+        ("w", 7 * 86400),
+        ("d", 86400),
+        ("h", 3600),
+        ("m", 60),
+    ):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit} ago"
+    return "just now"
+
+
+def _git_text(git: dict, now: float) -> str:
+    """Format cached git info as 'branch · 3d ago' for the subtitle."""
+    parts = []
+    if git.get("branch"):
+        parts.append(git["branch"])
+    if git.get("time"):
+        parts.append(_ago(git["time"], now))
+    return " · ".join(parts)
+
+
+def _alfred_cache_seconds(roots: list[str], projects: list) -> int:
+    """Return how long Alfred may reuse these results: longer the longer nothing has changed."""
+    newest = max((project.mtime for project in projects), default=0.0)
+    for root in roots:
+        with contextlib.suppress(OSError):
+            newest = max(newest, os.stat(root).st_mtime)
+    seconds = (time.time() - newest) * ALFRED_CACHE_FRACTION
+    return int(min(ALFRED_CACHE_MAX, max(ALFRED_CACHE_MIN, seconds)))
+
+
+def _project_item(
+    name: str,
+    path: str,
+    editor_info: dict,
+    display_path: str,
+    calls: int = 0,
+    editor_code: str | None = None,
+    git_text: str = "",
+):
+    """Build a project item; editor_code is handed to open-project as alfred_pj_editor."""
+    subtitle = "Open " + display_path + " in " + editor_info["name"]
+    return ResponseItem(
+        title=name,
+        subtitle=subtitle + " · " + git_text if git_text else subtitle,
+        arg=path,
+        icon=editor_info["icon"],
+        calls=calls,
+        variables={"alfred_pj_editor": editor_code} if editor_code else None,
+    )
+
+
+def _matches(terms: list[str], text: str) -> bool:
+    """Whether every query term occurs in text (already lowercase)."""
+    return all(term in text for term in terms)
+
+
+def list_projects(paths: str, tracer: Tracer | None = None, query: str | None = None) -> None:
+    """Print the Alfred Script Filter response for all projects under paths.
+
+    Cache misses are submitted for detection while the roots are still being
+    listed, most used first and within the scan engine's per-mount and
+    per-root limits. Those not detected within DETECTION_BUDGET seconds of
+    the start of the run are listed with their last known (or the default)
+    editor and finish detecting after the response is printed; the response
+    then asks Alfred to rerun. A run that starts while another still holds
+    the detection lock detects nothing and serves stale editors the same
+    way. Otherwise it carries an Alfred cache hint that grows with the time
+    since the roots or projects last changed.
+
+    With a query (query-aware mode, Alfred's own filtering turned off), only
+    projects whose name or path contain every query word are listed, those
+    selected after typing this query before rank first, and the query is
+    exported as alfred_pj_query for record-selection. No cache hint is given
+    since the results depend on the query.
+
+    Phase timings go to tracer. By default one is created whose timings are
+    appended to the latency log, and whose summary is logged to stderr when
+    alfred_debug=1.
+    """
+    report = tracer is None
+    if tracer is None:
+        # Phase timings are always on for the latency log; per-project costs only when debugging
+        tracer = Tracer(enabled=True, details=os.environ.get("alfred_debug") == "1")
+    started = time.monotonic()
+    deadline = started + _detection_budget()
+    with tracer.phase("usage"):
+        usage = UsageData()
+        terms = query.lower().split() if query else []
+        boosts = QueryUsage().get(query) if terms else {}
+    with tracer.phase("cache_load"):
+        cache = CacheStore()
+        relocatable = bool(cache.load_projects())  # an empty cache has nothing to move
+    # SCAN_ENGINE=asyncio: one sized executor for all blocking filesystem work,
+    # detections included, bounded by the same per-mount and per-root limits as
+    # the scan; SCAN_TIMEOUT caps the listing and drops detections not started
+    executor = None
+    scan_timeout = None
+    pool = DetectionPool(WORKERS)
+    if os.environ.get("SCAN_ENGINE") == "asyncio":
+        from alfred_pj.async_scanner import MOUNT_CONCURRENCY, ROOT_CONCURRENCY
+
+        executor = _thread_pool()
+        scan_timeout = _scan_timeout()
+        pool = DetectionPool(WORKERS, MOUNT_CONCURRENCY, ROOT_CONCURRENCY, executor=executor)
+    with tracer.phase("editors"):
+        editors = Editors(cache=cache, executor=executor)  # created once, outside loop
+    home = os.path.expanduser("~")
+    enrich = _git_info_enabled()
+    now = time.time()
+
+    def process(entry):
+        path = entry.path
+        try:
+            st = entry.stat()
+            mtime, mount, file_id = st.st_mtime, st.st_dev, f"{st.st_dev}:{st.st_ino}"
+        except OSError:
+            mtime, mount, file_id = 0.0, None, ""
+        known = cache.has_project(path)
+        project = _Project(
+            entry.name,
+            path,
+            mtime,
+            cache.get_project(path, mtime),
+            file_id=file_id,
+            mount=mount,
+            known=known,
+        )
+        if enrich:
+            git_dir = find_git_dir(path)
+            if git_dir is not None:
+                stamp = head_stamp(git_dir)
+                project = project._replace(
+                    git=cache.get_git(path, stamp),
+                    git_dir=git_dir,
+                    git_stamp=stamp,
+                    repo=None if known else repo_identity(git_dir),
+                )
+        # Submit misses right away so detection overlaps the rest of the scan;
+        # unknown paths wait for relocation, which may find their old entry
+        if known or not relocatable:
+            project = submit(project)
+        return project
+
+    def submit(project):
+        """Queue the detection and git read a project misses, most used first.
+
+        Nothing is queued while another run still detects: its results land
+        in the cache, and this run serves stale ones and asks for a rerun.
+        """
+        if project.editor is not None and (project.git is not None or not project.git_dir):
+            return project
+        if not cache.claim_detection():
+            return project
+        priority = usage.get_usage_by_path(project.path)
+        slot = (priority, project.mount, os.path.dirname(project.path))
+        if project.editor is None:
+            project = project._replace(detection=pool.submit(*slot, detect, project.path))
+        if project.git_dir and project.git is None:
+            project = project._replace(
+                git_read=pool.submit(*slot, read_git, project.path, project.git_dir)
+            )
+        return project
+
+    def detect(path):
+        with tracer.phase("detect", path):
+            return editors.determine_editor(path)
+
+    def read_git(path, git_dir):
+        with tracer.phase("git", path):
+            return head_summary(git_dir)
+
+    roots = resolve_roots(paths)
+    with tracer.phase("scan"):
+        if executor is not None:
+            from alfred_pj import async_scanner
+
+            projects = async_scanner.scan(
+                roots,
+                process,
+                executor=executor,
+                timeout=scan_timeout,
+                tracer=tracer,
+            )
+        else:
+            projects = scan(roots, process, tracer=tracer)
+    tracer.count("projects", len(projects))
+
+    # Projects at paths the cache doesn't know may have moved: take over the
+    # entry (and usage) of a vanished path with the same file or repo id, or
+    # may be back after their usage was archived
+    moved = []
+    new_paths = []
+    with tracer.phase("relocate"):
+        for i, project in enumerate(projects):
+            if not project.file_id:
+                continue
+            old = None
+            if not project.known:
+                old = cache.relocate_project(
+                    project.path, project.file_id, project.repo, project.mtime
+                )
+            cache.set_identity(project.path, project.file_id)
+            if old is None:
+                if not project.known:
+                    new_paths.append(project.path)
+                continue
+            logger.debug(f"{old} moved to {project.path}")
+            moved.append((old, project.path))
+            usage.move(old, project.path)
+            projects[i] = project._replace(
+                editor=cache.get_project(project.path, project.mtime),
+                git=cache.get_git(project.path, project.git_stamp) if project.git_dir else None,
+            )
+        if new_paths:
+            usage.restore(new_paths)
+        if relocatable:
+            for i, project in enumerate(projects):
+                if not project.known:
+                    projects[i] = submit(project)
+    tracer.count("moved", len(moved))
+
+    # Wait for the detections still running; whatever misses the budget is
+    # finished after printing
+    pending = {p.path: p.detection for p in projects if p.detection is not None}
+    pending_git = {p.path: p.git_read for p in projects if p.git_read is not None}
+    misses = sum(p.editor is None for p in projects)
+    tracer.count("cache_hit", len(projects) - misses)
+    tracer.count("cache_miss", misses)
+    tracer.count("git_miss", sum(bool(p.git_dir) and p.git is None for p in projects))
+    if pending or pending_git:
+        from concurrent.futures import wait
+
+        wait(
+            [*pending.values(), *pending_git.values()],
+            timeout=max(0.0, deadline - time.monotonic()),
+        )
+    if scan_timeout is not None and time.monotonic() >= started + scan_timeout:
+        tracer.count("cancelled", pool.cancel_pending())
+
+    # Warm projects reuse the item fragment rendered by an earlier run
+    ranked = []
+    deferred = []
+    deferred_git = []
+    waiting = False  # whether any editor is provisional
+    for name, path, mtime, editor_code, git, git_dir, git_stamp, *_ in projects:
+        final = True
+        if editor_code is None:
+            future = pending.get(path)
+            if future is not None and future.done() and not future.cancelled():
+                editor_code = future.result()
+                cache.set_project(path, editor_code, mtime)
+            else:
+                # Still detecting, cancelled at SCAN_TIMEOUT, or left to the run
+                # that holds the detection lock
+                tracer.count("deferred")
+                if future is not None and not future.cancelled():
+                    deferred.append((path, mtime, future))
+                waiting = True
+                editor_code = cache.get_stale_project(path) or editors.default_editor
+                final = False
+        if git is None and git_dir:
+            future = pending_git.get(path)
+            if future is not None and future.done() and not future.cancelled():
+                git = future.result()
+                cache.set_git(path, git_stamp, git)
+            else:
+                if future is not None and not future.cancelled():
+                    deferred_git.append((path, git_stamp, future))
+                git = cache.get_stale_git(path)
+        display_path = path.replace(home, "~", 1)
+        if terms and not _matches(terms, (name + " " + display_path).lower()):
+            continue
+        git_text = _git_text(git, now) if git else ""
+        editor_info = editors.get_editor(editor_code)
+        if final:
+            key = [editor_code, editor_info["name"], editor_info["icon"], display_path, git_text]
+            fragment = cache.get_fragment(path, key)
+            if fragment is None:
+                tracer.count("rendered")
+                logger.debug(f"editor for {path} is {editor_info['name']}")
+                item = _project_item(
+                    name,
+                    path,
+                    editor_info,
+                    display_path,
+                    editor_code=editor_code,
+                    git_text=git_text,
+                )
+                fragment = render_item(item)
+                cache.set_fragment(path, key, fragment)
+        else:
+            # Provisional editor: not cached, and open-project detects for itself
+            item = _project_item(name, path, editor_info, display_path, git_text=git_text)
+            fragment = render_item(item)
+        ranked.append(((boosts.get(path, 0), usage.get_usage_by_path(path)), fragment))
+
+    with tracer.phase("sort"):
+        ranked.sort(key=lambda x: x[0], reverse=True)
+    with tracer.phase("serialize"):
+        fragments = [fragment for _, fragment in ranked]
+        for item in (
+            ResponseItem(
+                title="> Clear usage data",
+                subtitle="Reset project selection statistics",
+                arg="__CLEAR_USAGE__",
+                icon={"path": "icon.png"},
+            ),
+            ResponseItem(
+                title="> Clear cache",
+                subtitle="Clear project detection and editor availability caches",
+                arg="__CLEAR_CACHE__",
+                icon={"path": "icon.png"},
+            ),
+        ):
+            if not terms or _matches(terms, item.match):
+                fragments.append(render_item(item))
+        variables = {} if query is None else {"alfred_pj_query": query}
+        output = '{"items": [' + ", ".join(fragments) + '], "variables": ' + json.dumps(variables)
+        if waiting:
+            # Show what we have now; Alfred re-runs once the background detection has landed
+            output += f', "rerun": {RERUN_INTERVAL}'
+        elif query is None:
+            seconds = _alfred_cache_seconds(roots, projects)
+            output += f', "cache": {{"seconds": {seconds}, "loosereload": true}}'
+        output += "}"
+    print(output)
+    tracer.mark("response")
+    _release_stdout()
+
+    with tracer.phase("gc_usage"):
+        for path in usage.collect_garbage({project.path for project in projects}):
+            cache.forget_project(path)
+
+    with tracer.phase("save_projects"):
+        if scan_timeout is not None:
+            # Deferred detections get what is left of SCAN_TIMEOUT to start
+            from concurrent.futures import wait
+
+            wait(
+                [future for *_, future in (*deferred, *deferred_git)],
+                timeout=max(0.0, started + scan_timeout - time.monotonic()),
+            )
+            tracer.count("cancelled", pool.cancel_pending())
+        pool.shutdown(wait=True)  # finishes deferred detections
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for path, mtime, future in deferred:
+            if not future.cancelled():
+                cache.set_project(path, future.result(), mtime)
+        for path, stamp, future in deferred_git:
+            if not future.cancelled():
+                cache.set_git(path, stamp, future.result())
+        cache.save_projects()  # no-op unless an entry changed
+        cache.release_detection()
+
+    with tracer.phase("compact_usage"):
+        usage.compact()  # fold selections journaled since the last run, and moves
+        if moved:
+            queries = QueryUsage()
+            changed = [queries.move(old, new) for old, new in moved]  # no short-circuit
+            if any(changed):
+                queries.write_data()
+
+    # Refresh one stale editor inline after output is printed (~5ms)
+    with tracer.phase("refresh_editor"):
+        editors.refresh_stale_editor()
+
+    if report:
+        record_run(tracer)
+        if tracer.details:
+            logger.debug("list trace: " + tracer.summary())
+
+
+def list_top_projects(paths: str, limit: int) -> None:
+    """Print the `limit` most used projects under paths without scanning the roots.
+
+    Candidates come from UsageData alone; only their own directories are
+    stat'ed, and editors come from the project cache (detecting just the
+    candidates that miss it), so the cost is independent of root size.
+    """
+    usage = UsageData()
+    cache = CacheStore()
+    editors = Editors(cache=cache)
+    roots = set(resolve_roots(paths))
+    home = os.path.expanduser("~")
+    enrich = _git_info_enabled()
+    now = time.time()
+
+    items = []
+    missed = False
+    # Walk the whole ranking: some used paths may be gone or outside the roots
+    for path, calls in usage.top():
+        if len(items) == limit:
+            break
+        if os.path.dirname(path) not in roots:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if not stat.S_ISDIR(st.st_mode):
+            continue
+        editor_code = cache.get_project(path, st.st_mtime)
+        if editor_code is None:
+            editor_code = editors.determine_editor(path)
+            cache.set_project(path, editor_code, st.st_mtime)
+            missed = True
+        git_dir = find_git_dir(path) if enrich else None
+        git = None
+        if git_dir is not None:
+            stamp = head_stamp(git_dir)
+            git = cache.get_git(path, stamp)
+            if git is None:
+                git = head_summary(git_dir)
+                cache.set_git(path, stamp, git)
+                missed = True
+        items.append(
+            _project_item(
+                os.path.basename(path),
+                path,
+                editors.get_editor(editor_code),
+                path.replace(home, "~", 1),
+                calls,
+                editor_code=editor_code,
+                git_text=_git_text(git, now) if git else "",
+            )
+        )
+
+    fragments = ", ".join(render_item(item) for item in items)
+    print('{"items": [' + fragments + '], "variables": {}}')
+    if missed:
+        cache.save_projects()
@@ -0,0 +1,118 @@
+"""On-demand CPU and memory profiling of any command.
+
+Setting the workflow variable ``alfred_pj_profile`` to ``cpu`` writes a
+cProfile ``.pstats`` file, and ``mem`` a tracemalloc top-N report, into the
+``profiles`` directory of the workflow cache. Only the newest ``KEEP``
+captures are kept. Nothing is imported unless the variable is set.
+"""
+
+import contextlib
+import os
+import time
+
+from alfred_pj.cache import get_cache_dir
+from alfred_pj.utils import logger
+
+PROFILE_ENV = "alfred_pj_profile"
+MODES = {"cpu": ".pstats", "mem": ".mem.txt"}
+KEEP = 20
+TOP_N = 25
+
+
+def profiles_dir() -> str:
+    return os.path.join(get_cache_dir(), "profiles")
+
+
+def list_profiles() -> list[str]:
+    """Return captured profile paths, newest first."""
+    try:
+        names = os.listdir(profiles_dir())
+    except OSError:
+        return []
+    paths = [os.path.join(profiles_dir(), n) for n in names if n.endswith(tuple(MODES.values()))]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+class Profiler:
+    """A single capture for one command run."""
+
+    def __init__(self, mode: str, command: str):
+        self.mode = mode
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.path = os.path.join(profiles_dir(), f"{stamp}-{os.getpid()}-{command}{MODES[mode]}")
+        self._profile = None
+
+    def start(self) -> None:
+        if self.mode == "cpu":
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            import tracemalloc
+
+            tracemalloc.start()
+
+    def stop(self) -> str:
+        """Stop capturing, write the report and return its path."""
+        os.makedirs(profiles_dir(), exist_ok=True)
+        if self.mode == "cpu":
+            self._profile.disable()
+            self._profile.dump_stats(self.path)
+        else:
+            self._write_memory_report()
+        _prune()
+        logger.debug(f"profile written to {self.path}")
+        return self.path
+
+    def _write_memory_report(self) -> None:
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ]
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with open(self.path, "w") as f:
+            f.write(f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n")
+            for stat in snapshot.statistics("lineno")[:TOP_N]:
+                f.write(f"{stat}\n")
+
+
+def start(command: str) -> Profiler | None:
+    """Start profiling command if alfred_pj_profile asks for it."""
+    mode = os.environ.get(PROFILE_ENV)
+    if not mode:
+        return None
+    if mode not in MODES:
+        logger.error(f"unknown {PROFILE_ENV} mode {mode!r}, expected one of {', '.join(MODES)}")
+        return None
+    profiler = Profiler(mode, command)
+    profiler.start()
+    return profiler
+
+
+def _prune() -> None:
+    for path in list_profiles()[KEEP:]:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+
+def summarize(path: str, top: int = 5) -> list[str]:
+    """Return a few summary lines for a captured profile."""
+    if path.endswith(MODES["mem"]):
+        with open(path) as f:
+            return [line.rstrip("\n") for line in f][: top + 1]
+
+    import pstats
+
+    stats = pstats.Stats(path)
+    lines = [f"{stats.total_calls} calls in {stats.total_tt * 1000:.1f}ms"]
+    by_cumulative = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)
+    for (filename, lineno, func), (_cc, ncalls, _tt, cumtime, _callers) in by_cumulative[:top]:
+        where = f"{os.path.basename(filename)}:{lineno}" if lineno else filename
+        lines.append(f"{cumtime * 1000:8.1f}ms {ncalls:>7} calls  {func} ({where})")
+    return lines
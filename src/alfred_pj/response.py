@@ -1,12 +1,52 @@
 """Alfred response formatting."""
 
+import json
+from json.encoder import encode_basestring_ascii as _encode_string
+
 
 class ResponseItem:
-    def __init__(self, title, subtitle, arg, icon, calls=0, score=0):
+    """One Script Filter item; calls and score only drive ranking and are never emitted."""
+
+    __slots__ = ("title", "subtitle", "arg", "icon", "calls", "score", "variables")
+
+    def __init__(self, title, subtitle, arg, icon, calls=0, score=0, variables=None):
         self.title = title
         self.subtitle = subtitle
         self.arg = arg
-        self.match = title.lower() + " " + subtitle.lower()
         self.icon = icon
         self.calls = calls
         self.score = score
+        self.variables = variables  # exported to the actions run on this item
+
+    @property
+    def match(self) -> str:
+        """Text Alfred filters on: lowercase title and subtitle."""
+        if not self.subtitle:
+            return self.title.lower()
+        return self.title.lower() + " " + self.subtitle.lower()
+
+
+def _encode_object(obj: dict) -> str:
+    try:
+        return (
+            "{"
+            + ", ".join(_encode_string(k) + ": " + _encode_string(v) for k, v in obj.items())
+            + "}"
+        )
+    except TypeError:  # non-string values
+        return json.dumps(obj)
+
+
+def render_item(item: ResponseItem) -> str:
+    """Return the JSON object for item, holding only the fields Alfred reads.
+
+    Output matches json.dumps with default settings. match is left out when
+    it adds nothing over Alfred's own (case-insensitive) filtering on title.
+    """
+    head = f'{{"title": {_encode_string(item.title)}, "subtitle": {_encode_string(item.subtitle)}, '
+    head += f'"arg": {_encode_string(item.arg)}, '
+    if item.subtitle:
+        head += f'"match": {_encode_string(item.match)}, '
+    if item.variables:
+        head += f'"variables": {_encode_object(item.variables)}, '
+    return head + f'"icon": {_encode_object(item.icon)}}}'
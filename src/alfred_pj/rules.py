@@ -0,0 +1,205 @@
+"""User detector rules, merged with the built-in DETECTORS and EDITOR_DEFS.
+
+The rules file is ``RULES_FILE`` if set, else ``rules.toml`` or
+``rules.json`` in the workflow data directory::
+
+    [[detectors]]
+    name = "elixir"
+    files = ["mix.exs"]
+    env = "EDITORS_ELIXIR"
+    editors = ["zed", "code"]
+
+    [editors.zed]
+    name = "Zed"
+    icon = "images/zed.png"
+
+A detector named like a built-in one replaces it in place; other detectors
+are checked before the built-ins, in file order. Editors are added to (or
+override) the built-in definitions. The validated rules are cached by the
+file's path, mtime and size, so an unchanged file is never parsed again.
+"""
+
+import json
+import os
+
+from alfred_pj.content import matcher
+from alfred_pj.utils import logger
+
+RULES_FILES = ("rules.toml", "rules.json")
+
+_LIST_KEYS = ("files", "dirs", "globs", "exclude_dirs", "editors")
+_MATCH_KEYS = ("files", "dirs", "globs", "content")
+_DETECTOR_KEYS = {"name", "env", "content", *_LIST_KEYS}
+_PREDICATE_KEYS = {"file", "max_bytes", "json", "toml", "contains"}
+
+
+class RulesError(ValueError):
+    """The rules file can't be read or doesn't describe valid rules."""
+
+
+def rules_file() -> str | None:
+    """Return the rules file to use, or None if there is none."""
+    configured = os.environ.get("RULES_FILE")
+    if configured:
+        return os.path.expanduser(configured)
+    data_dir = os.getenv("alfred_workflow_data")
+    if not data_dir:
+        return None
+    for name in RULES_FILES:
+        path = os.path.join(data_dir, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _string_list(value, where: str) -> list[str]:
+    if not isinstance(value, list) or not all(isinstance(v, str) and v for v in value):
+        raise RulesError(f"{where} must be a list of non-empty strings")
+    return value
+
+
+def _predicate(value, where: str) -> dict:
+    if not isinstance(value, dict):
+        raise RulesError(f"{where} must be a table")
+    unknown = set(value) - _PREDICATE_KEYS
+    if unknown:
+        raise RulesError(f"{where} has unknown keys: {', '.join(sorted(unknown))}")
+    file = value.get("file")
+    if not isinstance(file, str) or not file or os.path.isabs(file) or ".." in file.split("/"):
+        raise RulesError(f"{where}.file must be a path inside the project")
+    kind = matcher(value)
+    if kind is None:
+        raise RulesError(f"{where} needs exactly one of json, toml or contains")
+    if not isinstance(value[kind], str) or not value[kind]:
+        raise RulesError(f"{where}.{kind} must be a non-empty string")
+    limit = value.get("max_bytes", 1)
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit <= 0:
+        raise RulesError(f"{where}.max_bytes must be a positive integer")
+    return value
+
+
+def _detector(value, where: str) -> dict:
+    if not isinstance(value, dict):
+        raise RulesError(f"{where} must be a table")
+    unknown = set(value) - _DETECTOR_KEYS
+    if unknown:
+        raise RulesError(f"{where} has unknown keys: {', '.join(sorted(unknown))}")
+    if not isinstance(value.get("name"), str) or not value["name"]:
+        raise RulesError(f"{where}.name must be a non-empty string")
+    where = f"detector {value['name']!r}"
+    for key in _LIST_KEYS:
+        if key in value:
+            _string_list(value[key], f"{where}.{key}")
+    if not value.get("editors"):
+        raise RulesError(f"{where} needs editors")
+    if not any(key in value for key in _MATCH_KEYS):
+        raise RulesError(f"{where} needs at least one of {', '.join(_MATCH_KEYS)}")
+    if "content" in value:
+        if not isinstance(value["content"], list):
+            raise RulesError(f"{where}.content must be a list")
+        for i, predicate in enumerate(value["content"]):
+            _predicate(predicate, f"{where}.content[{i}]")
+    env = value.get("env")
+    if env is not None and not isinstance(env, str):
+        _string_list(env, f"{where}.env")
+    return value
+
+
+def _editor(code: str, value) -> dict:
+    where = f"editor {code!r}"
+    if not isinstance(value, dict) or not isinstance(value.get("name"), str):
+        raise RulesError(f"{where} needs a name")
+    icon = value.get("icon", "icon.png")
+    if isinstance(icon, str):
+        icon = {"path": icon}
+    if not isinstance(icon, dict) or not isinstance(icon.get("path"), str):
+        raise RulesError(f"{where}.icon must be a path")
+    return {"name": value["name"], "icon": icon}
+
+
+def compile_rules(data) -> dict:
+    """Validate parsed rules and return {"detectors": [...], "editors": {...}}."""
+    if not isinstance(data, dict):
+        raise RulesError("rules must be a table")
+    unknown = set(data) - {"detectors", "editors"}
+    if unknown:
+        raise RulesError(f"unknown sections: {', '.join(sorted(unknown))}")
+    detectors = data.get("detectors", [])
+    if not isinstance(detectors, list):
+        raise RulesError("detectors must be a list")
+    compiled = [_detector(d, f"detectors[{i}]") for i, d in enumerate(detectors)]
+    names = [d["name"] for d in compiled]
+    if len(set(names)) != len(names):
+        raise RulesError("detector names must be unique")
+    editors = data.get("editors", {})
+    if not isinstance(editors, dict):
+        raise RulesError("editors must be a table")
+    return {
+        "detectors": compiled,
+        "editors": {code: _editor(code, value) for code, value in editors.items()},
+    }
+
+
+def parse_rules_file(path: str) -> dict:
+    """Read, parse and compile a TOML or JSON rules file."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        raise RulesError(f"can't read {path}: {e}") from e
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # Python 3.10
+            raise RulesError("TOML rules need Python 3.11+; use rules.json") from None
+        load = tomllib.loads
+    else:
+        load = json.loads
+    try:
+        data = load(raw.decode())
+    except ValueError as e:  # TOMLDecodeError, JSONDecodeError and UnicodeDecodeError
+        raise RulesError(f"can't parse {path}: {e}") from e
+    return compile_rules(data)
+
+
+def merge(builtin_detectors: list[dict], builtin_editors: dict, rules: dict):
+    """Return the detectors and editor definitions with rules applied."""
+    replacements = {d["name"]: d for d in rules["detectors"]}
+    builtin_names = {d["name"] for d in builtin_detectors}
+    detectors = [d for d in rules["detectors"] if d["name"] not in builtin_names]
+    detectors += [replacements.get(d["name"], d) for d in builtin_detectors]
+    return detectors, {**builtin_editors, **rules["editors"]}
+
+
+def load_rules(cache=None) -> dict | None:
+    """Return the compiled user rules, or None if there are none.
+
+    An invalid file is reported and the last valid rules are kept.
+    With a CacheStore, the compiled rules are reused while the file's
+    stamp is unchanged. When the stamp changes, cached detections are
+    dropped, because they may no longer match the rules.
+    """
+    path = rules_file()
+    stamp = None
+    if path is not None:
+        try:
+            st = os.stat(path)
+            stamp = [path, st.st_mtime, st.st_size]
+        except OSError:
+            logger.error(f"rules file {path} not found")
+    cached = cache.get_rules() if cache is not None else None
+    previous = cached.get("stamp") if cached else None
+    if stamp == previous:
+        return cached.get("rules") if cached else None
+    rules = None
+    if stamp is not None:
+        try:
+            rules = parse_rules_file(path)
+        except RulesError as e:
+            logger.error(f"ignoring rules: {e}")
+            return cached.get("rules") if cached else None  # keep the last valid rules
+    if cache is not None:
+        logger.debug("rules changed, dropping cached detections")
+        cache.set_rules({"stamp": stamp, "rules": rules})
+        cache.invalidate_detections()
+    return rules
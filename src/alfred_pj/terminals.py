@@ -1,9 +1,25 @@
 """Terminal detection and launching."""
 
 import os
-import subprocess
+import shlex
 
-from alfred_pj.utils import which
+from alfred_pj.launch import spawn
+from alfred_pj.utils import logger, which
+
+# WezTerm readiness polling: `wezterm cli list` succeeds once the GUI accepts commands
+READY_POLL_INTERVAL = 0.05
+READY_TIMEOUT = 2.0
+
+
+def _open_wezterm(path):
+    """Open a tab in path, then bring WezTerm to the front once it answers."""
+    polls = int(READY_TIMEOUT / READY_POLL_INTERVAL)
+    spawn(
+        f"wezterm start --cwd {shlex.quote(path)} --new-tab & "
+        f"i=0; while [ $i -lt {polls} ] && ! wezterm cli list >/dev/null 2>&1; do "
+        f"sleep {READY_POLL_INTERVAL}; i=$((i+1)); done; open -a WezTerm",
+        shell=True,
+    )
 
 
 class Terminals:
@@ -14,20 +30,17 @@ class Terminals:
         {
             "name": "Ghostty",
             "check": lambda: os.path.isdir("/Applications/Ghostty.app") or bool(which("ghostty")),
-            "open": lambda path: subprocess.run(["open", "-a", "Ghostty", path]),
+            "open": lambda path: spawn(["open", "-a", "Ghostty", path]),
         },
         {
             "name": "WezTerm",
             "check": lambda: os.path.isdir("/Applications/WezTerm.app") or bool(which("wezterm")),
-            "open": lambda path: subprocess.run(
-                f"(wezterm start --cwd {path!r} --new-tab &) && sleep 0.5 && open -a WezTerm",
-                shell=True,
-            ),
+            "open": _open_wezterm,
         },
         {
             "name": "iTerm",
             "check": lambda: os.path.isdir("/Applications/iTerm.app"),
-            "open": lambda path: subprocess.run(
+            "open": lambda path: spawn(
                 [
                     "osascript",
                     "-e",
@@ -47,7 +60,7 @@ class Terminals:
         {
             "name": "Terminal",
             "check": lambda: True,  # Always available on macOS
-            "open": lambda path: subprocess.run(
+            "open": lambda path: spawn(
                 [
                     "osascript",
                     "-e",
@@ -63,9 +76,37 @@ class Terminals:
     ]
 
     @classmethod
-    def get_available_terminal(cls):
-        """Return the first available terminal."""
+    def get_available_terminal(cls, cache=None):
+        """Return the first available terminal.
+
+        With a CacheStore, availability comes from its terminals cache and
+        the checks only run when that cache is missing.
+        """
+        available = None
+        if cache is not None:
+            cached = cache.get_terminals()
+            if cached is not None:
+                logger.debug("terminals loaded from cache")
+                available = {name: info.get("available", False) for name, info in cached.items()}
+        if available is None:
+            available = {t["name"]: bool(t["check"]()) for t in cls.TERMINALS}
+            if cache is not None:
+                cache.set_terminals({name: {"available": ok} for name, ok in available.items()})
         for terminal in cls.TERMINALS:
-            if terminal["check"]():
+            ok = available.get(terminal["name"])
+            if ok is None:  # added since the cache was written
+                ok = bool(terminal["check"]())
+                cache.update_terminal(terminal["name"], {"available": ok})
+            if ok:
                 return terminal
         return cls.TERMINALS[-1]  # Fallback to Terminal.app
+
+    @classmethod
+    def refresh_stale_terminal(cls, cache) -> None:
+        """Re-check the single most overdue terminal and update the cache."""
+        name = cache.get_most_expired_terminal()
+        terminal = next((t for t in cls.TERMINALS if t["name"] == name), None)
+        if terminal is None:
+            return
+        logger.debug(f"refreshing stale terminal: {name}")
+        cache.update_terminal(name, {"available": bool(terminal["check"]())})
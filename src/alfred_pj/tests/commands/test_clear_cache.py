@@ -23,6 +23,19 @@ class TestClearCacheCommand:
         assert result.exit_code == 0
         assert "usage statistics" in result.output
 
+    def test_clears_query_associations(self, runner, temp_usage_dir):
+        """--usage forgets what was picked for which query, like clear-usage."""
+        from alfred_pj.usage import QueryUsage
+
+        queries = QueryUsage()
+        queries.add("app", "/code/app")
+        queries.write_data()
+
+        result = runner.invoke(clear_cache, ["--no-alfred"])
+        assert result.exit_code == 0
+        assert not (temp_usage_dir / "queries.json").exists()
+        assert QueryUsage().get("app") == {}
+
     def test_clears_alfred_cache_when_exists(self, runner, tmp_path, monkeypatch, temp_usage_dir):
         """Clear cache clears Alfred cache directory when it exists."""
         cache_dir = tmp_path / "alfred_cache"
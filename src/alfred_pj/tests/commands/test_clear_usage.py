@@ -56,3 +56,15 @@ class TestClearUsageCommand:
         result = runner.invoke(clear_usage)
 
         assert result.exit_code == 0
+
+    def test_clears_query_associations(self, temp_usage_dir):
+        """Learned query associations are usage data too."""
+        from alfred_pj.usage import QueryUsage
+
+        queries = QueryUsage()
+        queries.add("api", "/path/1")
+        queries.write_data()
+
+        CliRunner().invoke(clear_usage)
+
+        assert QueryUsage().get("api") == {}
@@ -1,5 +1,7 @@
 """Tests for debug command."""
 
+import os
+
 import pytest
 from click.testing import CliRunner
 
@@ -99,3 +101,50 @@ class TestDebugCommand:
         assert result.exit_code == 0
         assert "Matched detector:" in result.output
         assert "obsidian" in result.output.lower()
+
+    def test_list_mode_prints_phase_breakdown(
+        self, runner, projects_dir, temp_usage_dir, temp_cache_dir
+    ):
+        """--list runs the list pipeline and prints per-phase timings, not the JSON."""
+        result = runner.invoke(debug, ["--list", str(projects_dir)])
+        assert result.exit_code == 0
+        assert f"=== List timing for {projects_dir} ===" in result.output
+        for phase in ("usage", "cache_load", "editors", "scan", "serialize", "save_projects"):
+            assert phase in result.output
+        assert "cache_miss=3" in result.output
+        assert '"items"' not in result.output
+
+    def test_stats_without_runs(self, runner, temp_cache_dir):
+        result = runner.invoke(debug, ["--stats"])
+        assert result.exit_code == 0
+        assert "No list runs recorded yet" in result.output
+
+    def test_stats_after_list_runs(self, runner, projects_dir, temp_usage_dir, temp_cache_dir):
+        """Each list run is recorded and summarized by --stats."""
+        from alfred_pj.commands.list import list as list_cmd
+
+        for _ in range(3):
+            assert runner.invoke(list_cmd, ["--paths", str(projects_dir)]).exit_code == 0
+
+        result = runner.invoke(debug, ["--stats", "--runs", "2"])
+        assert result.exit_code == 0
+        assert "=== List latency (last 2 runs) ===" in result.output
+        assert "total" in result.output
+        assert "Cache hit ratio: 100.0% (6 hits, 0 misses)" in result.output
+
+    def test_profiles_without_captures(self, runner, temp_cache_dir):
+        result = runner.invoke(debug, ["--profiles"])
+        assert result.exit_code == 0
+        assert "No profiles" in result.output
+
+    def test_profiles_lists_and_summarizes(self, runner, temp_cache_dir, monkeypatch):
+        from alfred_pj import profiling
+
+        monkeypatch.setenv("alfred_pj_profile", "cpu")
+        path = profiling.start("list").stop()
+        monkeypatch.delenv("alfred_pj_profile")
+
+        result = runner.invoke(debug, ["--profiles"])
+        assert result.exit_code == 0
+        assert os.path.basename(path) in result.output
+        assert "calls in" in result.output
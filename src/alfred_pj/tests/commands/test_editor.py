@@ -1,5 +1,6 @@
 """Tests for editor command."""
 
+import pytest
 from click.testing import CliRunner
 
 from alfred_pj.commands.editor import editor
@@ -8,6 +9,10 @@ from alfred_pj.commands.editor import editor
 class TestEditorCommand:
     """Tests for the editor command."""
 
+    @pytest.fixture(autouse=True)
+    def _isolate_cache(self, temp_cache_dir):
+        """Ensure each test uses an isolated cache directory."""
+
     def test_outputs_editor_code(self, python_project):
         """Should output the editor code for a path."""
         runner = CliRunner()
@@ -89,3 +94,11 @@ class TestEditorCommand:
 
         assert result.exit_code != 0
         assert "Missing option '--path'" in result.output
+
+    def test_prefers_editor_variable(self, python_project, monkeypatch):
+        """alfred_pj_editor (set by list) short-circuits detection."""
+        monkeypatch.setenv("alfred_pj_editor", "zed")
+        result = CliRunner().invoke(editor, ["--path", str(python_project)])
+
+        assert result.exit_code == 0
+        assert result.output.strip() == "zed"
@@ -1,6 +1,8 @@
 """Tests for list command."""
 
 import json
+import os
+from unittest.mock import patch
 
 import pytest
 from click.testing import CliRunner
@@ -41,6 +43,15 @@ class TestListCommand:
             assert "arg" in item
             assert "icon" in item
 
+    def test_items_carry_detected_editor(self, projects_dir, temp_usage_dir):
+        """Project items hand their editor to open-project via item variables."""
+        result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        items = json.loads(result.output)["items"]
+        projects = [item for item in items if not item["arg"].startswith("__")]
+        assert all(item["variables"]["alfred_pj_editor"] for item in projects)
+        assert all("variables" not in item for item in items if item["arg"].startswith("__"))
+
     def test_sorted_by_usage(self, projects_dir, temp_usage_dir):
         """Items should be sorted by usage count (descending)."""
         # Set up usage data
@@ -255,3 +266,394 @@ class TestListCommand:
         output = json.loads(result.output)
         titles = [item["title"] for item in output["items"]]
         assert "project-name" in titles
+
+    def test_asyncio_engine_lists_same_projects(self, projects_dir, temp_usage_dir, monkeypatch):
+        """SCAN_ENGINE=asyncio should produce the same response as the default engine."""
+        runner = CliRunner()
+        default = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        monkeypatch.setenv("SCAN_ENGINE", "asyncio")
+        result = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        assert result.exit_code == 0
+        assert json.loads(result.output) == json.loads(default.output)
+
+    def test_asyncio_engine_detects_on_the_shared_executor(
+        self, projects_dir, temp_usage_dir, monkeypatch
+    ):
+        """Detections run on the engine's one sized executor, not on extra threads."""
+        import threading
+
+        monkeypatch.setenv("SCAN_ENGINE", "asyncio")
+        threads = set()
+        with patch(
+            "alfred_pj.listing.Editors.determine_editor",
+            autospec=True,
+            side_effect=lambda self, path: threads.add(threading.current_thread().name) or "code",
+        ):
+            result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        assert result.exit_code == 0
+        assert threads and all(name.startswith("alfred-pj-fs") for name in threads)
+
+    def test_scan_timeout_cancels_queued_detections(
+        self, projects_dir, temp_usage_dir, monkeypatch
+    ):
+        """Past SCAN_TIMEOUT, detections that haven't started are dropped."""
+        import time
+
+        from alfred_pj.cache import CacheStore
+
+        monkeypatch.setenv("SCAN_ENGINE", "asyncio")
+        monkeypatch.setenv("SCAN_TIMEOUT", "0.1")
+        monkeypatch.setenv("DETECTION_BUDGET", "0")
+        monkeypatch.setattr("alfred_pj.async_scanner.ROOT_CONCURRENCY", 1)
+        with patch(
+            "alfred_pj.listing.Editors.determine_editor",
+            autospec=True,
+            side_effect=lambda self, path: time.sleep(0.3) or "pycharm",
+        ) as mock_detect:
+            result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        assert result.exit_code == 0
+        assert json.loads(result.output)["rerun"] == 1.0
+        assert mock_detect.call_count == 1  # one slot for the root; the rest were queued
+        cache = CacheStore()
+        detected = [cache.get_stale_project(str(p)) for p in projects_dir.iterdir()]
+        assert detected.count("pycharm") == 1
+
+    def test_debug_trace_goes_to_stderr(self, projects_dir, temp_usage_dir, monkeypatch):
+        """With alfred_debug=1 the timing summary is logged without touching stdout JSON."""
+        monkeypatch.setenv("alfred_debug", "1")
+        with patch("alfred_pj.listing.logger") as mock_logger:
+            result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        assert result.exit_code == 0
+        json.loads(result.output)
+        traces = [c.args[0] for c in mock_logger.debug.call_args_list if "list trace" in c.args[0]]
+        assert len(traces) == 1
+        assert "cache_miss=3" in traces[0]
+
+    def test_misses_detected_most_used_first(self, projects_dir, temp_usage_dir, monkeypatch):
+        """Cache misses are queued for detection with their usage as priority."""
+        from alfred_pj.scanner import DetectionPool
+        from alfred_pj.usage import UsageData
+
+        usage = UsageData()
+        usage.add_usage(str(projects_dir / "my-js-app"), count=9)
+        usage.add_usage(str(projects_dir / "my-go-app"), count=3)
+        usage.write_data()
+        priorities = {}
+        submit = DetectionPool.submit
+
+        def record(self, priority, mount, root, fn, path, *args):
+            priorities[os.path.basename(path)] = priority
+            assert root == str(projects_dir)
+            return submit(self, priority, mount, root, fn, path, *args)
+
+        monkeypatch.setattr(DetectionPool, "submit", record)
+        result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        assert result.exit_code == 0
+        assert priorities == {"my-js-app": 9, "my-go-app": 3, "my-python-app": 0}
+
+    def test_exhausted_budget_defers_detection(self, projects_dir, temp_usage_dir, monkeypatch):
+        """Past DETECTION_BUDGET misses use the default editor and are cached after printing."""
+        import time
+
+        from alfred_pj.cache import CacheStore
+
+        monkeypatch.setenv("DETECTION_BUDGET", "0")
+        monkeypatch.setenv("DEFAULT_EDITOR", "code")
+        with patch(
+            "alfred_pj.listing.Editors.determine_editor",
+            autospec=True,
+            side_effect=lambda self, path: time.sleep(0.05) or "pycharm",
+        ):
+            result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        assert result.exit_code == 0
+        projects = [i for i in json.loads(result.output)["items"] if not i["arg"].startswith("__")]
+        assert all(item["subtitle"].endswith("in VS Code") for item in projects)
+        assert all("variables" not in item for item in projects)
+        assert json.loads(result.output)["rerun"] == 1.0
+        assert "cache" not in json.loads(result.output)
+        cache = CacheStore()
+        assert cache.get_stale_project(str(projects_dir / "my-go-app")) == "pycharm"
+
+    def test_run_during_other_detection_serves_stale(
+        self, projects_dir, temp_usage_dir, monkeypatch
+    ):
+        """While another run holds the detection lock, misses are not detected again."""
+        from alfred_pj.cache import CacheStore
+
+        monkeypatch.setenv("DEFAULT_EDITOR", "code")
+        holder = CacheStore()
+        assert holder.claim_detection()
+        with patch("alfred_pj.listing.Editors.determine_editor", autospec=True) as mock_detect:
+            result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+        holder.release_detection()
+
+        assert result.exit_code == 0
+        mock_detect.assert_not_called()
+        output = json.loads(result.output)
+        assert output["rerun"] == 1.0
+        projects = [i for i in output["items"] if not i["arg"].startswith("__")]
+        assert all(item["subtitle"].endswith("in VS Code") for item in projects)
+
+    def test_in_place_edit_of_content_rule_file_redetects(
+        self, projects_dir, temp_usage_dir, tmp_path, monkeypatch
+    ):
+        """Editing a file a content rule read invalidates the cached editor."""
+        rules = tmp_path / "rules.json"
+        rules.write_text(
+            json.dumps(
+                {
+                    "detectors": [
+                        {
+                            "name": "react",
+                            "content": [{"file": "package.json", "json": "dependencies.react"}],
+                            "editors": ["zed"],
+                        }
+                    ],
+                    "editors": {"zed": {"name": "Zed"}},
+                }
+            )
+        )
+        monkeypatch.setenv("RULES_FILE", str(rules))
+        monkeypatch.setattr(
+            "alfred_pj.editors.Editors.get_first_available_editor", lambda self, codes: codes[0]
+        )
+        app = projects_dir / "my-js-app"
+        package = app / "package.json"
+        package.write_text('{"dependencies": {}}')
+
+        def subtitle():
+            result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+            assert result.exit_code == 0
+            items = json.loads(result.output)["items"]
+            return next(i["subtitle"] for i in items if i["title"] == "my-js-app")
+
+        assert subtitle().endswith("in WebStorm")
+        dir_mtime = os.stat(app).st_mtime
+        package.write_text('{"dependencies": {"react": "18"}}')
+        os.utime(package, (dir_mtime + 10, dir_mtime + 10))
+        os.utime(app, (dir_mtime, dir_mtime))  # an in-place edit leaves the directory alone
+        assert subtitle().endswith("in Zed")
+
+    def test_warm_run_reuses_rendered_items(self, projects_dir, temp_usage_dir):
+        """A second run splices cached fragments and renders only the footer items."""
+        from alfred_pj import listing
+
+        runner = CliRunner()
+        cold = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+        with patch("alfred_pj.listing.render_item", wraps=listing.render_item) as render:
+            warm = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        assert warm.exit_code == 0
+        assert json.loads(warm.output) == json.loads(cold.output)
+        assert render.call_count == 2
+
+    def test_rendered_items_follow_home(self, projects_dir, temp_usage_dir, monkeypatch):
+        """A different home-relative path invalidates the cached fragments."""
+        runner = CliRunner()
+        runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+        monkeypatch.setenv("HOME", str(projects_dir.parent))
+        result = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        go = next(i for i in json.loads(result.output)["items"] if i["title"] == "my-go-app")
+        assert go["subtitle"].startswith("Open ~/projects/my-go-app in ")
+
+    def test_alfred_cache_hint_follows_last_change(self, projects_dir, temp_usage_dir):
+        """Fresh roots get the shortest Alfred cache; long-unchanged ones the longest."""
+
+        from alfred_pj import listing
+
+        runner = CliRunner()
+        fresh = json.loads(runner.invoke(list_cmd, ["--paths", str(projects_dir)]).output)
+        for path in [projects_dir, *projects_dir.iterdir()]:
+            os.utime(path, (0, 0))
+        stale = json.loads(runner.invoke(list_cmd, ["--paths", str(projects_dir)]).output)
+
+        assert fresh["cache"] == {"seconds": listing.ALFRED_CACHE_MIN, "loosereload": True}
+        assert stale["cache"] == {"seconds": listing.ALFRED_CACHE_MAX, "loosereload": True}
+        assert "rerun" not in stale
+
+    def test_subtitle_shows_branch_and_last_commit(self, projects_dir, temp_usage_dir):
+        """Git projects show their branch and how long ago the last commit was."""
+        import time
+
+        git_dir = projects_dir / "my-go-app" / ".git"
+        (git_dir / "logs").mkdir(parents=True)
+        (git_dir / "HEAD").write_text("ref: refs/heads/dev\n")
+        (git_dir / "logs" / "HEAD").write_text(
+            f"{'0' * 40} {'1' * 40} A <a@b> {int(time.time()) - 3 * 86400} +0000\tcommit: x\n"
+        )
+
+        result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        items = {item["title"]: item for item in json.loads(result.output)["items"]}
+        assert items["my-go-app"]["subtitle"].endswith(" · dev · 3d ago")
+        assert " · " not in items["my-python-app"]["subtitle"]
+
+    def test_git_info_cached_and_optional(self, projects_dir, temp_usage_dir, monkeypatch):
+        """Unchanged repositories aren't re-read; GIT_INFO=0 turns the enrichment off."""
+        git_dir = projects_dir / "my-go-app" / ".git"
+        git_dir.mkdir()
+        (git_dir / "HEAD").write_text("ref: refs/heads/dev\n")
+        runner = CliRunner()
+        runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        with patch("alfred_pj.listing.head_summary") as mock_summary:
+            result = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+        mock_summary.assert_not_called()
+        assert any(i["subtitle"].endswith(" · dev") for i in json.loads(result.output)["items"])
+
+        monkeypatch.setenv("GIT_INFO", "0")
+        result = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+        assert not any(" · " in i["subtitle"] for i in json.loads(result.output)["items"])
+
+    def test_folds_selection_journal(self, projects_dir, temp_usage_dir):
+        """Journaled selections rank immediately and are compacted after the response."""
+        from alfred_pj.usage import append_selection, journal_path
+
+        append_selection(str(projects_dir / "my-js-app"))
+        result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        assert json.loads(result.output)["items"][0]["title"] == "my-js-app"
+        assert os.path.getsize(journal_path()) == 0
+        usage = json.loads((temp_usage_dir / "usage.json").read_text())
+        assert usage == {str(projects_dir / "my-js-app"): 1}
+
+    def test_query_filters_and_exports_query(self, projects_dir, temp_usage_dir):
+        """In query-aware mode only matching projects are listed, without a cache hint."""
+        result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir), "--query", "GO app"])
+
+        output = json.loads(result.output)
+        assert [item["title"] for item in output["items"]] == ["my-go-app"]
+        assert output["variables"] == {"alfred_pj_query": "GO app"}
+        assert "cache" not in output
+
+    def test_query_ranks_learned_selections_first(self, projects_dir, temp_usage_dir):
+        """Projects picked for the query outrank globally more used ones."""
+        from alfred_pj.usage import QueryUsage, UsageData
+
+        usage = UsageData()
+        usage.add_usage(str(projects_dir / "my-python-app"), count=10)
+        usage.write_data()
+        queries = QueryUsage()
+        queries.add("my", str(projects_dir / "my-js-app"))
+        queries.write_data()
+
+        runner = CliRunner()
+        result = runner.invoke(list_cmd, ["--paths", str(projects_dir), "--query", "my"])
+        titles = [item["title"] for item in json.loads(result.output)["items"]]
+        assert titles[:2] == ["my-js-app", "my-python-app"]
+
+        result = runner.invoke(list_cmd, ["--paths", str(projects_dir), "--query", "my-"])
+        assert json.loads(result.output)["items"][0]["title"] == "my-python-app"
+
+    def test_moved_project_keeps_history(self, projects_dir, temp_usage_dir, tmp_path):
+        """A renamed project keeps its usage and detected editor."""
+        from alfred_pj.usage import UsageData
+
+        old = projects_dir / "my-go-app"
+        usage = UsageData()
+        usage.add_usage(str(old), count=5)
+        usage.write_data()
+        runner = CliRunner()
+        runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        old.rename(projects_dir / "renamed-go-app")
+        with patch("alfred_pj.listing.Editors.determine_editor") as mock_detect:
+            result = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        mock_detect.assert_not_called()
+        assert json.loads(result.output)["items"][0]["title"] == "renamed-go-app"
+        assert UsageData().data == {str(projects_dir / "renamed-go-app"): 5}
+
+    def test_archives_usage_of_deleted_project(self, projects_dir, temp_usage_dir, monkeypatch):
+        """A deleted project's usage is archived, and restored when it is back."""
+        import shutil
+        import time
+        from types import SimpleNamespace
+
+        from alfred_pj.usage import GC_INTERVAL, GC_SCANS, UsageData
+
+        clock = SimpleNamespace(now=time.time())
+        monkeypatch.setattr("alfred_pj.usage.time", SimpleNamespace(time=lambda: clock.now))
+
+        project = projects_dir / "my-go-app"
+        usage = UsageData()
+        usage.add_usage(str(project), count=5)
+        usage.write_data()
+        runner = CliRunner()
+        runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+
+        shutil.rmtree(project)
+        for _ in range(GC_SCANS * 2):  # reruns within GC_INTERVAL count once
+            runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+        assert UsageData().data != {}
+        for _ in range(GC_SCANS - 1):
+            clock.now += GC_INTERVAL
+            runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+        assert UsageData().data == {}
+
+        project.mkdir()
+        result = runner.invoke(list_cmd, ["--paths", str(projects_dir)])
+        assert json.loads(result.output)["items"][0]["title"] == "my-go-app"
+        assert UsageData().data == {str(project): 5}
+
+
+class TestListTop:
+    """Tests for list --top (usage-only fast path)."""
+
+    @pytest.fixture(autouse=True)
+    def _isolate_cache(self, temp_cache_dir):
+        """Ensure each test uses an isolated cache directory."""
+
+    @pytest.fixture
+    def used(self, projects_dir, temp_usage_dir):
+        from alfred_pj.usage import UsageData
+
+        usage = UsageData()
+        usage.add_usage(str(projects_dir / "my-go-app"), count=10)
+        usage.add_usage(str(projects_dir / "my-python-app"), count=5)
+        usage.add_usage(str(projects_dir / "deleted-app"), count=50)
+        usage.add_usage("/elsewhere/other-root-app", count=40)
+        usage.add_usage("__CLEAR_CACHE__", count=30)
+        usage.write_data()
+        return projects_dir
+
+    def test_lists_top_used_existing_projects(self, used):
+        result = CliRunner().invoke(list_cmd, ["--paths", str(used), "--top", "5"])
+
+        assert result.exit_code == 0
+        items = json.loads(result.output)["items"]
+        assert [item["title"] for item in items] == ["my-go-app", "my-python-app"]
+        assert items[0]["arg"] == str(used / "my-go-app")
+        assert items[0]["subtitle"].startswith("Open ")
+
+    def test_respects_limit(self, used):
+        result = CliRunner().invoke(list_cmd, ["--paths", str(used), "--top", "1"])
+        items = json.loads(result.output)["items"]
+        assert [item["title"] for item in items] == ["my-go-app"]
+
+    def test_does_not_scan_roots(self, used):
+        with patch("alfred_pj.listing.scan") as mock_scan:
+            result = CliRunner().invoke(list_cmd, ["--paths", str(used), "--top", "5"])
+        assert result.exit_code == 0
+        mock_scan.assert_not_called()
+
+    def test_uses_cached_detection(self, used):
+        """Projects already detected by a full list are not detected again."""
+        runner = CliRunner()
+        runner.invoke(list_cmd, ["--paths", str(used)])
+        with patch("alfred_pj.editors.Editors.determine_editor") as mock_detect:
+            result = runner.invoke(list_cmd, ["--paths", str(used), "--top", "5"])
+        assert result.exit_code == 0
+        mock_detect.assert_not_called()
+
+    def test_rejects_negative_top(self, projects_dir, temp_usage_dir):
+        result = CliRunner().invoke(list_cmd, ["--paths", str(projects_dir), "--top", "-1"])
+        assert result.exit_code != 0
@@ -2,6 +2,7 @@
 
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
 from alfred_pj.commands.open_github import open_github
@@ -10,6 +11,10 @@ from alfred_pj.commands.open_github import open_github
 class TestOpenGithubCommand:
     """Tests for the open-github command."""
 
+    @pytest.fixture(autouse=True)
+    def _isolate_cache(self, temp_cache_dir):
+        """Ensure each test uses an isolated cache directory."""
+
     def test_calls_gh_browse(self, temp_project):
         """Should call 'gh browse' command."""
         with patch("subprocess.run") as mock_run:
@@ -19,6 +24,19 @@ class TestOpenGithubCommand:
             assert result.exit_code == 0
             mock_run.assert_called_once_with(["gh", "browse"], cwd=str(temp_project))
 
+    def test_opens_remote_parsed_offline(self, temp_project):
+        """A parsable remote is opened directly, without gh."""
+        (temp_project / ".git").mkdir()
+        (temp_project / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+        (temp_project / ".git" / "config").write_text(
+            '[remote "origin"]\n\turl = git@github.com:owner/repo.git\n'
+        )
+        with patch("subprocess.run") as mock_run:
+            result = CliRunner().invoke(open_github, ["--path", str(temp_project)])
+
+        assert result.exit_code == 0
+        mock_run.assert_called_once_with(["open", "https://github.com/owner/repo"])
+
     def test_uses_cwd_parameter(self, temp_project):
         """Should use cwd parameter with the project path."""
         with patch("subprocess.run") as mock_run:
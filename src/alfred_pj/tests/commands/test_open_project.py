@@ -1,7 +1,9 @@
 """Tests for open-project command."""
 
+import os
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
 from alfred_pj.commands.open_project import open_project
@@ -10,9 +12,13 @@ from alfred_pj.commands.open_project import open_project
 class TestOpenProjectCommand:
     """Tests for the open-project command."""
 
+    @pytest.fixture(autouse=True)
+    def _isolate_cache(self, temp_cache_dir):
+        """Ensure each test uses an isolated cache directory."""
+
     def test_calls_subprocess_with_editor(self, python_project):
         """Should call subprocess with determined editor."""
-        with patch("subprocess.run") as mock_run:
+        with patch("subprocess.Popen") as mock_run:
             runner = CliRunner()
             result = runner.invoke(open_project, ["--path", str(python_project)])
 
@@ -27,7 +33,7 @@ class TestOpenProjectCommand:
     def test_uses_correct_editor_for_project_type(self, go_project):
         """Should use correct editor based on project type."""
         with (
-            patch("subprocess.run") as mock_run,
+            patch("subprocess.Popen") as mock_run,
             patch("alfred_pj.editors.which", side_effect=lambda x: x if x == "goland" else None),
         ):
             runner = CliRunner()
@@ -75,3 +81,86 @@ class TestOpenProjectCommand:
         # Verify data was cleared
         usage = UsageData()
         assert usage.get_usage_by_path("/some/path") == 0
+
+    def test_uses_editor_variable_from_list(self, python_project, monkeypatch):
+        """The editor list put in the item variables is used without detection."""
+        monkeypatch.setenv("alfred_pj_editor", "zed")
+        with (
+            patch("subprocess.Popen") as mock_run,
+            patch("alfred_pj.editors.Editors.determine_editor") as mock_detect,
+        ):
+            result = CliRunner().invoke(open_project, ["--path", str(python_project)])
+
+        assert result.exit_code == 0
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == ["zed", str(python_project)]
+        mock_detect.assert_not_called()
+
+    def test_uses_cached_detection(self, python_project):
+        """A project cache entry with the current mtime skips detection."""
+        from alfred_pj.cache import CacheStore
+
+        cache = CacheStore()
+        cache.set_project(str(python_project), "zed", os.stat(python_project).st_mtime)
+        cache.save_projects()
+        with (
+            patch("subprocess.Popen") as mock_run,
+            patch("alfred_pj.editors.Editors.determine_editor") as mock_detect,
+        ):
+            result = CliRunner().invoke(open_project, ["--path", str(python_project)])
+
+        assert result.exit_code == 0
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == ["zed", str(python_project)]
+        mock_detect.assert_not_called()
+
+    def test_stale_cache_entry_is_redetected(self, python_project):
+        """An entry for an older mtime is ignored, and the fresh result is cached."""
+        from alfred_pj.cache import CacheStore
+
+        cache = CacheStore()
+        cache.set_project(str(python_project), "zed", 0.0)
+        cache.save_projects()
+        with patch("subprocess.Popen") as mock_run:
+            result = CliRunner().invoke(open_project, ["--path", str(python_project)])
+
+        assert result.exit_code == 0
+        editor_cmd = mock_run.call_args[0][0][0]
+        assert editor_cmd != "zed"
+        mtime = os.stat(python_project).st_mtime
+        assert CacheStore().get_project(str(python_project), mtime) == editor_cmd
+
+    def test_opens_several_paths_grouped_by_editor(self, tmp_path):
+        """Paths are resolved together and batched per editor."""
+        from alfred_pj.cache import CacheStore
+
+        cache = CacheStore()
+        paths = []
+        for name, code in (("a", "code"), ("b", "pycharm"), ("c", "code")):
+            (tmp_path / name).mkdir()
+            paths.append(str(tmp_path / name))
+            cache.set_project(paths[-1], code, os.stat(paths[-1]).st_mtime)
+        cache.save_projects()
+
+        with patch("subprocess.Popen") as mock_popen:
+            result = CliRunner().invoke(
+                open_project, ["--path", paths[0] + "\t" + paths[1], "--path", paths[2]]
+            )
+
+        assert result.exit_code == 0
+        launched = sorted(c[0][0] for c in mock_popen.call_args_list)
+        assert launched == [["code", paths[0], paths[2]], ["pycharm", paths[1]]]
+
+    def test_reads_paths_from_stdin(self, tmp_path, monkeypatch):
+        """'--path -' takes a newline-separated list and ignores the item variable."""
+        monkeypatch.setenv("alfred_pj_editor", "zed")
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+        stdin = f"{tmp_path / 'a'}\n{tmp_path / 'b'}\n"
+
+        with patch("subprocess.Popen") as mock_popen:
+            result = CliRunner().invoke(open_project, ["--path", "-"], input=stdin)
+
+        assert result.exit_code == 0
+        launched = [c[0][0] for c in mock_popen.call_args_list]
+        assert launched == [["code", str(tmp_path / "a"), str(tmp_path / "b")]]
@@ -2,6 +2,7 @@
 
 from unittest.mock import MagicMock, patch
 
+import pytest
 from click.testing import CliRunner
 
 from alfred_pj.commands.open_terminal import open_terminal
@@ -10,6 +11,10 @@ from alfred_pj.commands.open_terminal import open_terminal
 class TestOpenTerminalCommand:
     """Tests for the open-terminal command."""
 
+    @pytest.fixture(autouse=True)
+    def _isolate_cache(self, temp_cache_dir):
+        """Ensure each test uses an isolated cache directory."""
+
     def test_calls_terminal_open(self, temp_project):
         """Should call the terminal's open function."""
         mock_terminal = {
@@ -47,6 +52,26 @@ class TestOpenTerminalCommand:
             assert len(call_log) == 1
             assert call_log[0] == ("TestTerminal", str(temp_project))
 
+    def test_opens_each_path(self, tmp_path):
+        """Every path gets its own terminal, from one detection."""
+        mock_terminal = {"name": "MockTerminal", "check": lambda: True, "open": MagicMock()}
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+
+        with patch(
+            "alfred_pj.terminals.Terminals.get_available_terminal", return_value=mock_terminal
+        ) as mock_get:
+            result = CliRunner().invoke(
+                open_terminal, ["--path", str(tmp_path / "a"), "--path", str(tmp_path / "b")]
+            )
+
+        assert result.exit_code == 0
+        mock_get.assert_called_once()
+        assert [c[0][0] for c in mock_terminal["open"].call_args_list] == [
+            str(tmp_path / "a"),
+            str(tmp_path / "b"),
+        ]
+
     def test_requires_existing_path(self, tmp_path):
         """Should require path to exist."""
         runner = CliRunner()
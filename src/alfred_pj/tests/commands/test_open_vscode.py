@@ -12,16 +12,17 @@ class TestOpenVscodeCommand:
 
     def test_calls_code_command(self, temp_project):
         """Should call 'code' command with path."""
-        with patch("subprocess.run") as mock_run:
+        with patch("subprocess.Popen") as mock_run:
             runner = CliRunner()
             result = runner.invoke(open_vscode, ["--path", str(temp_project)])
 
             assert result.exit_code == 0
-            mock_run.assert_called_once_with(["code", str(temp_project)])
+            mock_run.assert_called_once()
+            assert mock_run.call_args[0][0] == ["code", str(temp_project)]
 
     def test_always_uses_code(self, python_project):
         """Should always use 'code' regardless of project type."""
-        with patch("subprocess.run") as mock_run:
+        with patch("subprocess.Popen") as mock_run:
             runner = CliRunner()
             result = runner.invoke(open_vscode, ["--path", str(python_project)])
 
@@ -29,6 +30,20 @@ class TestOpenVscodeCommand:
             args = mock_run.call_args[0][0]
             assert args[0] == "code"
 
+    def test_opens_several_folders_in_one_invocation(self, tmp_path):
+        """Multiple paths go to a single code process."""
+        for name in ("a", "b"):
+            (tmp_path / name).mkdir()
+
+        with patch("subprocess.Popen") as mock_run:
+            result = CliRunner().invoke(
+                open_vscode, ["--path", f"{tmp_path / 'a'}\t{tmp_path / 'b'}"]
+            )
+
+        assert result.exit_code == 0
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == ["code", str(tmp_path / "a"), str(tmp_path / "b")]
+
     def test_requires_existing_path(self, tmp_path):
         """Should require path to exist."""
         runner = CliRunner()
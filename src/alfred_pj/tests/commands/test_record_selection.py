@@ -1,5 +1,8 @@
 """Tests for record-selection command."""
 
+import json
+import os
+
 from click.testing import CliRunner
 
 from alfred_pj.commands.record_selection import record_selection
@@ -45,6 +48,51 @@ class TestRecordSelectionCommand:
         usage = UsageData()
         assert usage.get_usage_by_path("/test/path") == 1
 
+    def test_records_each_of_several_paths(self, temp_usage_dir):
+        """A multi-selection (one tab-separated argument) counts once per project."""
+        result = CliRunner().invoke(record_selection, ["--path", "/a\t/b", "--path", "/c"])
+
+        assert result.exit_code == 0
+        usage = UsageData()
+        assert [usage.get_usage_by_path(p) for p in ("/a", "/b", "/c")] == [1, 1, 1]
+        assert usage.get_usage_by_path("/a\t/b") == 0
+
+    def test_appends_to_journal_only(self, temp_usage_dir):
+        """A selection is one journal append; usage.json isn't rewritten."""
+        from alfred_pj.usage import EVENT_SIZE, journal_path
+
+        result = CliRunner().invoke(record_selection, ["--path", "/test/path"])
+
+        assert result.exit_code == 0
+        assert os.path.getsize(journal_path()) == EVENT_SIZE
+        assert not (temp_usage_dir / "usage.json").exists()
+
+    def test_compacts_full_journal(self, temp_usage_dir, monkeypatch):
+        """Once the journal holds COMPACT_EVERY events it is folded into usage.json."""
+        from alfred_pj.usage import journal_path
+
+        monkeypatch.setattr("alfred_pj.commands.record_selection.COMPACT_EVERY", 2)
+        runner = CliRunner()
+        runner.invoke(record_selection, ["--path", "/test/path"])
+        runner.invoke(record_selection, ["--path", "/test/path"])
+
+        assert os.path.getsize(journal_path()) == 0
+        assert json.loads((temp_usage_dir / "usage.json").read_text()) == {"/test/path": 2}
+
+    def test_learns_query_from_alfred_variable(self, temp_usage_dir, monkeypatch):
+        """The query list exported as alfred_pj_query is associated with the path."""
+        from alfred_pj.usage import QueryUsage
+
+        monkeypatch.setenv("alfred_pj_query", "tes")
+        CliRunner().invoke(record_selection, ["--path", "/test/path"])
+
+        assert QueryUsage().get("te") == {"/test/path": 1}
+
+    def test_without_query_learns_nothing(self, temp_usage_dir):
+        CliRunner().invoke(record_selection, ["--path", "/test/path"])
+
+        assert not (temp_usage_dir / "queries.json").exists()
+
     def test_requires_path_option(self):
         """Should require --path option."""
         runner = CliRunner()
@@ -87,3 +135,9 @@ class TestRecordSelectionCommand:
         # Verify nothing was recorded
         usage = UsageData()
         assert usage.get_usage_by_path("__CLEAR_USAGE__") == 0
+
+    def test_skips_clear_cache_path(self, temp_usage_dir):
+        """The clear-cache item isn't a project either."""
+        CliRunner().invoke(record_selection, ["--path", "__CLEAR_CACHE__"])
+
+        assert UsageData().data == {}
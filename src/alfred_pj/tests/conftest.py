@@ -161,3 +161,16 @@ def projects_dir(tmp_path):
     (go_proj / "go.mod").touch()
 
     return projects
+
+
+@pytest.fixture
+def roots(tmp_path):
+    """Create two scan roots with five projects each; return their paths."""
+    result = []
+    for name in ("root-a", "root-b"):
+        root = tmp_path / name
+        root.mkdir()
+        for i in range(5):
+            (root / f"{name}-proj-{i}").mkdir()
+        result.append(str(root))
+    return result
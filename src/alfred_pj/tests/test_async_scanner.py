@@ -0,0 +1,58 @@
+"""Tests for the asyncio scan engine."""
+
+import threading
+import time
+from unittest.mock import patch
+
+from alfred_pj import async_scanner
+from alfred_pj.scanner import iter_project_entries
+
+
+class TestScan:
+    """Tests for async_scanner.scan()."""
+
+    def test_order_matches_sequential_scan(self, roots):
+        expected = [e.path for root in roots for e in iter_project_entries(root)]
+        assert async_scanner.scan(roots, lambda entry: entry.path) == expected
+
+    def test_no_roots(self):
+        assert async_scanner.scan([], lambda entry: entry.name) == []
+
+    def test_unreadable_root_is_skipped(self, roots, tmp_path):
+        missing = str(tmp_path / "vanished")
+        assert len(async_scanner.scan([*roots, missing], lambda entry: entry.name)) == 10
+
+    def test_timeout_returns_completed_results(self, roots):
+        def process(entry):
+            if entry.name.endswith("-0"):
+                return entry.name
+            time.sleep(0.5)
+            return entry.name
+
+        start = time.monotonic()
+        names = async_scanner.scan(roots, process, timeout=0.2)
+        assert time.monotonic() - start < 1.5
+        assert set(names) <= {e.name for root in roots for e in iter_project_entries(root)}
+        assert len(names) < 10
+
+    def test_concurrency_bounded_per_mount(self, roots):
+        """Roots on the same mount share one MOUNT_CONCURRENCY budget."""
+        lock = threading.Lock()
+        active = peak = 0
+
+        def process(entry):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+            return entry.name
+
+        with (
+            patch.object(async_scanner, "MOUNT_CONCURRENCY", 3),
+            patch.object(async_scanner, "ROOT_CONCURRENCY", 3),
+        ):
+            async_scanner.scan(roots, process)
+        assert peak <= 3
@@ -68,6 +68,60 @@ class TestProjectCache:
         """Unknown path → None."""
         assert cache.get_project("/unknown/path", 0.0) is None
 
+    def test_get_stale_project_ignores_mtime(self, cache):
+        """Stale lookup returns the last known editor regardless of mtime."""
+        cache.set_project("/some/path", "code", 1000.0)
+        assert cache.get_stale_project("/some/path") == "code"
+        assert cache.get_stale_project("/unknown/path") is None
+
+    def test_fragment_hit_requires_same_key(self, cache):
+        """A rendered item is returned only for the key it was stored under."""
+        cache.set_project("/some/path", "code", 1.0)
+        cache.set_fragment("/some/path", ["VS Code", {"path": "a.svg"}, "~/p"], '{"title": "p"}')
+        assert (
+            cache.get_fragment("/some/path", ["VS Code", {"path": "a.svg"}, "~/p"])
+            == '{"title": "p"}'
+        )
+        assert cache.get_fragment("/some/path", ["Zed", {"path": "a.svg"}, "~/p"]) is None
+
+    def test_set_project_drops_fragment(self, cache):
+        """Re-detecting a project invalidates its rendered item."""
+        key = ["VS Code", {}, "~/p"]
+        cache.set_project("/some/path", "code", 1.0)
+        cache.set_fragment("/some/path", key, "{}")
+        cache.set_project("/some/path", "code", 2.0)
+        assert cache.get_fragment("/some/path", key) is None
+
+    def test_save_projects_skips_unchanged_cache(self, cache):
+        """Nothing is written when no entry changed since loading."""
+        cache.load_projects()
+        cache.save_projects()
+        assert not __import__("os").path.exists(cache._projects_file)
+
+    def test_git_info_requires_same_stamp(self, cache):
+        """Git info hits only for the HEAD/reflog mtimes it was stored with."""
+        cache.set_git("/p", [1.0, 2.0], {"branch": "main", "time": 5.0})
+        assert cache.get_git("/p", [1.0, 2.0])["branch"] == "main"
+        assert cache.get_git("/p", [1.0, 3.0]) is None
+        assert cache.get_stale_git("/p")["branch"] == "main"
+
+    def test_set_project_keeps_git_info(self, cache):
+        """Re-detecting the editor doesn't discard git info."""
+        cache.set_git("/p", [1.0, 2.0], {"branch": "main", "time": 5.0})
+        cache.set_project("/p", "code", 3.0)
+        assert cache.get_project("/p", 3.0) == "code"
+        assert cache.get_git("/p", [1.0, 2.0]) is not None
+
+    def test_content_memo_requires_same_stamp(self, cache):
+        """A content result hits only for the file mtime and size it was stored with."""
+        cache.set_content("/p", "key", [1.0, 10], True)
+        assert cache.get_content("/p", "key", [1.0, 10]) is True
+        assert cache.get_content("/p", "key", [1.0, 11]) is None
+        assert cache.get_content("/p", "other", [1.0, 10]) is None
+
+        cache.set_project("/p", "code", 2.0)
+        assert cache.get_content("/p", "key", [1.0, 10]) is True
+
     def test_save_projects_persists_to_disk(self, cache, tmp_path, monkeypatch):
         """save_projects writes data; a new CacheStore instance reads it back."""
         cache.set_project("/my/project", "code", 42.0)
@@ -85,6 +139,117 @@ class TestProjectCache:
         tmp_file = cache._projects_file + ".tmp"
         assert not __import__("os").path.exists(tmp_file)
 
+    def test_concurrent_saves_keep_both_runs_changes(self, cache):
+        """A run saving after another one only applies the entries it changed."""
+        cache.set_project("/a", "code", 1.0)
+        cache.set_project("/b", "idea", 1.0)
+        cache.save_projects()
+
+        other = CacheStore()
+        other.set_project("/a", "zed", 2.0)
+        cache.set_fragment("/b", ["IntelliJ IDEA", {}, "~/b"], "{}")
+        other.save_projects()
+        cache.save_projects()
+
+        fresh = CacheStore()
+        assert fresh.get_project("/a", 2.0) == "zed"
+        assert fresh.get_project("/b", 1.0) == "idea"
+        assert fresh.get_fragment("/b", ["IntelliJ IDEA", {}, "~/b"]) == "{}"
+
+    def test_concurrent_save_applies_forgotten_entries(self, cache):
+        """An entry this run forgot stays forgotten over another run's save."""
+        cache.set_project("/a", "code", 1.0)
+        cache.set_project("/b", "idea", 1.0)
+        cache.save_projects()
+
+        other = CacheStore()
+        other.set_project("/b", "zed", 2.0)
+        cache.forget_project("/a")
+        other.save_projects()
+        cache.save_projects()
+
+        fresh = CacheStore()
+        assert not fresh.has_project("/a")
+        assert fresh.get_project("/b", 2.0) == "zed"
+
+
+class TestProjectRelocation:
+    """Tests for carrying cache entries over to a project's new path."""
+
+    def test_moves_entry_with_same_file_id(self, cache, tmp_path):
+        """A vanished path's entry moves to the new path; the rendered item is dropped."""
+        new = str(tmp_path / "new")
+        cache.set_project("/gone/old", "pycharm", 1.0)
+        cache.set_fragment("/gone/old", ["k"], "{}")
+        cache.set_identity("/gone/old", "1:42")
+
+        assert cache.relocate_project(new, "1:42", None, 2.0) == "/gone/old"
+        assert cache.get_project(new, 2.0) == "pycharm"
+        assert cache.get_fragment(new, ["k"]) is None
+        assert not cache.has_project("/gone/old")
+
+    def test_matches_repo_id_when_file_id_differs(self, cache, tmp_path):
+        """A repository copied to another volume is found by its repo id."""
+        cache.set_project("/gone/old", "goland", 1.0)
+        cache.set_git("/gone/old", [1.0, 2.0], {"branch": "main", "repo": "abc@5"})
+
+        assert cache.relocate_project(str(tmp_path), "2:7", "abc@5", 3.0) == "/gone/old"
+        assert cache.get_stale_git(str(tmp_path))["branch"] == "main"
+
+    def test_keeps_entry_whose_path_still_exists(self, cache, tmp_path):
+        """A copy doesn't steal the original's entry."""
+        original = str(tmp_path)
+        cache.set_project(original, "code", 1.0)
+        cache.set_identity(original, "1:42")
+
+        assert cache.relocate_project("/elsewhere/copy", "1:42", None, 1.0) is None
+        assert cache.has_project(original)
+
+    def test_rejects_reused_inode_of_other_repo(self, cache, tmp_path):
+        """Same file id but a different repository is a new project."""
+        cache.set_project("/gone/old", "code", 1.0)
+        cache.set_identity("/gone/old", "1:42")
+        cache.set_git("/gone/old", [1.0, 2.0], {"repo": "abc@5"})
+
+        assert cache.relocate_project(str(tmp_path), "1:42", "def@9", 3.0) is None
+
+    def test_changed_content_file_invalidates_editor(self, cache, tmp_path):
+        """A file read by a content rule must be unchanged for the editor to be reused."""
+        package = tmp_path / "package.json"
+        package.write_text("{}")
+        cache.set_content_files(str(tmp_path), {"package.json": [package.stat().st_mtime, 2]})
+        cache.set_project(str(tmp_path), "webstorm", 1.0)
+        assert cache.get_project(str(tmp_path), 1.0) == "webstorm"
+
+        package.write_text('{"dependencies": {"react": "18"}}')
+        assert cache.get_project(str(tmp_path), 1.0) is None
+
+    def test_set_project_keeps_identity(self, cache):
+        cache.set_project("/p", "code", 1.0)
+        cache.set_identity("/p", "1:42")
+        cache.set_project("/p", "zed", 2.0)
+        assert cache.load_projects()["/p"]["id"] == "1:42"
+
+
+class TestDetectionLock:
+    """Tests for the lock that keeps concurrent runs from detecting twice."""
+
+    def test_one_holder_at_a_time(self, cache):
+        other = CacheStore()
+        assert cache.claim_detection()
+        assert cache.claim_detection()  # repeated calls keep the claim
+        assert not other.claim_detection()
+
+        cache.release_detection()
+        other = CacheStore()
+        assert other.claim_detection()
+        other.release_detection()
+
+    def test_release_without_claim_is_noop(self, cache):
+        cache.release_detection()
+        assert cache.claim_detection()
+        cache.release_detection()
+
 
 class TestCacheClear:
     def test_clear_removes_cache_files(self, cache):
@@ -0,0 +1,53 @@
+"""Tests for the lazily loading CLI group."""
+
+import os
+import subprocess
+import sys
+
+import click
+from click.testing import CliRunner
+
+from alfred_pj.cli import cli
+from alfred_pj.commands import COMMANDS
+
+
+class TestLazyGroup:
+    """Tests for LazyGroup command loading."""
+
+    def test_lists_all_commands(self):
+        """Help output should list every command without importing them up front."""
+        result = CliRunner().invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        for name in COMMANDS:
+            assert name in result.output
+
+    def test_resolves_command_by_name(self):
+        """get_command should import and return the named command."""
+        command = cli.get_command(click.Context(cli), "open-project")
+        assert command is not None
+        assert command.name == "open-project"
+
+    def test_unknown_command_fails(self):
+        """Unknown commands should produce a usage error."""
+        result = CliRunner().invoke(cli, ["no-such-command"])
+        assert result.exit_code != 0
+        assert "No such command" in result.output
+
+    def test_only_invoked_command_is_imported(self, tmp_path):
+        """Invoking one command must not import the other command modules."""
+        code = (
+            "import sys\n"
+            "from alfred_pj.cli import cli\n"
+            "cli(['clear-usage'], standalone_mode=False)\n"
+            "print(sorted(m for m in sys.modules if m.startswith('alfred_pj.commands.')))\n"
+        )
+        # clear-usage deletes usage data: point it at an empty data dir
+        env = {
+            **os.environ,
+            "alfred_workflow_data": str(tmp_path / "data"),
+            "alfred_workflow_cache": str(tmp_path / "cache"),
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+        )
+        assert result.stdout.strip() == "['alfred_pj.commands.clear_usage']"
@@ -0,0 +1,78 @@
+"""Tests for content predicates."""
+
+import json
+
+from alfred_pj import content
+
+
+def check(path, predicate):
+    return content.matches(str(path), predicate, path.stat().st_size)
+
+
+class TestJson:
+    def test_key_path(self, tmp_path):
+        package = tmp_path / "package.json"
+        package.write_text(json.dumps({"dependencies": {"react": "^18"}}))
+
+        assert check(package, {"file": "package.json", "json": "dependencies.react"})
+        assert check(package, {"file": "package.json", "json": "dependencies"})
+        assert not check(package, {"file": "package.json", "json": "dependencies.vue"})
+        assert not check(package, {"file": "package.json", "json": "dependencies.react.x"})
+
+    def test_invalid_json(self, tmp_path):
+        package = tmp_path / "package.json"
+        package.write_text("{not json")
+
+        assert not check(package, {"file": "package.json", "json": "name"})
+
+    def test_larger_than_limit_never_matches(self, tmp_path):
+        """A truncated JSON document can't be parsed, so it isn't read at all."""
+        package = tmp_path / "package.json"
+        package.write_text(json.dumps({"name": "x", "pad": "y" * 100}))
+
+        assert not check(package, {"file": "package.json", "json": "name", "max_bytes": 50})
+
+
+class TestToml:
+    PYPROJECT = (
+        '[project]\nname = "x"\n\n[ tool . "poetry" . dependencies ]  # deps\npython = "^3.12"\n'
+    )
+
+    def test_table_and_subtable(self, tmp_path):
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text(self.PYPROJECT)
+
+        assert check(pyproject, {"file": "pyproject.toml", "toml": "project"})
+        assert check(pyproject, {"file": "pyproject.toml", "toml": "tool.poetry"})
+        assert not check(pyproject, {"file": "pyproject.toml", "toml": "tool.poe"})
+        assert not check(pyproject, {"file": "pyproject.toml", "toml": "tool.hatch"})
+
+    def test_array_of_tables(self, tmp_path):
+        cargo = tmp_path / "Cargo.toml"
+        cargo.write_text('[[bin]]\nname = "x"\n')
+
+        assert check(cargo, {"file": "Cargo.toml", "toml": "bin"})
+
+    def test_values_are_not_headers(self, tmp_path):
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text('classifiers = [\n"tool.poetry"]\nx = ["a"]\n')
+
+        assert not check(pyproject, {"file": "pyproject.toml", "toml": "tool.poetry"})
+
+
+class TestContains:
+    def test_substring_within_limit(self, tmp_path):
+        makefile = tmp_path / "Makefile"
+        makefile.write_text("x" * 100 + "cargo build\n")
+
+        assert check(makefile, {"file": "Makefile", "contains": "cargo"})
+        assert not check(makefile, {"file": "Makefile", "contains": "cargo", "max_bytes": 100})
+
+
+def test_needs_exactly_one_matcher(tmp_path):
+    (tmp_path / "f").write_text("a")
+
+    assert content.matcher({"file": "f", "contains": "a"}) == "contains"
+    assert content.matcher({"file": "f"}) is None
+    assert content.matcher({"file": "f", "contains": "a", "json": "a"}) is None
+    assert not check(tmp_path / "f", {"file": "f"})
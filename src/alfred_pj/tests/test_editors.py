@@ -234,6 +234,34 @@ class TestMatchesDetector:
         detector = {"globs": ["*.py"]}
         assert editors._matches_detector(str(temp_project), detector)
 
+    def test_matches_content(self, temp_project):
+        """Content predicates route on what a file says, not just that it exists."""
+        (temp_project / "package.json").write_text('{"dependencies": {"react": "18"}}')
+        editors = Editors()
+        react = {"content": [{"file": "package.json", "json": "dependencies.react"}]}
+        vue = {"content": [{"file": "package.json", "json": "dependencies.vue"}]}
+        missing = {"content": [{"file": "deno.json", "json": "tasks"}]}
+        assert editors._matches_detector(str(temp_project), react)
+        assert not editors._matches_detector(str(temp_project), vue)
+        assert not editors._matches_detector(str(temp_project), missing)
+
+    def test_content_results_memoized_in_project_cache(self, temp_project, temp_cache_dir):
+        """An unchanged file is not read again; a changed one is."""
+        from alfred_pj.cache import CacheStore
+
+        package = temp_project / "package.json"
+        package.write_text('{"dependencies": {"react": "18"}}')
+        detector = {"content": [{"file": "package.json", "json": "dependencies.react"}]}
+        editors = Editors(cache=CacheStore())
+        assert editors._matches_detector(str(temp_project), detector)
+
+        with patch("alfred_pj.content.matches") as mock_matches:
+            assert editors._matches_detector(str(temp_project), detector)
+        mock_matches.assert_not_called()
+
+        package.write_text('{"dependencies": {}}')
+        assert not editors._matches_detector(str(temp_project), detector)
+
     def test_exclude_dirs_blocks_match(self, temp_project):
         """Exclude dirs should prevent a match."""
         (temp_project / ".vscode").mkdir()
@@ -329,3 +357,30 @@ class TestDynamicEditorRegistration:
             result = editors.get_first_available_editor(["unavailable-editor", "code"])
             # Should return code since it's available (or default if code isn't installed)
             assert result in ("code", editors.default_editor)
+
+
+class TestUserRules:
+    """Tests for detectors and editors defined in a rules file."""
+
+    def test_rules_detector_and_editor(self, temp_project, temp_usage_dir, monkeypatch):
+        """A rules file adds a language and an editor without a release."""
+        import json
+
+        (temp_usage_dir / "rules.json").write_text(
+            json.dumps(
+                {
+                    "detectors": [{"name": "elixir", "files": ["mix.exs"], "editors": ["zed"]}],
+                    "editors": {"zed": {"name": "Zed", "icon": "images/zed.png"}},
+                }
+            )
+        )
+        (temp_project / "mix.exs").touch()
+        monkeypatch.setattr("alfred_pj.editors.which", lambda cmd: f"/bin/{cmd}")
+
+        editors = Editors()
+        assert editors.determine_editor(str(temp_project)) == "zed"
+        assert editors.get_editor("zed") == {
+            "name": "Zed",
+            "icon": {"path": "images/zed.png"},
+            "available": True,
+        }
@@ -0,0 +1,87 @@
+"""Tests for the latency ring buffer."""
+
+import os
+
+import pytest
+
+from alfred_pj.latency import PHASES, LatencyLog, percentile, record_run
+from alfred_pj.tracing import Tracer
+
+
+@pytest.fixture
+def log(tmp_path):
+    return LatencyLog(str(tmp_path / "latency.bin"), capacity=5)
+
+
+class TestLatencyLog:
+    """Tests for LatencyLog."""
+
+    def test_read_missing_file(self, log):
+        assert log.read() == []
+
+    def test_append_and_read(self, log):
+        log.append(0.012, {"scan": 0.004, "usage": 0.001}, hits=10, misses=2)
+        (record,) = log.read()
+        assert record.total_ms == pytest.approx(12.0)
+        assert record.phases["scan"] == pytest.approx(4.0)
+        assert record.phases["serialize"] == 0.0
+        assert set(record.phases) == set(PHASES)
+        assert (record.cache_hits, record.cache_misses) == (10, 2)
+
+    def test_post_response_is_recorded_separately(self, log):
+        log.append(0.012, {}, hits=0, misses=0, post_response=0.030)
+        (record,) = log.read()
+        assert record.total_ms == pytest.approx(12.0)
+        assert record.post_response_ms == pytest.approx(30.0)
+
+    def test_record_run_totals_until_response(self, tmp_path, monkeypatch):
+        """Work after the response mark doesn't count toward the total."""
+        monkeypatch.setenv("alfred_workflow_cache", str(tmp_path))
+        tracer = Tracer(enabled=True)
+        tracer.marks["response"] = 0.010
+        tracer._start -= 0.050  # the run has taken 50ms so far
+        record_run(tracer)
+
+        (record,) = LatencyLog().read()
+        assert record.total_ms == pytest.approx(10.0)
+        assert record.post_response_ms == pytest.approx(40.0, abs=5.0)
+
+    def test_wraps_at_capacity(self, log):
+        for i in range(8):
+            log.append(i / 1000, {}, hits=i, misses=0)
+        records = log.read()
+        assert [r.cache_hits for r in records] == [3, 4, 5, 6, 7]
+
+    def test_file_size_is_bounded(self, log):
+        for _ in range(20):
+            log.append(0.001, {}, hits=0, misses=0)
+        size = os.path.getsize(log.path)
+        for _ in range(20):
+            log.append(0.001, {}, hits=0, misses=0)
+        assert os.path.getsize(log.path) == size
+
+    def test_read_last_n(self, log):
+        for i in range(4):
+            log.append(0.001, {}, hits=i, misses=0)
+        assert [r.cache_hits for r in log.read(last=2)] == [2, 3]
+
+    def test_foreign_file_is_reset(self, log):
+        with open(log.path, "wb") as f:
+            f.write(b"garbage that is not a latency log")
+        assert log.read() == []
+        log.append(0.001, {}, hits=1, misses=0)
+        assert [r.cache_hits for r in log.read()] == [1]
+
+
+class TestPercentile:
+    """Tests for percentile()."""
+
+    def test_empty(self):
+        assert percentile([], 50) == 0.0
+
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
@@ -0,0 +1,53 @@
+"""Tests for detached launching and multi-path arguments."""
+
+import io
+from unittest.mock import patch
+
+from alfred_pj.launch import collect_paths, open_with, spawn
+
+
+class TestCollectPaths:
+    """Tests for collect_paths()."""
+
+    def test_splits_alfred_tab_separated_selection(self):
+        """Several selected Alfred items arrive as one tab-separated argument."""
+        assert collect_paths(("/a\t/b", "/c")) == ["/a", "/b", "/c"]
+
+    def test_reads_stdin_for_dash(self, monkeypatch):
+        """'-' reads one path per line from stdin, skipping blanks."""
+        monkeypatch.setattr("sys.stdin", io.StringIO("/a\n\n/b\n"))
+        assert collect_paths(("-",)) == ["/a", "/b"]
+
+    def test_drops_duplicates(self):
+        """A path given twice is opened once."""
+        assert collect_paths(("/a", "/a\t/b")) == ["/a", "/b"]
+
+
+class TestLaunch:
+    """Tests for spawn() and open_with()."""
+
+    def test_spawn_detaches(self):
+        """Processes run in their own session with no inherited stdio."""
+        with patch("subprocess.Popen") as mock_popen:
+            spawn(["true"])
+
+        kwargs = mock_popen.call_args[1]
+        assert kwargs["start_new_session"] is True
+        assert kwargs["stdout"] is not None
+
+    def test_batching_editor_gets_one_process(self):
+        """VS Code-style CLIs open all folders from one invocation."""
+        with patch("subprocess.Popen") as mock_popen:
+            open_with("code", ["/a", "/b"])
+
+        assert [c[0][0] for c in mock_popen.call_args_list] == [["code", "/a", "/b"]]
+
+    def test_other_editors_get_one_process_per_path(self):
+        """Editors without multi-folder support are launched per path, all at once."""
+        with patch("subprocess.Popen") as mock_popen:
+            open_with("pycharm", ["/a", "/b"])
+
+        assert [c[0][0] for c in mock_popen.call_args_list] == [
+            ["pycharm", "/a"],
+            ["pycharm", "/b"],
+        ]
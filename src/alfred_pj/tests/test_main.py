@@ -0,0 +1,110 @@
+"""Tests for the alfred-pj entry point and its click-free list fast path."""
+
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from alfred_pj.__main__ import _fast_list_args, main
+
+# Modules the list fast path must never import
+LIST_FORBIDDEN_IMPORTS = {"click", "subprocess", "alfred_pj.commands", "alfred_pj.terminals"}
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int]]:
+    """Return (module, self_us) pairs from `python -X importtime` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line.removeprefix("import time:").split("|")
+        modules.append((name.strip(), int(self_us)))
+    return modules
+
+
+class TestFastListArgs:
+    """Tests for _fast_list_args()."""
+
+    def test_separate_value(self):
+        assert _fast_list_args(["list", "--paths", "~/a,~/b"]) == {"--paths": "~/a,~/b"}
+
+    def test_equals_value(self):
+        assert _fast_list_args(["list", "--paths=~/a"]) == {"--paths": "~/a"}
+
+    def test_top(self):
+        assert _fast_list_args(["list", "--top", "10", "--paths", "~/a"]) == {
+            "--paths": "~/a",
+            "--top": "10",
+        }
+
+    def test_query(self):
+        assert _fast_list_args(["list", "--paths", "~/a", "--query", ""]) == {
+            "--paths": "~/a",
+            "--query": "",
+        }
+
+    def test_other_commands_fall_through(self):
+        assert _fast_list_args(["open-project", "--path", "/x"]) is None
+
+    def test_unusual_list_invocations_fall_through(self):
+        """Anything but the plain forms goes through click for proper errors."""
+        assert _fast_list_args(["list"]) is None
+        assert _fast_list_args(["list", "--help"]) is None
+        assert _fast_list_args(["list", "--paths"]) is None
+        assert _fast_list_args(["list", "--paths", "a", "--extra"]) is None
+        assert _fast_list_args(["list", "--paths", "a", "--paths", "b"]) is None
+        assert _fast_list_args(["list", "--paths", "a", "--top", "many"]) is None
+
+
+class TestMain:
+    """Tests for main() dispatch."""
+
+    def test_list_bypasses_click(self, projects_dir, temp_usage_dir, temp_cache_dir, capsys):
+        """The fast path prints the same response as the click command."""
+        with patch("alfred_pj.cli.cli") as mock_cli:
+            main(["list", "--paths", str(projects_dir)])
+        mock_cli.assert_not_called()
+        output = json.loads(capsys.readouterr().out)
+        titles = [item["title"] for item in output["items"]]
+        assert "my-python-app" in titles
+
+    def test_top_bypasses_click(self, projects_dir, temp_usage_dir, temp_cache_dir, capsys):
+        with patch("alfred_pj.listing.list_top_projects") as mock_top:
+            main(["list", "--paths", str(projects_dir), "--top", "3"])
+        mock_top.assert_called_once_with(str(projects_dir), 3)
+
+    def test_other_commands_use_click(self):
+        with patch("alfred_pj.cli.cli") as mock_cli:
+            main(["debug"])
+        mock_cli.assert_called_once_with(args=["debug"], prog_name="alfred-pj")
+
+
+class TestListImportBudget:
+    """Guards against startup regressions on the per-keystroke list path.
+
+    Import time itself is machine-dependent and measured by
+    benchmarks/list_imports.py instead.
+    """
+
+    @pytest.fixture
+    def importtime(self, projects_dir, temp_usage_dir, temp_cache_dir):
+        code = (
+            "from alfred_pj.__main__ import main\n"
+            f"main(['list', '--paths', {str(projects_dir)!r}])\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        modules = _parse_importtime(result.stderr)
+        # Drop interpreter startup: keep everything from our package onwards
+        start = next(i for i, (name, _) in enumerate(modules) if name.startswith("alfred_pj"))
+        return modules[start:]
+
+    def test_no_forbidden_imports(self, importtime):
+        imported = {name for name, _ in importtime}
+        assert not imported & LIST_FORBIDDEN_IMPORTS
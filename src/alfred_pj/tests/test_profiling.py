@@ -0,0 +1,72 @@
+"""Tests for on-demand profiling."""
+
+import os
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from alfred_pj import profiling
+from alfred_pj.cli import cli
+
+
+class TestStart:
+    """Tests for profiling.start()."""
+
+    def test_disabled_without_env(self, temp_cache_dir, monkeypatch):
+        monkeypatch.delenv("alfred_pj_profile", raising=False)
+        assert profiling.start("list") is None
+
+    def test_unknown_mode_is_ignored(self, temp_cache_dir, monkeypatch):
+        monkeypatch.setenv("alfred_pj_profile", "gpu")
+        assert profiling.start("list") is None
+
+    def test_cpu_capture(self, temp_cache_dir, monkeypatch):
+        monkeypatch.setenv("alfred_pj_profile", "cpu")
+        profiler = profiling.start("list")
+        sum(range(1000))
+        path = profiler.stop()
+        assert path.endswith("-list.pstats")
+        assert profiling.list_profiles() == [path]
+        assert "calls in" in profiling.summarize(path)[0]
+
+    def test_mem_capture(self, temp_cache_dir, monkeypatch):
+        monkeypatch.setenv("alfred_pj_profile", "mem")
+        profiler = profiling.start("editor")
+        data = [bytearray(1024) for _ in range(100)]
+        path = profiler.stop()
+        del data
+        assert path.endswith("-editor.mem.txt")
+        assert profiling.summarize(path)[0].startswith("current ")
+
+    def test_keeps_newest_captures(self, temp_cache_dir, monkeypatch):
+        monkeypatch.setenv("alfred_pj_profile", "cpu")
+        with patch.object(profiling, "KEEP", 2):
+            for i in range(4):
+                profiler = profiling.start(f"cmd{i}")
+                path = profiler.stop()
+                os.utime(path, (i, i))
+        assert [os.path.basename(p).split("-")[-1] for p in profiling.list_profiles()] == [
+            "cmd3.pstats",
+            "cmd2.pstats",
+        ]
+
+
+class TestCliWiring:
+    """Every click subcommand is profiled when the variable is set."""
+
+    def test_subcommand_writes_profile(self, temp_cache_dir, temp_usage_dir, monkeypatch):
+        monkeypatch.setenv("alfred_pj_profile", "cpu")
+        result = CliRunner().invoke(cli, ["clear-usage"])
+        assert result.exit_code == 0
+        (path,) = profiling.list_profiles()
+        assert path.endswith("-clear-usage.pstats")
+
+    def test_list_fast_path_writes_profile(
+        self, projects_dir, temp_cache_dir, temp_usage_dir, monkeypatch, capsys
+    ):
+        from alfred_pj.__main__ import main
+
+        monkeypatch.setenv("alfred_pj_profile", "cpu")
+        main(["list", "--paths", str(projects_dir)])
+        (path,) = profiling.list_profiles()
+        assert path.endswith("-list.pstats")
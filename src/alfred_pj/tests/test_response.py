@@ -1,6 +1,8 @@
 """Tests for Alfred response formatting."""
 
-from alfred_pj.response import ResponseItem
+import json
+
+from alfred_pj.response import ResponseItem, render_item
 
 
 class TestResponseItem:
@@ -88,8 +90,18 @@ class TestResponseItem:
 
         assert item.score == 100
 
-    def test_serializable_to_dict(self):
-        """Should have __dict__ for JSON serialization."""
+    def test_has_no_instance_dict(self):
+        """Items are slotted records."""
+        item = ResponseItem(title="Test", subtitle="Test", arg="/path", icon={})
+
+        assert not hasattr(item, "__dict__")
+
+
+class TestRenderItem:
+    """Tests for the Alfred item encoder."""
+
+    def test_emits_only_alfred_fields(self):
+        """calls and score drive ranking but are not part of the JSON."""
         item = ResponseItem(
             title="Project",
             subtitle="Subtitle",
@@ -99,11 +111,28 @@ class TestResponseItem:
             score=10,
         )
 
-        d = item.__dict__
-        assert d["title"] == "Project"
-        assert d["subtitle"] == "Subtitle"
-        assert d["arg"] == "/path"
-        assert d["icon"] == {"path": "icon.png"}
-        assert d["match"] == "project subtitle"
-        assert d["calls"] == 5
-        assert d["score"] == 10
+        assert json.loads(render_item(item)) == {
+            "title": "Project",
+            "subtitle": "Subtitle",
+            "arg": "/path",
+            "match": "project subtitle",
+            "icon": {"path": "icon.png"},
+        }
+
+    def test_matches_json_dumps(self):
+        """Output is byte-identical to json.dumps, including escaping."""
+        item = ResponseItem(
+            title='Caf\u00e9 "x"',
+            subtitle="Open ~/caf\u00e9\tx",
+            arg="/caf\u00e9",
+            icon={"type": "fileicon", "path": "/Applications/Zed.app"},
+        )
+        fields = ("title", "subtitle", "arg", "match", "icon")
+
+        assert render_item(item) == json.dumps({f: getattr(item, f) for f in fields})
+
+    def test_omits_match_equal_to_title(self):
+        """Without a subtitle Alfred's default filtering on title is enough."""
+        item = ResponseItem(title="Test", subtitle="", arg="/path", icon={})
+
+        assert "match" not in json.loads(render_item(item))
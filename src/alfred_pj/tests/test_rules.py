@@ -0,0 +1,140 @@
+"""Tests for user detector rules."""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from alfred_pj import rules
+from alfred_pj.cache import CacheStore
+from alfred_pj.editors import DETECTORS, EDITOR_DEFS
+from alfred_pj.rules import RulesError, compile_rules, load_rules, merge
+
+ELIXIR = {"name": "elixir", "files": ["mix.exs"], "env": "EDITORS_ELIXIR", "editors": ["zed"]}
+ZED = {"zed": {"name": "Zed", "icon": "images/zed.png"}}
+
+
+@pytest.fixture
+def rules_json(temp_usage_dir):
+    """Write rules.json to the workflow data directory."""
+
+    def write(data):
+        path = temp_usage_dir / "rules.json"
+        path.write_text(json.dumps(data))
+        return path
+
+    return write
+
+
+class TestCompileRules:
+    def test_valid_rules(self):
+        compiled = compile_rules({"detectors": [ELIXIR], "editors": ZED})
+
+        assert compiled["detectors"] == [ELIXIR]
+        assert compiled["editors"] == {"zed": {"name": "Zed", "icon": {"path": "images/zed.png"}}}
+
+    @pytest.mark.parametrize(
+        ("data", "message"),
+        [
+            ({"detector": []}, "unknown sections"),
+            ({"detectors": [{"files": ["x"], "editors": ["a"]}]}, "name"),
+            ({"detectors": [{"name": "x", "files": ["x"]}]}, "needs editors"),
+            ({"detectors": [{"name": "x", "editors": ["a"]}]}, "at least one of"),
+            ({"detectors": [{**ELIXIR, "files": "mix.exs"}]}, "files must be a list"),
+            ({"detectors": [{**ELIXIR, "file": ["mix.exs"]}]}, "unknown keys: file"),
+            ({"detectors": [ELIXIR, ELIXIR]}, "unique"),
+            ({"editors": {"zed": {"icon": "x.png"}}}, "needs a name"),
+        ],
+    )
+    def test_invalid_rules(self, data, message):
+        with pytest.raises(RulesError, match=message):
+            compile_rules(data)
+
+    @pytest.mark.parametrize(
+        ("predicate", "message"),
+        [
+            ({"file": "../x", "contains": "a"}, "inside the project"),
+            ({"file": "/etc/x", "contains": "a"}, "inside the project"),
+            ({"file": "x"}, "exactly one of"),
+            ({"file": "x", "json": "a", "toml": "b"}, "exactly one of"),
+            ({"file": "x", "contains": "a", "max_bytes": 0}, "max_bytes"),
+        ],
+    )
+    def test_invalid_content_predicates(self, predicate, message):
+        detector = {"name": "x", "content": [predicate], "editors": ["a"]}
+        with pytest.raises(RulesError, match=message):
+            compile_rules({"detectors": [detector]})
+
+
+class TestMerge:
+    def test_new_detectors_first_and_same_name_replaces(self):
+        python = {"name": "python", "files": ["pixi.toml"], "editors": ["zed"]}
+        detectors, editors = merge(
+            DETECTORS, EDITOR_DEFS, compile_rules({"detectors": [ELIXIR, python], "editors": ZED})
+        )
+
+        names = [d["name"] for d in detectors]
+        assert names[0] == "elixir"
+        assert names[1:] == [d["name"] for d in DETECTORS]
+        assert detectors[names.index("python")] is python
+        assert editors["zed"]["name"] == "Zed"
+        assert editors["code"] == EDITOR_DEFS["code"]
+
+
+class TestLoadRules:
+    @pytest.fixture(autouse=True)
+    def _isolate_cache(self, temp_cache_dir):
+        """Ensure each test uses an isolated cache directory."""
+
+    def test_no_rules_file(self, temp_usage_dir):
+        assert load_rules(CacheStore()) is None
+
+    def test_toml_rules(self, temp_usage_dir):
+        pytest.importorskip("tomllib")
+        (temp_usage_dir / "rules.toml").write_text(
+            '[[detectors]]\nname = "elixir"\nfiles = ["mix.exs"]\neditors = ["zed"]\n'
+        )
+
+        assert load_rules()["detectors"][0]["name"] == "elixir"
+
+    def test_rules_file_variable(self, tmp_path, monkeypatch):
+        path = tmp_path / "my-rules.json"
+        path.write_text(json.dumps({"detectors": [ELIXIR]}))
+        monkeypatch.setenv("RULES_FILE", str(path))
+
+        assert load_rules()["detectors"] == [ELIXIR]
+
+    def test_compiled_rules_cached_by_stamp(self, rules_json):
+        """An unchanged file isn't parsed again; a changed one is."""
+        path = rules_json({"detectors": [ELIXIR]})
+        load_rules(CacheStore())
+
+        with patch("alfred_pj.rules.parse_rules_file") as mock_parse:
+            assert load_rules(CacheStore())["detectors"] == [ELIXIR]
+        mock_parse.assert_not_called()
+
+        rules_json({"detectors": [ELIXIR], "editors": ZED})
+        os.utime(path, (1, 1))
+        assert "zed" in load_rules(CacheStore())["editors"]
+
+    def test_changed_rules_drop_cached_detections(self, rules_json):
+        cache = CacheStore()
+        cache.set_project("/p", "code", 1.0)
+        cache.set_git("/p", [1.0, 2.0], {"branch": "main"})
+        cache.save_projects()
+        rules_json({"detectors": [ELIXIR]})
+
+        cache = CacheStore()
+        load_rules(cache)
+        assert cache.get_project("/p", 1.0) is None
+        assert cache.get_git("/p", [1.0, 2.0]) is not None
+
+    def test_invalid_file_keeps_last_valid_rules(self, rules_json):
+        path = rules_json({"detectors": [ELIXIR]})
+        load_rules(CacheStore())
+        path.write_text("{broken")
+
+        with patch.object(rules.logger, "error") as mock_error:
+            assert load_rules(CacheStore())["detectors"] == [ELIXIR]
+        assert "can't parse" in mock_error.call_args[0][0]
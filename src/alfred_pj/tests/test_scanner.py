@@ -0,0 +1,162 @@
+"""Tests for the streaming root scanner."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from alfred_pj.scanner import DetectionPool, iter_project_entries, resolve_roots, scan
+
+
+class TestResolveRoots:
+    """Tests for resolve_roots()."""
+
+    def test_expands_and_keeps_directories(self, tmp_path, monkeypatch):
+        (tmp_path / "projects").mkdir()
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert resolve_roots("~/projects") == [str(tmp_path / "projects")]
+
+    def test_drops_missing_and_file_paths(self, tmp_path):
+        (tmp_path / "file.txt").touch()
+        assert resolve_roots(f"{tmp_path / 'file.txt'},/nonexistent/12345") == []
+
+
+class TestIterProjectEntries:
+    """Tests for iter_project_entries()."""
+
+    def test_yields_visible_directories_only(self, tmp_path):
+        (tmp_path / "project").mkdir()
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / "file.txt").touch()
+        assert [e.name for e in iter_project_entries(str(tmp_path))] == ["project"]
+
+
+class TestScan:
+    """Tests for scan()."""
+
+    def test_processes_every_entry(self, roots):
+        names = scan(roots, lambda entry: entry.name)
+        assert len(names) == 10
+
+    def test_order_matches_sequential_scan(self, roots):
+        """Concurrent scanning must not change result order."""
+        expected = [e.path for root in roots for e in iter_project_entries(root)]
+        assert scan(roots, lambda entry: entry.path, workers=4) == expected
+
+    def test_small_queue_does_not_deadlock(self, roots):
+        assert len(scan(roots, lambda entry: entry.name, workers=1, queue_size=1)) == 10
+
+    def test_no_roots(self):
+        assert scan([], lambda entry: entry.name) == []
+
+    def test_reraises_process_errors(self, roots):
+        def process(entry):
+            raise ValueError(entry.name)
+
+        with pytest.raises(ValueError):
+            scan(roots, process, workers=2, queue_size=1)
+
+    def test_unreadable_root_is_skipped(self, roots, tmp_path):
+        missing = os.path.join(tmp_path, "vanished")
+        assert len(scan([*roots, missing], lambda entry: entry.name)) == 10
+
+
+class TestDetectionPool:
+    """Tests for DetectionPool."""
+
+    def test_runs_highest_priority_first(self):
+        pool = DetectionPool(workers=1)
+        gate = threading.Event()
+        order = []
+        pool.submit(0, 1, "/root", gate.wait)  # occupies the only worker
+        for priority in (1, 9, 3):
+            pool.submit(priority, 1, "/root", order.append, priority)
+        gate.set()
+        pool.shutdown(wait=True)
+        assert order == [9, 3, 1]
+
+    def test_returns_results_and_exceptions(self):
+        pool = DetectionPool(workers=2)
+        ok = pool.submit(0, 1, "/root", lambda: "code")
+        failed = pool.submit(0, 1, "/root", lambda: 1 / 0)
+        pool.shutdown(wait=True)
+        assert ok.result() == "code"
+        with pytest.raises(ZeroDivisionError):
+            failed.result()
+
+    def test_starts_no_threads_without_work(self):
+        before = threading.active_count()
+        pool = DetectionPool(workers=4)
+        assert threading.active_count() == before
+        pool.shutdown(wait=True)
+
+    @pytest.mark.parametrize(
+        ("mount_limit", "root_limit", "expected"),
+        [(2, None, 2), (None, 1, 2), (None, None, 4)],
+    )
+    def test_limits_calls_in_flight(self, mount_limit, root_limit, expected):
+        """Two roots on one mount: the mount limit caps both, the root limit each."""
+        pool = DetectionPool(workers=4, mount_limit=mount_limit, root_limit=root_limit)
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+        for i in range(8):
+            pool.submit(0, 1, f"/root-{i % 2}", work)
+        pool.shutdown(wait=True)
+        assert peak[0] == expected
+
+    def test_saturated_limits_stay_linear(self):
+        """Queued calls behind a full mount and root don't slow the pool down."""
+        pool = DetectionPool(workers=10, mount_limit=10, root_limit=5)
+        start = time.monotonic()
+        for _ in range(2000):
+            pool.submit(0, 1, "/root", time.sleep, 0.001)
+        pool.shutdown(wait=True)
+        # 2000 x 1ms over 5 slots is 0.4s; rescanning the queue took many seconds
+        assert time.monotonic() - start < 2.0
+
+    def test_parked_root_resumes_after_limit_frees(self):
+        """A root waiting on its mount limit runs once the other root finishes."""
+        pool = DetectionPool(workers=4, mount_limit=1)
+        gate = threading.Event()
+        first = pool.submit(0, 1, "/root-a", gate.wait, 5)
+        second = pool.submit(5, 1, "/root-b", lambda: "b")
+        assert not second.done()
+        gate.set()
+        pool.shutdown(wait=True)
+        assert first.result() and second.result() == "b"
+
+    def test_cancel_pending_skips_queued_calls(self):
+        pool = DetectionPool(workers=1)
+        gate = threading.Event()
+        running = pool.submit(0, 1, "/root", gate.wait, 5)
+        queued = [pool.submit(0, 1, "/root", print) for _ in range(3)]
+        assert pool.cancel_pending() == 3
+        gate.set()
+        pool.shutdown(wait=True)
+        assert running.result() and all(f.cancelled() for f in queued)
+
+    def test_runs_on_given_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="shared") as executor:
+            pool = DetectionPool(workers=2, executor=executor)
+            name = pool.submit(0, 1, "/root", lambda: threading.current_thread().name)
+            pool.shutdown(wait=True)
+            assert name.result().startswith("shared")
+
+    def test_submit_after_shutdown_fails(self):
+        pool = DetectionPool(workers=1)
+        pool.shutdown()
+        with pytest.raises(RuntimeError):
+            pool.submit(0, 1, "/root", print)
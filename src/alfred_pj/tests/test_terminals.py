@@ -2,6 +2,8 @@
 
 from unittest.mock import patch
 
+import pytest
+
 from alfred_pj.terminals import Terminals
 
 
@@ -113,21 +115,79 @@ class TestTerminalOpen:
     def test_ghostty_open_uses_open_command(self):
         """Ghostty open should use 'open -a Ghostty <path>' on macOS."""
         ghostty = Terminals.TERMINALS[0]
-        with patch("subprocess.run") as mock_run:
+        with patch("subprocess.Popen") as mock_popen:
             ghostty["open"]("/test/path")
-            args = mock_run.call_args[0][0]
+            args = mock_popen.call_args[0][0]
             assert args == ["open", "-a", "Ghostty", "/test/path"]
 
+    def test_launches_are_detached(self):
+        """Launchers start a new session instead of waiting for the terminal."""
+        with patch("subprocess.Popen") as mock_popen, patch("subprocess.run") as mock_run:
+            for terminal in Terminals.TERMINALS:
+                terminal["open"]("/test/path")
+
+        mock_run.assert_not_called()
+        assert mock_popen.call_count == len(Terminals.TERMINALS)
+        assert all(c[1]["start_new_session"] for c in mock_popen.call_args_list)
+
     def test_wezterm_open_uses_wezterm_start(self):
-        """WezTerm open should use 'wezterm start --cwd --new-tab'."""
+        """WezTerm open should use 'wezterm start --cwd --new-tab' and poll for readiness."""
         wezterm = Terminals.TERMINALS[1]
-        with patch("subprocess.run") as mock_run:
+        with patch("subprocess.Popen") as mock_popen:
             wezterm["open"]("/test/path")
             # WezTerm uses shell=True with a command string
-            call_args = mock_run.call_args
+            call_args = mock_popen.call_args
             cmd = call_args[0][0]
             assert "wezterm start" in cmd
             assert "--cwd" in cmd
             assert "--new-tab" in cmd
             assert "/test/path" in cmd
+            assert "wezterm cli list" in cmd
+            assert "sleep 0.5" not in cmd
             assert call_args[1]["shell"] is True
+
+
+class TestTerminalCache:
+    """Tests for cached terminal availability."""
+
+    @pytest.fixture
+    def cache(self, temp_cache_dir):
+        from alfred_pj.cache import CacheStore
+
+        return CacheStore()
+
+    @pytest.fixture
+    def fake_terminals(self):
+        calls = []
+
+        def fake(name, ok):
+            return {"name": name, "check": lambda: calls.append(name) or ok, "open": None}
+
+        with patch.object(
+            Terminals,
+            "TERMINALS",
+            [fake("Ghostty", False), fake("WezTerm", True), fake("Terminal", True)],
+        ):
+            yield calls
+
+    def test_checks_run_once(self, cache, fake_terminals):
+        """The second lookup is served from the cache without running checks."""
+        assert Terminals.get_available_terminal(cache)["name"] == "WezTerm"
+        assert fake_terminals == ["Ghostty", "WezTerm", "Terminal"]
+
+        fake_terminals.clear()
+        assert Terminals.get_available_terminal(cache)["name"] == "WezTerm"
+        assert fake_terminals == []
+
+    def test_refreshes_one_expired_terminal(self, cache, fake_terminals):
+        """Only the most overdue terminal is re-checked."""
+        Terminals.get_available_terminal(cache)
+        terminals = cache.get_terminals()
+        terminals["Ghostty"]["expires_at"] = 0
+        cache._atomic_write(cache._terminals_file, {"terminals": terminals})
+        fake_terminals.clear()
+
+        Terminals.refresh_stale_terminal(cache)
+
+        assert fake_terminals == ["Ghostty"]
+        assert cache.get_most_expired_terminal() is None
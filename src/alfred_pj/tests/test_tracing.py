@@ -0,0 +1,77 @@
+"""Tests for the list pipeline tracer."""
+
+import threading
+
+from alfred_pj.tracing import Tracer
+
+
+class TestTracer:
+    """Tests for Tracer."""
+
+    def test_enabled_by_alfred_debug(self, monkeypatch):
+        monkeypatch.setenv("alfred_debug", "1")
+        assert Tracer().enabled is True
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("alfred_debug", raising=False)
+        assert Tracer().enabled is False
+
+    def test_disabled_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        with tracer.phase("scan", "/p"):
+            pass
+        tracer.count("cache_hit")
+        assert tracer.phases == {}
+        assert tracer.items == {}
+        assert not tracer.counters
+
+    def test_disabled_phase_is_shared_noop(self):
+        """A disabled tracer must not allocate per call."""
+        tracer = Tracer(enabled=False)
+        assert tracer.phase("a") is tracer.phase("b")
+
+    def test_phases_accumulate(self):
+        tracer = Tracer(enabled=True)
+        for _ in range(3):
+            with tracer.phase("detect"):
+                pass
+        assert list(tracer.phases) == ["detect"]
+        assert tracer.phases["detect"] >= 0
+
+    def test_records_items_and_counters(self):
+        tracer = Tracer(enabled=True)
+        with tracer.phase("detect", "/root/slow"):
+            pass
+        tracer.count("cache_miss")
+        tracer.count("projects", 5)
+        assert [item for item, _ in tracer.slowest("detect")] == ["/root/slow"]
+        assert tracer.counters == {"cache_miss": 1, "projects": 5}
+
+    def test_thread_safe_counters(self):
+        tracer = Tracer(enabled=True)
+
+        def work():
+            for _ in range(1000):
+                tracer.count("hits")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert tracer.counters["hits"] == 4000
+
+    def test_summary_lists_phases_and_counters(self):
+        tracer = Tracer(enabled=True)
+        with tracer.phase("scan"):
+            pass
+        tracer.count("cache_hit", 2)
+        summary = tracer.summary()
+        assert summary.startswith("total ")
+        assert "scan" in summary
+        assert "cache_hit=2" in summary
+
+    def test_marks_elapsed_time_even_when_disabled(self):
+        tracer = Tracer(enabled=False)
+        tracer.mark("response")
+        assert 0 <= tracer.marks["response"] <= tracer.total
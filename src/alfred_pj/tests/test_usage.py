@@ -1,8 +1,21 @@
 """Tests for usage data tracking."""
 
 import json
+import os
+from types import SimpleNamespace
 
-from alfred_pj.usage import UsageData
+from alfred_pj.usage import (
+    EVENT_SIZE,
+    GC_INTERVAL,
+    GC_SCANS,
+    MAX_PATH_BYTES,
+    MAX_PATHS_PER_PREFIX,
+    MAX_PREFIXES,
+    QueryUsage,
+    UsageData,
+    append_selection,
+    journal_path,
+)
 
 
 class TestUsageData:
@@ -92,3 +105,249 @@ class TestUsageData:
             data = json.load(f)
 
         assert data == {"/path/to/project": 5}
+
+    def test_top_orders_by_count(self, temp_usage_dir):
+        """top() should return the most used paths first."""
+        usage = UsageData()
+        usage.data = {"/a": 1, "/b": 5, "/c": 3}
+        assert usage.top(2) == [("/b", 5), ("/c", 3)]
+        assert usage.top() == [("/b", 5), ("/c", 3), ("/a", 1)]
+
+
+class TestSelectionJournal:
+    """Tests for the append-only selection journal."""
+
+    def test_appended_selections_are_folded_on_load(self, temp_usage_dir):
+        """Journal events count without usage.json being rewritten."""
+        append_selection("/p")
+        append_selection("/p")
+
+        assert UsageData().get_usage_by_path("/p") == 2
+        assert not (temp_usage_dir / "usage.json").exists()
+
+    def test_events_are_fixed_size(self, temp_usage_dir):
+        """Each selection costs exactly one fixed-size append."""
+        assert append_selection("/p") == EVENT_SIZE
+        assert append_selection("/a/much/longer/path") == 2 * EVENT_SIZE
+
+    def test_compact_moves_journal_into_store(self, temp_usage_dir):
+        """Compaction writes the aggregate and empties the journal."""
+        UsageData().write_data()
+        append_selection("/p")
+        usage = UsageData()
+        usage.compact()
+
+        assert json.loads((temp_usage_dir / "usage.json").read_text()) == {"/p": 1}
+        assert os.path.getsize(journal_path()) == 0
+        assert UsageData().get_usage_by_path("/p") == 1
+
+    def test_write_picks_up_selections_made_after_load(self, temp_usage_dir):
+        """A selection journaled while another process holds data isn't lost."""
+        usage = UsageData()
+        usage.add_usage("/a")
+        append_selection("/b")
+        usage.write_data()
+
+        assert UsageData().data == {"/a": 1, "/b": 1}
+
+    def test_interleaved_compactions_keep_every_selection(self, temp_usage_dir):
+        """A compactor that loaded before another one compacted neither loses nor doubles events."""
+        append_selection("/p/a")
+        first = UsageData()
+        second = UsageData()
+        second.compact()
+        append_selection("/p/b")
+        first.compact()
+
+        assert json.loads((temp_usage_dir / "usage.json").read_text()) == {"/p/a": 1, "/p/b": 1}
+        assert os.path.getsize(journal_path()) == 0
+
+    def test_local_changes_apply_on_top_of_other_compactions(self, temp_usage_dir):
+        """Moves made by one process survive another process's compaction."""
+        usage = UsageData()
+        usage.add_usage("/old", 2)
+        usage.write_data()
+        mover = UsageData()
+        append_selection("/old")
+        UsageData().compact()
+        mover.move("/old", "/new")
+        mover.compact()
+
+        assert UsageData().data == {"/new": 3}
+
+    def test_skips_torn_event(self, temp_usage_dir):
+        """Garbage from an interrupted write is skipped up to the next event."""
+        append_selection("/a")
+        with open(journal_path(), "ab") as f:
+            f.write(b"\x00garbage")
+        append_selection("/b")
+
+        assert UsageData().data == {"/a": 1, "/b": 1}
+
+    def test_moved_path_is_written_by_compact(self, temp_usage_dir):
+        """Selections carried over to a moved project are persisted by compact."""
+        usage = UsageData()
+        usage.add_usage("/old", 3)
+        usage.add_usage("/new")
+        usage.write_data()
+        usage.move("/old", "/new")
+        usage.compact()
+
+        assert UsageData().data == {"/new": 4}
+
+    def test_rejects_overlong_path(self, temp_usage_dir):
+        """Paths that don't fit an event are not journaled."""
+        assert append_selection("/" + "x" * MAX_PATH_BYTES) is None
+
+
+class TestQueryUsage:
+    """Tests for query prefix to path associations."""
+
+    def test_associates_every_prefix(self, temp_usage_dir):
+        queries = QueryUsage()
+        queries.add("API", "/code/api")
+
+        assert queries.get("a") == {"/code/api": 1}
+        assert queries.get("ap") == {"/code/api": 1}
+        assert queries.get("api") == {"/code/api": 1}
+        assert queries.get("apis") == {}
+
+    def test_normalizes_case_and_whitespace(self, temp_usage_dir):
+        queries = QueryUsage()
+        queries.add("my  App ", "/code/app")
+
+        assert queries.get("MY APP") == {"/code/app": 1}
+        assert "my " not in queries.data
+
+    def test_evicts_least_recently_selected(self, temp_usage_dir):
+        """A prefix keeps the MAX_PATHS_PER_PREFIX most recently selected paths."""
+        queries = QueryUsage()
+        queries.add("p", "/p/0")
+        for i in range(1, MAX_PATHS_PER_PREFIX + 1):
+            queries.add("p", f"/p/{i}")
+            queries.add("p", "/p/0")  # keeps /p/0 recent
+
+        paths = queries.get("p")
+        assert len(paths) == MAX_PATHS_PER_PREFIX
+        assert paths["/p/0"] == MAX_PATHS_PER_PREFIX + 1
+        assert "/p/1" not in paths
+
+    def test_caps_prefixes_evicting_least_recent(self, temp_usage_dir):
+        """At most MAX_PREFIXES prefixes are kept, however many queries were typed."""
+        queries = QueryUsage()
+        for i in range(MAX_PREFIXES):
+            queries.add(f"q{i:04d}", "/p")
+            queries.add("q", "/kept")  # the short prefix stays recent
+
+        assert len(queries.data) == MAX_PREFIXES
+        assert queries.get("q") == {"/p": MAX_PREFIXES, "/kept": MAX_PREFIXES}
+        assert queries.get(f"q{MAX_PREFIXES - 1:04d}") == {"/p": 1}
+        assert queries.get("q0000") == {}
+
+    def test_persists_and_loads_lazily(self, temp_usage_dir):
+        queries = QueryUsage()
+        queries.add("web", "/code/web")
+        queries.write_data()
+
+        loaded = QueryUsage()
+        assert loaded._data is None
+        assert loaded.get("we") == {"/code/web": 1}
+
+    def test_clear_removes_file(self, temp_usage_dir):
+        queries = QueryUsage()
+        queries.add("web", "/code/web")
+        queries.write_data()
+        queries.clear()
+
+        assert not (temp_usage_dir / "queries.json").exists()
+        assert QueryUsage().get("web") == {}
+
+    def test_move_carries_associations(self, temp_usage_dir):
+        queries = QueryUsage()
+        queries.add("api", "/old")
+
+        assert queries.move("/old", "/new")
+        assert queries.get("ap") == {"/new": 1}
+        assert not queries.move("/old", "/new")
+
+
+class TestGarbageCollection:
+    """Tests for archiving the usage of vanished projects."""
+
+    def test_archives_after_consecutive_misses(self, temp_usage_dir, tmp_path):
+        """A gone path is archived on the GC_SCANS-th run in a row without it."""
+        gone = str(tmp_path / "gone")
+        usage = UsageData()
+        usage.add_usage(gone, 3)
+        usage.write_data()
+
+        for _ in range(GC_SCANS - 1):
+            usage = UsageData()
+            assert usage.collect_garbage(set(), interval=0) == []
+            usage.compact()
+        usage = UsageData()
+        assert usage.collect_garbage(set(), interval=0) == [gone]
+        usage.compact()
+
+        assert UsageData().data == {}
+        assert json.loads((temp_usage_dir / "usage_archive.json").read_text()) == {gone: 3}
+        assert not (temp_usage_dir / "usage_missed.json").exists()
+
+    def test_counts_one_run_per_interval(self, temp_usage_dir, tmp_path, monkeypatch):
+        """Reruns while a search session lasts count as a single missed run."""
+        gone = str(tmp_path / "gone")
+        usage = UsageData()
+        usage.add_usage(gone)
+        clock = SimpleNamespace(now=1000.0)
+        monkeypatch.setattr("alfred_pj.usage.time", SimpleNamespace(time=lambda: clock.now))
+
+        for _ in range(GC_SCANS * 10):
+            assert usage.collect_garbage(set()) == []
+            clock.now += 1
+        for _ in range(GC_SCANS - 2):
+            clock.now += GC_INTERVAL
+            assert usage.collect_garbage(set()) == []
+        clock.now += GC_INTERVAL
+        assert usage.collect_garbage(set()) == [gone]
+
+    def test_returning_path_resets_counter(self, temp_usage_dir, tmp_path):
+        gone = str(tmp_path / "gone")
+        usage = UsageData()
+        usage.add_usage(gone)
+        usage.collect_garbage(set())
+        usage.collect_garbage({gone})
+
+        assert not (temp_usage_dir / "usage_missed.json").exists()
+
+    def test_keeps_existing_unscanned_paths(self, temp_usage_dir, tmp_path):
+        """Projects outside the scanned roots aren't collected while they exist."""
+        usage = UsageData()
+        usage.add_usage(str(tmp_path))
+        for _ in range(GC_SCANS):
+            usage.collect_garbage(set())
+
+        assert usage.get_usage_by_path(str(tmp_path)) == 1
+
+    def test_drops_sentinel_items(self, temp_usage_dir):
+        usage = UsageData()
+        usage.add_usage("__CLEAR_CACHE__")
+        usage.collect_garbage(set())
+        usage.compact()
+
+        assert UsageData().data == {}
+        assert not (temp_usage_dir / "usage_archive.json").exists()
+
+    def test_restore_from_archive(self, temp_usage_dir):
+        (temp_usage_dir / "usage_archive.json").write_text('{"/a": 4, "/b": 1}')
+        usage = UsageData()
+
+        assert usage.restore(["/a", "/c"]) == ["/a"]
+        usage.compact()
+        assert UsageData().data == {"/a": 4}
+        assert json.loads((temp_usage_dir / "usage_archive.json").read_text()) == {"/b": 1}
+
+    def test_clear_deletes_archive(self, temp_usage_dir):
+        (temp_usage_dir / "usage_archive.json").write_text('{"/a": 4}')
+        UsageData().clear()
+
+        assert not (temp_usage_dir / "usage_archive.json").exists()
@@ -0,0 +1,80 @@
+"""Lightweight per-phase timing for the list pipeline.
+
+A disabled ``Tracer`` hands out one shared no-op context manager and ignores
+counters, so instrumentation costs an attribute check when tracing is off.
+"""
+
+import contextlib
+import os
+import threading
+import time
+from collections import Counter
+
+_NOOP = contextlib.nullcontext()
+
+
+class Tracer:
+    """Accumulates phase durations, per-item costs and counters."""
+
+    def __init__(self, enabled: bool | None = None, details: bool | None = None):
+        # alfred_debug is set by Alfred in lowercase
+        self.enabled = os.environ.get("alfred_debug") == "1" if enabled is None else enabled
+        # Per-item costs are only worth their bookkeeping when someone reads them
+        self.details = self.enabled if details is None else details
+        self.phases: dict[str, float] = {}  # name -> seconds, summed across threads
+        self.items: dict[str, dict[str, float]] = {}  # name -> item -> seconds
+        self.counters: Counter = Counter()
+        self.marks: dict[str, float] = {}  # name -> seconds since start
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def phase(self, name: str, item: str | None = None):
+        """Time a block as phase name, optionally also recording it for item."""
+        if not self.enabled:
+            return _NOOP
+        return self._timed(name, item)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str, item: str | None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.phases[name] = self.phases.get(name, 0.0) + elapsed
+                if item is not None and self.details:
+                    self.items.setdefault(name, {})[item] = elapsed
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += n
+
+    def mark(self, name: str) -> None:
+        """Record the seconds elapsed so far as mark name, even when disabled."""
+        self.marks[name] = time.perf_counter() - self._start
+
+    @property
+    def total(self) -> float:
+        """Seconds since the tracer was created."""
+        return time.perf_counter() - self._start
+
+    def slowest(self, name: str, n: int = 5) -> list[tuple[str, float]]:
+        """Return the n most expensive items recorded for phase name."""
+        items = self.items.get(name, {})
+        return sorted(items.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+    def summary(self) -> str:
+        """Compact multi-line breakdown for stderr or the debug command."""
+        lines = [f"total {self.total * 1000:.1f}ms"]
+        lines += [f"  @{name:<15}{sec * 1000:8.1f}ms" for name, sec in self.marks.items()]
+        lines += [f"  {name:<16}{sec * 1000:8.1f}ms" for name, sec in self.phases.items()]
+        if self.counters:
+            lines.append("  " + ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items())))
+        for name in self.items:
+            slow = ", ".join(
+                f"{os.path.basename(item)} {sec * 1000:.1f}ms" for item, sec in self.slowest(name)
+            )
+            lines.append(f"  slowest {name}: {slow}")
+        return "\n".join(lines)
@@ -1,22 +1,156 @@
-"""Usage data tracking for project selection frequency."""
+"""Usage data tracking for project selection frequency.
 
+Selections are appended as fixed-size events to ``usage.journal`` (one
+O_APPEND write, no parse) and folded into the ``usage.json`` aggregate when
+a UsageData is loaded. The journal is compacted into usage.json by the next
+list run, or by record-selection once it holds COMPACT_EVERY events.
+"""
+
+import contextlib
+import fcntl
+import heapq
 import json
 import os
+import struct
 import tempfile
+import time
+
+JOURNAL_MAGIC = b"PJS1"
+_EVENT = struct.Struct("<4sdH1010s")  # magic, time, path length, path (NUL padded)
+EVENT_SIZE = _EVENT.size  # 1024: one append stays well under PIPE_BUF
+MAX_PATH_BYTES = 1010
+COMPACT_EVERY = 256
+
+# Query learning: prefixes longer than this share the longest one's entry,
+# each prefix remembers at most this many paths, and at most MAX_PREFIXES
+# prefixes are kept; the least recently selected are evicted
+MAX_QUERY_PREFIX = 32
+MAX_PATHS_PER_PREFIX = 10
+MAX_PREFIXES = 1000
+
+# Entries whose path is gone for this many list runs in a row are archived;
+# list reruns on every keystroke, so at most one run per GC_INTERVAL seconds
+# counts towards GC_SCANS
+GC_SCANS = 5
+GC_INTERVAL = 3600
+
+
+def _data_dir() -> str:
+    """Return the workflow data directory, creating it if needed."""
+    # alfred_workflow_data is set by Alfred in lowercase
+    alfred_data_dir = os.getenv("alfred_workflow_data")
+    if not alfred_data_dir:
+        # Fallback for running outside Alfred
+        alfred_data_dir = os.path.join(tempfile.gettempdir(), "alfred-pj")
+    if not os.path.isdir(alfred_data_dir):
+        os.makedirs(alfred_data_dir, exist_ok=True)
+    return alfred_data_dir
+
+
+def _read_json(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path: str, data: dict) -> None:
+    """Atomically replace path with data, or remove it if data is empty."""
+    if not data:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        return
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+def journal_path() -> str:
+    """Return the path of the selection journal."""
+    return os.path.join(_data_dir(), "usage.journal")
+
+
+def append_selection(path: str) -> int | None:
+    """Append one selection event and return the journal size in bytes.
+
+    Returns None without writing if path is too long for an event.
+    Appenders share the journal lock, so they never wait on each other;
+    only a compaction in progress holds them back.
+    """
+    encoded = path.encode()
+    if len(encoded) > MAX_PATH_BYTES:
+        return None
+    event = _EVENT.pack(JOURNAL_MAGIC, time.time(), len(encoded), encoded)
+    fd = os.open(journal_path(), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        os.write(fd, event)
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+
+def parse_events(buf: bytes) -> tuple[list[tuple[float, str]], int]:
+    """Return the (time, path) events in buf and the number of bytes consumed.
+
+    Damaged bytes (e.g. a torn write) are skipped by scanning for the next
+    magic; an incomplete event at the end is left unconsumed.
+    """
+    events = []
+    pos = 0
+    while pos + EVENT_SIZE <= len(buf):
+        if buf[pos : pos + 4] != JOURNAL_MAGIC:
+            nxt = buf.find(JOURNAL_MAGIC, pos + 1)
+            if nxt == -1:
+                return events, len(buf)
+            pos = nxt
+            continue
+        _, ts, length, raw = _EVENT.unpack_from(buf, pos)
+        if length <= MAX_PATH_BYTES:
+            events.append((ts, raw[:length].decode(errors="replace")))
+        pos += EVENT_SIZE
+    return events, pos
 
 
 class UsageData:
+    """Selection counts by path.
+
+    Entries of projects that vanished are moved to ``usage_archive.json`` by
+    collect_garbage, so usage.json stays proportional to live projects; the
+    archive is only read when an unknown project might be an archived one.
+    """
+
     def __init__(self):
-        # alfred_workflow_data is set by Alfred in lowercase
-        alfred_data_dir = os.getenv("alfred_workflow_data")
-        if not alfred_data_dir:
-            # Fallback for running outside Alfred
-            alfred_data_dir = os.path.join(tempfile.gettempdir(), "alfred-pj")
-        if not os.path.isdir(alfred_data_dir):
-            os.makedirs(alfred_data_dir, exist_ok=True)
-        usage_file = os.path.join(alfred_data_dir, "usage.json")
+        data_dir = _data_dir()
+        usage_file = os.path.join(data_dir, "usage.json")
         self.file = usage_file
-        self.data = self.read_data()
+        self.journal = os.path.join(data_dir, "usage.journal")
+        self.archive = os.path.join(data_dir, "usage_archive.json")
+        self.missed = os.path.join(data_dir, "usage_missed.json")  # path -> [runs, time]
+        with self._journal_lock(fcntl.LOCK_SH):
+            # Shared with appenders, exclusive of compaction: usage.json and the
+            # journal are read as one consistent state
+            self.data = self.read_data()
+            self.pending_events = self._fold_journal(self.data)
+        self._loaded = dict(self.data)  # what this process started from
+        self._moves: list[tuple[str, str]] = []
+        self._cleared = False
+
+    @contextlib.contextmanager
+    def _journal_lock(self, operation: int):
+        fd = os.open(self.journal, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, operation)
+            yield fd
+        finally:
+            os.close(fd)
 
     def read_data(self):
         if os.path.isfile(self.file):
@@ -24,15 +158,212 @@ class UsageData:
                 return json.load(f)
         return {}
 
+    def _fold_journal(self, data: dict) -> bool:
+        """Add every journal event to data; return whether there were any."""
+        try:
+            with open(self.journal, "rb") as f:
+                buf = f.read()
+        except OSError:
+            return False
+        events, _ = parse_events(buf)
+        for _, path in events:
+            data[path] = data.get(path, 0) + 1
+        return bool(events)
+
+    def _merge(self, fresh: dict) -> dict:
+        """Apply this process's changes since loading onto the current state fresh."""
+        if self._cleared:
+            return dict(self.data)
+        # Moves carry over selections this process hasn't seen
+        for old_path, new_path in self._moves:
+            for counts in (fresh, self._loaded):
+                if old_path in counts:
+                    counts[new_path] = counts.get(new_path, 0) + counts.pop(old_path)
+        for path in self._loaded.keys() | self.data.keys():
+            if path not in self.data:
+                fresh.pop(path, None)  # deleted here: moved, archived or dropped
+                continue
+            delta = self.data[path] - self._loaded.get(path, 0)
+            if delta:
+                fresh[path] = fresh.get(path, 0) + delta
+        return fresh
+
     def write_data(self):
-        with open(self.file, "w+") as f:
-            json.dump(self.data, f)
+        """Atomically write usage.json and empty the journal.
+
+        Under the exclusive journal lock, usage.json and the whole journal
+        are read again and this process's changes are applied on top, so
+        selections journaled or compacted by other processes since loading
+        are neither lost nor counted twice.
+        """
+        with self._journal_lock(fcntl.LOCK_EX) as fd:
+            fresh = self.read_data()
+            self._fold_journal(fresh)
+            data = self._merge(fresh)
+            tmp = self.file + ".tmp"
+            try:
+                with open(tmp, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.file)
+            except OSError:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp)
+                raise
+            os.ftruncate(fd, 0)
+        self.data = data
+        self._loaded = dict(data)
+        self._moves = []
+        self._cleared = False
+        self.pending_events = False
+
+    def compact(self) -> None:
+        """Write usage.json if the journal held events or data changed since loading."""
+        if self.pending_events or self._cleared or self.data != self._loaded:
+            self.write_data()
+
+    def move(self, old_path, new_path):
+        """Carry the selections of a project that moved over to its new path."""
+        if old_path in self.data:
+            self.add_usage(new_path, self.data.pop(old_path))
+            self._moves.append((old_path, new_path))
+
+    def collect_garbage(
+        self, seen: set[str], scans: int = GC_SCANS, interval: float = GC_INTERVAL
+    ) -> list[str]:
+        """Count a run against entries whose path is gone and archive the persistent ones.
+
+        Paths in seen (the projects just scanned) or still existing are live;
+        the counter of a gone path resets once it is back. A run counts only
+        if interval seconds have passed since the last counted one. Returns
+        the paths archived by this call. Sentinel items (non-absolute "paths")
+        are dropped.
+        """
+        missed = _read_json(self.missed)
+        now = time.time()
+        still_missed = {}
+        archived = {}
+        for path, count in list(self.data.items()):
+            if path in seen:
+                continue
+            if not os.path.isabs(path):
+                del self.data[path]
+            elif not os.path.isdir(path):
+                runs, counted = missed.get(path) or (0, None)
+                if counted is not None and now - counted < interval:
+                    still_missed[path] = [runs, counted]
+                elif runs + 1 < scans:
+                    still_missed[path] = [runs + 1, now]
+                else:
+                    archived[path] = count
+        if archived:
+            archive = _read_json(self.archive)
+            for path, count in archived.items():
+                archive[path] = archive.get(path, 0) + count
+                del self.data[path]
+            _write_json(self.archive, archive)
+        if still_missed != missed:
+            _write_json(self.missed, still_missed)
+        return list(archived)
+
+    def restore(self, paths) -> list[str]:
+        """Bring archived entries for paths back into data; returns the restored paths."""
+        if not os.path.exists(self.archive):
+            return []
+        archive = _read_json(self.archive)
+        restored = [path for path in paths if path in archive]
+        for path in restored:
+            self.add_usage(path, archive.pop(path))
+        if restored:
+            _write_json(self.archive, archive)
+        return restored
 
     def add_usage(self, path, count=1):
         self.data[path] = self.data[path] + count if path in self.data else count
 
     def clear(self):
+        """Forget all usage; archived entries are deleted right away."""
         self.data = {}
+        self._cleared = True
+        for path in (self.archive, self.missed):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
 
     def get_usage_by_path(self, path):
         return self.data.get(path, 0)
+
+    def top(self, n=None):
+        """Return the n (default: all) most used (path, count) pairs, most used first."""
+        if n is None:
+            return sorted(self.data.items(), key=lambda kv: kv[1], reverse=True)
+        return heapq.nlargest(n, self.data.items(), key=lambda kv: kv[1])
+
+
+def clear_all() -> None:
+    """Forget all usage statistics: counts, archive and query associations."""
+    usage = UsageData()
+    usage.clear()
+    usage.write_data()
+    QueryUsage().clear()
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase query and collapse its whitespace, capped at MAX_QUERY_PREFIX."""
+    return " ".join(query.lower().split())[:MAX_QUERY_PREFIX]
+
+
+class QueryUsage:
+    """Which paths were selected after typing which query prefix.
+
+    ``queries.json`` maps every prefix of a selection's query to
+    {path: selections}. Both levels are in least to most recently selected
+    order, which bounds the file to MAX_PREFIXES prefixes however long the
+    history. A lookup is a single dict access for the normalized query, and
+    the file is only read on first use.
+    """
+
+    def __init__(self):
+        self.file = os.path.join(_data_dir(), "queries.json")
+        self._data: dict[str, dict[str, int]] | None = None
+
+    @property
+    def data(self) -> dict[str, dict[str, int]]:
+        if self._data is None:
+            self._data = _read_json(self.file)
+        return self._data
+
+    def get(self, query: str) -> dict[str, int]:
+        """Return {path: selections} for paths picked after typing query."""
+        return self.data.get(normalize_query(query), {})
+
+    def add(self, query: str, path: str) -> None:
+        """Associate path with every prefix of query, evicting the least recent path."""
+        query = normalize_query(query)
+        for end in range(1, len(query) + 1):
+            if query[end - 1] == " ":
+                continue  # same as the prefix before it
+            prefix = query[:end]
+            paths = self.data[prefix] = self.data.pop(prefix, {})  # most recent prefix
+            paths[path] = paths.pop(path, 0) + 1  # re-inserted as most recent
+            if len(paths) > MAX_PATHS_PER_PREFIX:
+                del paths[next(iter(paths))]
+        while len(self.data) > MAX_PREFIXES:
+            del self.data[next(iter(self.data))]
+
+    def write_data(self) -> None:
+        """Atomically replace queries.json."""
+        _write_json(self.file, self.data)
+
+    def move(self, old_path: str, new_path: str) -> bool:
+        """Re-associate every prefix of a project that moved; return whether any was."""
+        moved = False
+        for paths in self.data.values():
+            if old_path in paths:
+                paths[new_path] = paths.pop(new_path, 0) + paths.pop(old_path)
+                moved = True
+        return moved
+
+    def clear(self) -> None:
+        """Forget all associations."""
+        self._data = {}
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.file)
@@ -40,5 +40,5 @@ class Logger(logging.Logger):
         self.log(logging.INFO, "logger initiated")
 
 
-logging.basicConfig(level=logging.DEBUG, format="[%(levelname)] %(message)s")
+logging.basicConfig(level=logging.DEBUG, format="[%(levelname)s] %(message)s")
 logger = Logger(__name__)